@@ -37,7 +37,7 @@ class AlteracaoEmailSerializer(serializers.Serializer):
         if not value.endswith("@sme.prefeitura.sp.gov.br"):
             raise serializers.ValidationError("Utilize seu e-mail institucional.")
         
-        if User.objects.filter(email=value).exists():
+        if User.email_em_uso(value):
             raise serializers.ValidationError("Este e-mail já está cadastrado.")
 
         try:
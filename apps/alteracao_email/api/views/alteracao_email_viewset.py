@@ -1,12 +1,13 @@
 import logging
 
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from apps.alteracao_email.api.serializers.alteracao_email_serializer import AlteracaoEmailSerializer
 from apps.alteracao_email.services.alteracao_email_service import AlteracaoEmailService
+from apps.users.models import violou_email_unico
 from apps.users.services.sme_integracao_service import SmeIntegracaoService
 
 from apps.helpers.exceptions import (
@@ -49,11 +50,13 @@ class ValidarAlteracaoEmailViewSet(viewsets.ViewSet):
             with transaction.atomic():
                 usuario , email_request = AlteracaoEmailService.validar(pk)
 
-                SmeIntegracaoService.altera_email(usuario.username, email_request.novo_email)
-
+                # grava antes da integração: se o e-mail já tiver sido cadastrado por
+                # outro usuário, a constraint barra a alteração antes de chegar ao SME
                 usuario.email = email_request.novo_email
                 usuario.save()
 
+                SmeIntegracaoService.altera_email(usuario.username, email_request.novo_email)
+
                 email_request.ja_usado = True
                 email_request.save()
 
@@ -62,6 +65,11 @@ class ValidarAlteracaoEmailViewSet(viewsets.ViewSet):
                     status=status.HTTP_200_OK,
                 )
         
+        except IntegrityError as e:
+            if violou_email_unico(e):
+                return Response({"detail": "Este e-mail já está cadastrado."}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"detail": "Erro inesperado."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
         except TokenJaUtilizadoException as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
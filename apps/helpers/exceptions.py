@@ -38,4 +38,12 @@ class TokenExpiradoException(Exception):
 
 class IntercorrenciasDeletionError(Exception):
     """Exceção lançada quando há falha ao deletar intercorrências de um usuário."""
-    pass
\ No newline at end of file
+    pass
+
+class ImportacaoUsuariosException(Exception):
+    """Erro que impede a leitura do arquivo de importação de usuários."""
+    pass
+
+class TarefaNaoRegistradaException(Exception):
+    """Tarefa enfileirada com um nome que não foi registrado com @tarefa."""
+    pass
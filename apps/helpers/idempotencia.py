@@ -0,0 +1,119 @@
+import json
+import logging
+import hashlib
+import functools
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCIA_CACHE_KEY = "idempotencia:{}"
+
+_EM_ANDAMENTO = "em_andamento"
+_CONCLUIDA = "concluida"
+
+
+def _cache_key(request, view, nome_acao, chave) -> str:
+    identificador = f"{request.user.pk}:{view.basename}.{nome_acao}:{chave}"
+    return IDEMPOTENCIA_CACHE_KEY.format(hashlib.sha256(identificador.encode()).hexdigest())
+
+
+def _impressao(request, kwargs) -> str:
+    """ Resumo do conteúdo da requisição, para recusar a mesma chave com outro conteúdo. """
+    conteudo = json.dumps([request.data, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+def idempotente(acao):
+    """
+    Torna a ação idempotente pelo header Idempotency-Key (opcional).
+
+    A primeira requisição com a chave executa a ação e a resposta é guardada no cache por
+    IDEMPOTENCIA_TTL_SEGUNDOS, após o commit; as repetições recebem a mesma resposta
+    (com o header Idempotent-Replayed) sem executar a ação de novo. Enquanto a primeira
+    não termina, repetições recebem 409. Erros 5xx, exceções e ações cuja transação foi
+    marcada para rollback liberam a chave para nova tentativa. A chave vale por usuário e
+    por ação.
+
+    A trava expira em IDEMPOTENCIA_TRAVA_SEGUNDOS, que deve ser maior que o timeout das
+    requisições (o --timeout do gunicorn): assim ela não expira com a primeira requisição
+    ainda em execução, e só fica presa até expirar se o worker for encerrado no meio da
+    ação ou se o commit final da requisição falhar.
+
+    A trava e as respostas ficam no cache padrão, compartilhado entre os workers (Redis em
+    produção). Se o cache estiver indisponível a ação é executada sem deduplicação.
+    """
+
+    @functools.wraps(acao)
+    def wrapper(self, request, *args, **kwargs):
+        chave = request.headers.get("Idempotency-Key")
+        if not chave:
+            return acao(self, request, *args, **kwargs)
+
+        if len(chave) > 255:
+            return Response(
+                {"detail": "O header Idempotency-Key deve ter no máximo 255 caracteres."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = _cache_key(request, self, acao.__name__, chave)
+        impressao = _impressao(request, kwargs)
+
+        travada = cache.add(
+            cache_key, {"estado": _EM_ANDAMENTO, "impressao": impressao}, settings.IDEMPOTENCIA_TRAVA_SEGUNDOS
+        )
+
+        if travada is None:
+            # O django_redis ignora a falha de conexão e retorna None em vez de True/False
+            logger.warning("Cache indisponível: %s executada sem verificar a Idempotency-Key.", acao.__name__)
+            return acao(self, request, *args, **kwargs)
+
+        if not travada:
+            return _resposta_repetida(cache.get(cache_key), impressao)
+
+        try:
+            # Savepoint próprio: o rollback pedido pela ação (set_rollback) é visto aqui,
+            # antes de sair do bloco, e não só ao final da requisição
+            with transaction.atomic():
+                response = acao(self, request, *args, **kwargs)
+                revertida = transaction.get_connection().needs_rollback
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        if revertida or response.status_code >= 500:
+            cache.delete(cache_key)
+            return response
+
+        concluida = {
+            "estado": _CONCLUIDA,
+            "impressao": impressao,
+            "status": response.status_code,
+            "dados": response.data,
+        }
+        transaction.on_commit(lambda: cache.set(cache_key, concluida, settings.IDEMPOTENCIA_TTL_SEGUNDOS))
+        return response
+
+    return wrapper
+
+
+def _resposta_repetida(registro, impressao):
+    if registro is None or registro["estado"] == _EM_ANDAMENTO:
+        return Response(
+            {"detail": "Uma requisição com esta Idempotency-Key ainda está em processamento."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    if registro["impressao"] != impressao:
+        return Response(
+            {"detail": "Esta Idempotency-Key já foi utilizada com outro conteúdo."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    response = Response(registro["dados"], status=registro["status"])
+    response["Idempotent-Replayed"] = "true"
+    return response
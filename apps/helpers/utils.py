@@ -1,4 +1,5 @@
 import re
+from itertools import islice
 
 def is_cpf(username: str) -> bool:
     """
@@ -24,3 +25,38 @@ def anonimizar_email(email: str) -> str:
         nome_anonimizado = nome_usuario[0] + '*' * (len(nome_usuario) - 1)
 
     return f"{nome_anonimizado}@{dominio}"
+
+
+def em_blocos(itens, tamanho):
+    """
+    Divide um iterável em listas de até `tamanho` itens.
+    Exemplo: em_blocos([1, 2, 3], 2) -> [1, 2], [3]
+    """
+    iterador = iter(itens)
+    while bloco := list(islice(iterador, tamanho)):
+        yield bloco
+
+
+class AvaliacaoTardia:
+    """
+    Argumento de log calculado somente se a mensagem for emitida.
+
+    O logging só formata a mensagem quando o nível está habilitado, então em
+    logger.debug("Total: %s", AvaliacaoTardia(calcular_total)) a função não é chamada
+    com DEBUG desligado. O valor é calculado uma única vez, mesmo com vários handlers.
+    """
+
+    __slots__ = ("funcao", "args", "_valor")
+
+    def __init__(self, funcao, *args):
+        self.funcao = funcao
+        self.args = args
+
+    @property
+    def valor(self):
+        if not hasattr(self, "_valor"):
+            self._valor = self.funcao(*self.args)
+        return self._valor
+
+    def __str__(self):
+        return str(self.valor)
@@ -0,0 +1,50 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Tarefa, StatusTarefaChoices
+
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = (
+        'nome',
+        'status',
+        'tentativas',
+        'max_tentativas',
+        'executar_em',
+        'concluida_em',
+        'criado_em',
+    )
+    list_filter = (
+        'status',
+        'nome',
+    )
+    search_fields = (
+        'nome',
+        'chave_idempotencia',
+        'uuid',
+    )
+    ordering = ['-criado_em']
+    readonly_fields = (
+        'uuid',
+        'nome',
+        'argumentos',
+        'chave_idempotencia',
+        'tentativas',
+        'iniciada_em',
+        'concluida_em',
+        'ultimo_erro',
+        'criado_em',
+        'alterado_em',
+    )
+    actions = ['reenfileirar']
+
+    @admin.action(description="Reenfileirar tarefas com falha")
+    def reenfileirar(self, request, queryset):
+        quantidade = queryset.filter(status=StatusTarefaChoices.FALHA).update(
+            status=StatusTarefaChoices.PENDENTE,
+            tentativas=0,
+            executar_em=timezone.now(),
+            concluida_em=None,
+        )
+        self.message_user(request, f"{quantidade} tarefa(s) reenfileirada(s).")
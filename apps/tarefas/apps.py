@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TarefasConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.tarefas'
+    verbose_name = "Tarefas"
+
+    def ready(self):
+        # Cada app registra as próprias tarefas no módulo tarefas.py
+        autodiscover_modules("tarefas")
@@ -0,0 +1,122 @@
+import signal
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, close_old_connections
+from django.core.management.base import BaseCommand
+
+from apps.tarefas.services.fila_tarefas_service import FilaTarefasService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker da fila de tarefas: executa as tarefas pendentes com a concorrência "
+        "informada até receber SIGINT/SIGTERM (ou, com --uma-vez, até esvaziar a fila)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concorrencia",
+            type=int,
+            help="Quantidade de tarefas executadas em paralelo (padrão: TAREFAS_CONCORRENCIA).",
+        )
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            help="Segundos de espera quando a fila está vazia (padrão: TAREFAS_INTERVALO_SEGUNDOS).",
+        )
+        parser.add_argument(
+            "--uma-vez",
+            action="store_true",
+            help="Processa as tarefas disponíveis e encerra.",
+        )
+
+    def handle(self, *args, **options):
+        concorrencia = options["concorrencia"] or settings.TAREFAS_CONCORRENCIA
+        self.intervalo = options["intervalo"] or settings.TAREFAS_INTERVALO_SEGUNDOS
+        self.uma_vez = options["uma_vez"]
+        self.parar = threading.Event()
+
+        FilaTarefasService.recuperar_travadas()
+
+        if concorrencia == 1:
+            # Sem threads extras: o worker roda na própria thread do comando
+            if not self.uma_vez:
+                self._tratar_sinais()
+            processadas = self._trabalhar()
+        else:
+            processadas = self._trabalhar_em_paralelo(concorrencia)
+
+        self.stdout.write(self.style.SUCCESS(f"Tarefas processadas: {processadas}"))
+
+    def _trabalhar_em_paralelo(self, concorrencia) -> int:
+        with ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix="tarefas") as executor:
+            futuros = [executor.submit(self._trabalhar_em_thread) for _ in range(concorrencia)]
+
+            if not self.uma_vez:
+                try:
+                    self._tratar_sinais()
+                    # A thread principal só devolve à fila as tarefas de workers interrompidos
+                    while not self.parar.wait(settings.TAREFAS_TIMEOUT_SEGUNDOS):
+                        self._recuperar_travadas()
+                finally:
+                    # Sem isso, uma falha aqui deixaria o executor esperando workers que nunca param
+                    self.parar.set()
+
+            return sum(futuro.result() for futuro in futuros)
+
+    def _trabalhar_em_thread(self) -> int:
+        try:
+            return self._trabalhar()
+        finally:
+            connections.close_all()
+
+    def _trabalhar(self) -> int:
+        processadas = 0
+
+        while not self.parar.is_set():
+            try:
+                tarefas = FilaTarefasService.reservar()
+
+                if not tarefas:
+                    if self.uma_vez:
+                        break
+                    self.parar.wait(self.intervalo)
+                    continue
+
+                for tarefa in tarefas:
+                    FilaTarefasService.executar(tarefa)
+                    processadas += 1
+
+            except Exception:
+                if self.uma_vez:
+                    raise
+                # Erro de banco ou da própria fila: o worker espera e tenta de novo em vez de morrer
+                logger.exception("Erro no worker da fila de tarefas; nova tentativa em %ss.", self.intervalo)
+                self.parar.wait(self.intervalo)
+
+            finally:
+                # Descarta a conexão se ela ficou inutilizável ou passou de CONN_MAX_AGE
+                close_old_connections()
+
+        return processadas
+
+    def _recuperar_travadas(self) -> None:
+        try:
+            FilaTarefasService.recuperar_travadas()
+        except Exception:
+            logger.exception("Erro ao recuperar as tarefas travadas.")
+        finally:
+            close_old_connections()
+
+    def _tratar_sinais(self) -> None:
+        def encerrar(signum, frame):
+            logger.info("Sinal %s recebido: encerrando após as tarefas em execução.", signum)
+            self.parar.set()
+
+        signal.signal(signal.SIGINT, encerrar)
+        signal.signal(signal.SIGTERM, encerrar)
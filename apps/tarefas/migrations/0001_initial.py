@@ -0,0 +1,40 @@
+# Generated by Django 5.1.8 on 2026-10-19 01:12
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('alterado_em', models.DateTimeField(auto_now=True, verbose_name='Alterado em')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('nome', models.CharField(help_text='Nome com que a tarefa foi registrada', max_length=100, verbose_name='Nome')),
+                ('argumentos', models.JSONField(blank=True, default=dict, verbose_name='Argumentos')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('EXECUTANDO', 'Executando'), ('CONCLUIDA', 'Concluída'), ('FALHA', 'Falha')], default='PENDENTE', max_length=10, verbose_name='Status')),
+                ('chave_idempotencia', models.CharField(blank=True, help_text='Enfileirar de novo com a mesma chave não cria outra tarefa', max_length=255, null=True, unique=True, verbose_name='Chave de idempotência')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('max_tentativas', models.PositiveSmallIntegerField(default=5, verbose_name='Máximo de tentativas')),
+                ('executar_em', models.DateTimeField(default=django.utils.timezone.now, help_text='A tarefa só é reservada a partir deste momento (usado no backoff entre tentativas)', verbose_name='Executar em')),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+                ('ultimo_erro', models.TextField(blank=True, verbose_name='Último erro')),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'indexes': [models.Index(condition=models.Q(('status', 'PENDENTE')), fields=['executar_em'], name='tarefas_pendentes_idx')],
+            },
+        ),
+    ]
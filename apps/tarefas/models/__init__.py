@@ -0,0 +1,3 @@
+from .tarefa import Tarefa, StatusTarefaChoices
+
+__all__ = ["Tarefa", "StatusTarefaChoices"]
@@ -0,0 +1,60 @@
+from django.db import models
+from django.utils import timezone
+
+from apps.models_abstracts import ModeloBase
+
+
+class StatusTarefaChoices(models.TextChoices):
+    PENDENTE = "PENDENTE", "Pendente"
+    EXECUTANDO = "EXECUTANDO", "Executando"
+    CONCLUIDA = "CONCLUIDA", "Concluída"
+    FALHA = "FALHA", "Falha"
+
+
+class Tarefa(ModeloBase):
+    """
+    Execução de um efeito colateral (chamada a serviço externo, e-mail, ...) fora da
+    requisição. A fila é a própria tabela: os workers reservam as pendentes com
+    SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    nome = models.CharField("Nome", max_length=100, help_text="Nome com que a tarefa foi registrada")
+    argumentos = models.JSONField("Argumentos", default=dict, blank=True)
+    status = models.CharField(
+        "Status",
+        max_length=10,
+        choices=StatusTarefaChoices.choices,
+        default=StatusTarefaChoices.PENDENTE,
+    )
+    chave_idempotencia = models.CharField(
+        "Chave de idempotência",
+        max_length=255,
+        null=True,
+        blank=True,
+        unique=True,
+        help_text="Enfileirar de novo com a mesma chave não cria outra tarefa"
+    )
+    tentativas = models.PositiveSmallIntegerField("Tentativas", default=0)
+    max_tentativas = models.PositiveSmallIntegerField("Máximo de tentativas", default=5)
+    executar_em = models.DateTimeField(
+        "Executar em",
+        default=timezone.now,
+        help_text="A tarefa só é reservada a partir deste momento (usado no backoff entre tentativas)"
+    )
+    iniciada_em = models.DateTimeField("Iniciada em", null=True, blank=True)
+    concluida_em = models.DateTimeField("Concluída em", null=True, blank=True)
+    ultimo_erro = models.TextField("Último erro", blank=True)
+
+    class Meta:
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        indexes = [
+            # Consulta dos workers: pendentes na ordem em que devem ser executadas
+            models.Index(
+                fields=["executar_em"],
+                name="tarefas_pendentes_idx",
+                condition=models.Q(status="PENDENTE"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.nome} ({self.get_status_display()})"
@@ -0,0 +1,34 @@
+from apps.helpers.exceptions import TarefaNaoRegistradaException
+
+_tarefas = {}
+_ao_esgotar = {}
+
+
+def tarefa(nome, ao_esgotar=None):
+    """
+    Registra a função como tarefa executável pelo worker.
+
+    As funções ficam no módulo tarefas.py de cada app (carregado no ready do app
+    tarefas) e recebem os argumentos enfileirados como keyword arguments. `ao_esgotar`,
+    se informada, é chamada com os mesmos argumentos quando a tarefa falha em todas as
+    tentativas.
+    """
+
+    def decorador(funcao):
+        _tarefas[nome] = funcao
+        if ao_esgotar is not None:
+            _ao_esgotar[nome] = ao_esgotar
+        return funcao
+
+    return decorador
+
+
+def obter_tarefa(nome):
+    try:
+        return _tarefas[nome]
+    except KeyError as e:
+        raise TarefaNaoRegistradaException(f"Tarefa '{nome}' não registrada.") from e
+
+
+def obter_ao_esgotar(nome):
+    return _ao_esgotar.get(nome)
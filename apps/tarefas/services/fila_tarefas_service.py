@@ -0,0 +1,169 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.tarefas.models import Tarefa, StatusTarefaChoices
+from apps.tarefas.registro import obter_ao_esgotar, obter_tarefa
+
+logger = logging.getLogger(__name__)
+
+
+def enfileirar(
+    nome, *, chave_idempotencia=None, executar_em=None, max_tentativas=None, reabrir=False, **argumentos
+) -> Tarefa:
+    """
+    Enfileira a tarefa registrada com `nome`, que receberá `argumentos` (serializáveis em JSON).
+
+    A tarefa é gravada na transação corrente: só fica visível para os workers após o
+    commit e é descartada junto com um rollback. Com `chave_idempotencia`, se já houver
+    uma tarefa com a mesma chave ela é retornada em vez de criar outra; com reabrir=True,
+    se essa tarefa já terminou (CONCLUIDA ou FALHA) ela volta para a fila.
+    """
+    obter_tarefa(nome)
+
+    dados = {
+        "nome": nome,
+        "argumentos": argumentos,
+        "executar_em": executar_em or timezone.now(),
+        "max_tentativas": max_tentativas or settings.TAREFAS_MAX_TENTATIVAS,
+    }
+
+    if chave_idempotencia is None:
+        return Tarefa.objects.create(**dados)
+
+    tarefa, criada = Tarefa.objects.get_or_create(chave_idempotencia=chave_idempotencia, defaults=dados)
+
+    finalizadas = (StatusTarefaChoices.CONCLUIDA, StatusTarefaChoices.FALHA)
+    if reabrir and not criada and tarefa.status in finalizadas:
+        Tarefa.objects.filter(pk=tarefa.pk, status__in=finalizadas).update(
+            status=StatusTarefaChoices.PENDENTE,
+            tentativas=0,
+            executar_em=dados["executar_em"],
+            concluida_em=None,
+        )
+        tarefa.refresh_from_db()
+
+    return tarefa
+
+
+class FilaTarefasService:
+    """
+    Reserva e execução das tarefas da fila.
+
+    A reserva é uma transação curta com SELECT ... FOR UPDATE SKIP LOCKED que marca as
+    tarefas como EXECUTANDO; a execução acontece fora dela, então workers concorrentes
+    nunca pegam a mesma tarefa nem esperam uns pelos outros. Falhas voltam para a fila
+    com backoff exponencial até max_tentativas.
+    """
+
+    @staticmethod
+    def reservar(quantidade=1) -> list[Tarefa]:
+        agora = timezone.now()
+
+        with transaction.atomic():
+            tarefas = list(
+                Tarefa.objects
+                .select_for_update(skip_locked=True)
+                .filter(status=StatusTarefaChoices.PENDENTE, executar_em__lte=agora)
+                .order_by("executar_em")[:quantidade]
+            )
+            if tarefas:
+                Tarefa.objects.filter(pk__in=[tarefa.pk for tarefa in tarefas]).update(
+                    status=StatusTarefaChoices.EXECUTANDO,
+                    iniciada_em=agora,
+                    tentativas=F("tentativas") + 1,
+                )
+
+        for tarefa in tarefas:
+            tarefa.status = StatusTarefaChoices.EXECUTANDO
+            tarefa.iniciada_em = agora
+            tarefa.tentativas += 1
+
+        return tarefas
+
+    @classmethod
+    def executar(cls, tarefa) -> bool:
+        """ Executa uma tarefa reservada e registra o resultado. Retorna True em caso de sucesso. """
+        try:
+            obter_tarefa(tarefa.nome)(**tarefa.argumentos)
+        except Exception as e:
+            cls._registrar_falha(tarefa, e)
+            return False
+
+        Tarefa.objects.filter(pk=tarefa.pk).update(
+            status=StatusTarefaChoices.CONCLUIDA, concluida_em=timezone.now(), ultimo_erro=""
+        )
+        return True
+
+    @classmethod
+    def recuperar_travadas(cls) -> int:
+        """
+        Devolve à fila as tarefas em EXECUTANDO há mais de TAREFAS_TIMEOUT_SEGUNDOS
+        (worker interrompido no meio da execução). As que já esgotaram as tentativas
+        são marcadas como FALHA.
+        """
+        agora = timezone.now()
+        travadas = Tarefa.objects.filter(
+            status=StatusTarefaChoices.EXECUTANDO,
+            iniciada_em__lt=agora - timedelta(seconds=settings.TAREFAS_TIMEOUT_SEGUNDOS),
+        )
+
+        tarefas_esgotadas = list(travadas.filter(tentativas__gte=F("max_tentativas")))
+        esgotadas = Tarefa.objects.filter(pk__in=[tarefa.pk for tarefa in tarefas_esgotadas]).update(
+            status=StatusTarefaChoices.FALHA, concluida_em=agora, ultimo_erro="Tempo de execução esgotado."
+        )
+        devolvidas = travadas.update(status=StatusTarefaChoices.PENDENTE, executar_em=agora)
+
+        for tarefa in tarefas_esgotadas:
+            cls._notificar_esgotada(tarefa)
+
+        if esgotadas or devolvidas:
+            logger.warning(
+                "Tarefas travadas: %s devolvida(s) à fila, %s marcada(s) como falha.", devolvidas, esgotadas
+            )
+        return devolvidas + esgotadas
+
+    @classmethod
+    def _registrar_falha(cls, tarefa, erro) -> None:
+        agora = timezone.now()
+        mensagem = f"{type(erro).__name__}: {erro}"
+
+        if tarefa.tentativas < tarefa.max_tentativas:
+            espera = min(
+                settings.TAREFAS_BACKOFF_SEGUNDOS * 2 ** (tarefa.tentativas - 1),
+                settings.TAREFAS_BACKOFF_MAXIMO_SEGUNDOS,
+            )
+            Tarefa.objects.filter(pk=tarefa.pk).update(
+                status=StatusTarefaChoices.PENDENTE,
+                executar_em=agora + timedelta(seconds=espera),
+                ultimo_erro=mensagem,
+            )
+            logger.warning(
+                "Tarefa %s (%s) falhou na tentativa %s; nova tentativa em %ss: %s",
+                tarefa.pk, tarefa.nome, tarefa.tentativas, espera, mensagem,
+            )
+            return
+
+        Tarefa.objects.filter(pk=tarefa.pk).update(
+            status=StatusTarefaChoices.FALHA, concluida_em=agora, ultimo_erro=mensagem
+        )
+        logger.error(
+            "Tarefa %s (%s) falhou após %s tentativa(s): %s", tarefa.pk, tarefa.nome, tarefa.tentativas, mensagem
+        )
+        cls._notificar_esgotada(tarefa)
+
+    @staticmethod
+    def _notificar_esgotada(tarefa) -> None:
+        """ Chama o ao_esgotar registrado para a tarefa, se houver. """
+        ao_esgotar = obter_ao_esgotar(tarefa.nome)
+        if ao_esgotar is None:
+            return
+
+        try:
+            ao_esgotar(**tarefa.argumentos)
+        except Exception:
+            logger.exception("Erro no ao_esgotar da tarefa %s (%s).", tarefa.pk, tarefa.nome)
@@ -0,0 +1,208 @@
+import pytest
+from io import StringIO
+from datetime import timedelta
+import threading
+from unittest.mock import Mock, patch
+from django.db import connection, OperationalError
+from django.utils import timezone
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+
+from apps.helpers.exceptions import TarefaNaoRegistradaException
+from apps.tarefas.models import Tarefa, StatusTarefaChoices
+from apps.tarefas.registro import tarefa
+from apps.tarefas.services.fila_tarefas_service import FilaTarefasService, enfileirar
+from apps.tarefas.management.commands.processar_tarefas import Command as ProcessarTarefasCommand
+
+executada = Mock()
+
+
+@tarefa("testes.somar")
+def somar(a, b):
+    executada(a + b)
+
+
+esgotada = Mock()
+
+
+@tarefa("testes.falhar", ao_esgotar=esgotada)
+def falhar(**kwargs):
+    raise RuntimeError("Serviço indisponível")
+
+
+@pytest.fixture(autouse=True)
+def limpar_mock():
+    executada.reset_mock()
+    esgotada.reset_mock()
+
+
+@pytest.mark.django_db
+class TestEnfileirar:
+
+    def test_cria_tarefa_pendente(self):
+        criada = enfileirar("testes.somar", a=1, b=2)
+
+        assert criada.status == StatusTarefaChoices.PENDENTE
+        assert criada.argumentos == {"a": 1, "b": 2}
+        assert criada.tentativas == 0
+
+    def test_chave_de_idempotencia_nao_duplica(self):
+        primeira = enfileirar("testes.somar", chave_idempotencia="soma:1", a=1, b=2)
+        segunda = enfileirar("testes.somar", chave_idempotencia="soma:1", a=1, b=2)
+
+        assert primeira.pk == segunda.pk
+        assert Tarefa.objects.count() == 1
+
+    def test_reabrir_devolve_a_fila_tarefa_finalizada(self):
+        criada = enfileirar("testes.somar", chave_idempotencia="soma:2", a=1, b=2)
+        Tarefa.objects.filter(pk=criada.pk).update(status=StatusTarefaChoices.FALHA, tentativas=5)
+
+        assert enfileirar("testes.somar", chave_idempotencia="soma:2", a=1, b=2).status == StatusTarefaChoices.FALHA
+
+        reaberta = enfileirar("testes.somar", chave_idempotencia="soma:2", reabrir=True, a=1, b=2)
+
+        assert reaberta.pk == criada.pk
+        assert reaberta.status == StatusTarefaChoices.PENDENTE
+        assert reaberta.tentativas == 0
+
+    def test_tarefa_nao_registrada(self):
+        with pytest.raises(TarefaNaoRegistradaException):
+            enfileirar("testes.inexistente")
+
+
+@pytest.mark.django_db
+class TestFilaTarefasService:
+
+    def test_reservar_usa_skip_locked_e_ignora_agendadas(self):
+        disponivel = enfileirar("testes.somar", a=1, b=1)
+        enfileirar("testes.somar", executar_em=timezone.now() + timedelta(hours=1), a=2, b=2)
+
+        with CaptureQueriesContext(connection) as queries:
+            reservadas = FilaTarefasService.reservar(quantidade=10)
+
+        assert [t.pk for t in reservadas] == [disponivel.pk]
+        assert any("FOR UPDATE SKIP LOCKED" in q["sql"] for q in queries.captured_queries)
+
+        disponivel.refresh_from_db()
+        assert disponivel.status == StatusTarefaChoices.EXECUTANDO
+        assert disponivel.tentativas == 1
+        assert FilaTarefasService.reservar() == []
+
+    def test_executar_com_sucesso(self):
+        enfileirar("testes.somar", a=2, b=3)
+        reservada = FilaTarefasService.reservar()[0]
+
+        assert FilaTarefasService.executar(reservada) is True
+
+        executada.assert_called_once_with(5)
+        reservada.refresh_from_db()
+        assert reservada.status == StatusTarefaChoices.CONCLUIDA
+        assert reservada.concluida_em is not None
+
+    def test_falha_reagenda_com_backoff_exponencial(self, settings):
+        settings.TAREFAS_BACKOFF_SEGUNDOS = 10
+        criada = enfileirar("testes.falhar", max_tentativas=3)
+        esperas = []
+
+        for _ in range(2):
+            Tarefa.objects.filter(pk=criada.pk).update(executar_em=timezone.now())
+            reservada = FilaTarefasService.reservar()[0]
+            antes = timezone.now()
+            assert FilaTarefasService.executar(reservada) is False
+            reservada.refresh_from_db()
+            assert reservada.status == StatusTarefaChoices.PENDENTE
+            esperas.append(round((reservada.executar_em - antes).total_seconds()))
+
+        assert esperas == [10, 20]
+        assert reservada.ultimo_erro == "RuntimeError: Serviço indisponível"
+        esgotada.assert_not_called()
+
+    def test_falha_na_ultima_tentativa(self):
+        enfileirar("testes.falhar", max_tentativas=1, usuario_id=7)
+        reservada = FilaTarefasService.reservar()[0]
+
+        FilaTarefasService.executar(reservada)
+
+        reservada.refresh_from_db()
+        assert reservada.status == StatusTarefaChoices.FALHA
+        assert reservada.tentativas == 1
+        esgotada.assert_called_once_with(usuario_id=7)
+
+    def test_recuperar_travadas(self, settings):
+        settings.TAREFAS_TIMEOUT_SEGUNDOS = 60
+        iniciada_em = timezone.now() - timedelta(minutes=5)
+        travada = enfileirar("testes.somar", a=1, b=1)
+        esgotada = enfileirar("testes.somar", max_tentativas=1, a=1, b=1)
+        Tarefa.objects.filter(pk__in=[travada.pk, esgotada.pk]).update(
+            status=StatusTarefaChoices.EXECUTANDO, iniciada_em=iniciada_em, tentativas=1
+        )
+
+        assert FilaTarefasService.recuperar_travadas() == 2
+
+        travada.refresh_from_db()
+        esgotada.refresh_from_db()
+        assert travada.status == StatusTarefaChoices.PENDENTE
+        assert esgotada.status == StatusTarefaChoices.FALHA
+
+
+@pytest.mark.django_db
+def test_comando_processa_fila_uma_vez():
+    enfileirar("testes.somar", a=1, b=1)
+    enfileirar("testes.somar", a=2, b=2)
+    saida = StringIO()
+
+    # close_old_connections descartaria a conexão da transação do teste
+    with patch("apps.tarefas.management.commands.processar_tarefas.close_old_connections"):
+        call_command("processar_tarefas", "--uma-vez", "--concorrencia", "1", stdout=saida)
+
+    assert "Tarefas processadas: 2" in saida.getvalue()
+    assert executada.call_count == 2
+    assert not Tarefa.objects.exclude(status=StatusTarefaChoices.CONCLUIDA).exists()
+
+
+def _worker(uma_vez=False):
+    comando = ProcessarTarefasCommand()
+    comando.intervalo = 0
+    comando.uma_vez = uma_vez
+    comando.parar = threading.Event()
+    return comando
+
+
+@patch("apps.tarefas.management.commands.processar_tarefas.close_old_connections")
+def test_worker_sobrevive_a_erro_de_banco(mock_close_old_connections):
+    comando = _worker()
+
+    def reservar():
+        if mock_reservar.call_count == 1:
+            raise OperationalError("conexão perdida")
+        comando.parar.set()
+        return []
+
+    with patch.object(FilaTarefasService, "reservar", side_effect=reservar) as mock_reservar:
+        assert comando._trabalhar() == 0
+
+    assert mock_reservar.call_count == 2
+    assert mock_close_old_connections.call_count == 2
+
+
+@patch("apps.tarefas.management.commands.processar_tarefas.close_old_connections")
+def test_worker_uma_vez_propaga_o_erro(mock_close_old_connections):
+    with patch.object(FilaTarefasService, "reservar", side_effect=OperationalError("conexão perdida")):
+        with pytest.raises(OperationalError):
+            _worker(uma_vez=True)._trabalhar()
+
+
+@patch("apps.tarefas.management.commands.processar_tarefas.close_old_connections")
+@patch("apps.tarefas.management.commands.processar_tarefas.connections")
+@patch.object(FilaTarefasService, "reservar", return_value=[])
+def test_falha_na_thread_principal_para_os_workers(mock_reservar, mock_connections, mock_close, settings):
+    settings.TAREFAS_TIMEOUT_SEGUNDOS = 0
+    comando = _worker()
+
+    with patch.object(comando, "_tratar_sinais"), patch.object(
+        comando, "_recuperar_travadas", side_effect=KeyboardInterrupt
+    ):
+        with pytest.raises(KeyboardInterrupt):
+            comando._trabalhar_em_paralelo(2)
+
+    assert comando.parar.is_set()
@@ -7,6 +7,7 @@ from rest_framework.exceptions import ValidationError
 from apps.unidades.models.unidades import Unidade, TipoUnidadeChoices, TipoGestaoChoices
 from apps.unidades.services.consulta_unidade_eol_service import ConsultaDadosEolService
 from apps.helpers.exceptions import InternalError, SmeIntegracaoException
+from apps.users.perfil import obter_perfil_usuario
 
 User = get_user_model()
 
@@ -83,6 +84,8 @@ class GestaoUnidadeSerializer(serializers.ModelSerializer):
         - dre pode ser None quando a própria unidade é DRE.
         - quando vier, precisa existir e ser tipo DRE.
         - PF admin só pode atribuir DRE(s) dele.
+
+        Retorna a própria DRE, usada em create/update sem nova consulta.
         """
         request = self.context["request"]
         user = request.user
@@ -99,15 +102,10 @@ class GestaoUnidadeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("A unidade selecionada como DRE deve ser do tipo DRE.")
 
         if user.is_ponto_focal:
-            allowed_dres = set(
-                user.unidades
-                    .filter(tipo_unidade=TipoUnidadeChoices.DRE)
-                    .values_list("uuid", flat=True)
-            )
-            if dre_obj.uuid not in allowed_dres:
+            if dre_obj.codigo_eol not in obter_perfil_usuario(request).dres:
                 raise serializers.ValidationError("Ponto Focal só pode cadastrar unidades na sua DRE.")
 
-        return value
+        return dre_obj
 
     def validate(self, attrs):
         """
@@ -116,12 +114,12 @@ class GestaoUnidadeSerializer(serializers.ModelSerializer):
         - Se tipo_unidade!=DRE, dre deve existir.
         """
         tipo = attrs.get("tipo_unidade", getattr(self.instance, "tipo_unidade", None))
-        dre_uuid = attrs.get("dre", None)
+        dre = attrs.get("dre", None)
 
-        if tipo == TipoUnidadeChoices.DRE and dre_uuid:
+        if tipo == TipoUnidadeChoices.DRE and dre:
             raise serializers.ValidationError({"dre": "Unidades do tipo DRE não devem referenciar outra DRE."})
 
-        if tipo != TipoUnidadeChoices.DRE and not dre_uuid:
+        if tipo != TipoUnidadeChoices.DRE and not dre:
             raise serializers.ValidationError({"dre": "Para unidades que não são DRE, a DRE é obrigatória."})
         
         rede = attrs.get("rede")
@@ -169,24 +167,27 @@ class GestaoUnidadeSerializer(serializers.ModelSerializer):
 
         return valid
 
+    @staticmethod
+    def _validar_modelo(unidade):
+        """
+        Validação do model antes da gravação. A DRE já foi conferida em validate_dre e o
+        código EOL pelo UniqueValidator, então não são consultados novamente.
+        """
+        unidade.full_clean(exclude=["dre"], validate_unique=False)
+
     def create(self, validated_data):
         try:
-            dre_uuid = validated_data.pop("dre", None)
-
-            dre_obj = None
-            if dre_uuid:
-                dre_obj = Unidade.objects.get(uuid=dre_uuid)
-
-            unidade = Unidade.objects.create(dre=dre_obj, **validated_data)
-            unidade.full_clean()
-            unidade.save()
+            unidade = Unidade(**validated_data)
+            self._validar_modelo(unidade)
+            # codigo_eol é a chave primária informada: sem force_insert o save tentaria um UPDATE antes
+            unidade.save(force_insert=True)
             return unidade
         except Exception as e:
             raise ValidationError({"detail": str(e)})
 
     def update(self, instance, validated_data):
         try:
-            dre_uuid = validated_data.pop("dre", None)
+            dre = validated_data.pop("dre", None)
 
             # atualiza campos simples
             for attr, value in validated_data.items():
@@ -197,12 +198,9 @@ class GestaoUnidadeSerializer(serializers.ModelSerializer):
                 instance.dre = None
             # Caso contrário, atualiza a DRE se vier no payload
             elif "dre" in self.initial_data:
-                if dre_uuid:
-                    instance.dre = Unidade.objects.get(uuid=dre_uuid)
-                else:
-                    instance.dre = None
+                instance.dre = dre
 
-            instance.full_clean()
+            self._validar_modelo(instance)
             instance.save()
             return instance
         except Exception as e:
@@ -265,6 +263,10 @@ class GestaoUnidadeListaSerializer(serializers.ModelSerializer):
         if not obj.responsavel_inativacao:
             return None
 
+        # Anotado pelo viewset (User.nome_por_username) na consulta da listagem
+        if hasattr(obj, "responsavel_inativacao_nome"):
+            return obj.responsavel_inativacao_nome
+
         try:
             user = User.objects.only("name").get(
                 username=obj.responsavel_inativacao
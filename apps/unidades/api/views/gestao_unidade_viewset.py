@@ -1,4 +1,5 @@
 from django.db.models import Q
+from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -13,6 +14,11 @@ from apps.unidades.api.serializers.gestao_unidade_serializer import (
 )
 from apps.unidades.services.consulta_unidade_eol_service import ConsultaDadosEolService
 from apps.unidades.services.gestao_unidade_service import InativarUnidadeService, ReativarUnidadeService
+from apps.users.perfil import obter_perfil_usuario
+from apps.helpers.idempotencia import idempotente
+
+User = get_user_model()
+
 
 class GestaoUnidadeViewSet(ModelViewSet):
 
@@ -36,19 +42,22 @@ class GestaoUnidadeViewSet(ModelViewSet):
         
         qs = self.queryset
 
+        if self.action in ("list", "retrieve"):
+            qs = qs.annotate(
+                responsavel_inativacao_nome=User.nome_por_username("responsavel_inativacao")
+            )
+
         if user.is_gipe:
             base_qs = qs
 
         elif user.is_ponto_focal:
 
-            dres_pf = user.unidades.filter(
-                tipo_unidade=TipoUnidadeChoices.DRE
-            ).values_list("uuid", flat=True)
+            dres_pf = obter_perfil_usuario(self.request).dres
 
             # Retorna as DREs do ponto focal OU unidades subordinadas a essas DREs
             base_qs = qs.filter(
-                Q(uuid__in=dres_pf) | Q(dre__uuid__in=dres_pf)
-            ).distinct()
+                Q(codigo_eol__in=dres_pf) | Q(dre_id__in=dres_pf)
+            )
 
         else:
             base_qs = qs.none()
@@ -74,6 +83,7 @@ class GestaoUnidadeViewSet(ModelViewSet):
         return base_qs
 
     @action(detail=True, methods=["post"], url_path="inativar")
+    @idempotente
     def inativar(self, request, uuid=None):
         unidade = self.get_object()
         motivo_inativacao = request.data.get("motivo_inativacao")
@@ -96,6 +106,7 @@ class GestaoUnidadeViewSet(ModelViewSet):
         )
     
     @action(detail=True, methods=["post"], url_path="reativar")
+    @idempotente
     def reativar(self, request, uuid=None):
         unidade = self.get_object()
 
@@ -141,7 +152,7 @@ class GestaoUnidadeViewSet(ModelViewSet):
         is_dre = unidade_eol["codigo"] == codigo_dre
 
         dre_da_unidade = codigo_dre
-        dre_do_usuario = user.unidades.values_list("codigo_eol", flat=True).first()
+        dre_do_usuario = obter_perfil_usuario(request).codigo_unidade_principal
 
         try:
             validator = ConsultaEolValidator()
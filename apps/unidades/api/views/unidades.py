@@ -1,6 +1,7 @@
 import uuid
 import logging
  
+from django.conf import settings
 from django.shortcuts import get_object_or_404
  
 from rest_framework import status
@@ -9,6 +10,7 @@ from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
+from apps.helpers.utils import AvaliacaoTardia, em_blocos
 from apps.unidades.api.serializers.unidades import UnidadeSerializer
 from apps.unidades.models.unidades import Unidade, TipoUnidadeChoices, TipoGestaoChoices
 from apps.unidades.services.consulta_unidade_eol_service import ConsultaDadosEolService
@@ -21,7 +23,8 @@ class UnidadeViewSet(ModelViewSet):
     serializer_class = UnidadeSerializer
 
     def get_queryset(self):
-        queryset = Unidade.objects.all()
+        # UnidadeSerializer lê dre.nome e dre.codigo_eol de cada unidade
+        queryset = Unidade.objects.select_related("dre")
 
         ativas = self.request.query_params.get("ativas", "")
 
@@ -58,7 +61,8 @@ class UnidadeViewSet(ModelViewSet):
  
     def _listar_dres(self):
         unidades = self.get_queryset().filter(tipo_unidade=TipoUnidadeChoices.DRE).order_by("tipo_unidade", "nome")
-        logger.info("Filtrando unidades do tipo DRE. Quantidade encontrada: %d", unidades.count())
+        # len() carrega o queryset (reaproveitado pelo serializer) em vez de um COUNT à parte
+        logger.info("Filtrando unidades do tipo DRE. Quantidade encontrada: %s", AvaliacaoTardia(len, unidades))
         return self._responder_com_serializador(unidades)
  
     def _listar_ues(self, codigo_dre, rede=None):
@@ -118,8 +122,8 @@ class UnidadeViewSet(ModelViewSet):
         unidades = unidades.order_by("tipo_unidade", "nome")
         
         logger.info(
-            "UEs vinculadas à DRE uuid='%s' (rede='%s'). Quantidade encontrada: %d",
-            codigo_dre, rede or 'INDIRETA', unidades.count()
+            "UEs vinculadas à DRE uuid='%s' (rede='%s'). Quantidade encontrada: %s",
+            codigo_dre, rede or 'INDIRETA', AvaliacaoTardia(len, unidades)
         )
         return self._responder_com_serializador(unidades)
  
@@ -142,7 +146,19 @@ class UnidadeViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        unidades = Unidade.objects.filter(codigo_eol__in=codigos)
+        limite = settings.UNIDADES_BATCH_MAXIMO
+        if len(codigos) > limite:
+            return Response(
+                {"detail": f"Informe no máximo {limite} códigos por requisição."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        codigos = list(dict.fromkeys(str(codigo) for codigo in codigos))
+
+        unidades = []
+        for bloco in em_blocos(codigos, settings.UNIDADES_BATCH_LOTE):
+            unidades.extend(Unidade.objects.select_related("dre").filter(codigo_eol__in=bloco))
+
         serializer = UnidadeSerializer(unidades, many=True)
 
         resposta = {
@@ -0,0 +1,80 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.unidades.services.consulta_unidade_eol_service import ConsultaDadosEolService
+from apps.unidades.services.sincronizar_unidades_service import SincronizarUnidadesService
+
+
+class Command(BaseCommand):
+    help = (
+        "Sincroniza as unidades com o catálogo do EOL (ou com um arquivo exportado dele), "
+        "inserindo e atualizando unidades em lote."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--arquivo",
+            help="Arquivo .json (lista) ou .csv com os registros do EOL, no lugar da consulta à API.",
+        )
+        parser.add_argument(
+            "--desativar-ausentes",
+            action="store_true",
+            help="Marca como inativas as unidades locais que não constam no catálogo.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Apenas mostra o que seria alterado, sem gravar no banco.",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=500,
+            help="Quantidade de unidades por operação em lote (padrão: 500).",
+        )
+
+    def handle(self, *args, **options):
+        registros = self._carregar_registros(options["arquivo"])
+
+        resumo = SincronizarUnidadesService(
+            registros=registros,
+            desativar_ausentes=options["desativar_ausentes"],
+            dry_run=options["dry_run"],
+            tamanho_lote=options["lote"],
+        ).executar()
+
+        for ignorada in resumo["ignoradas"]:
+            self.stdout.write(self.style.WARNING(f"Ignorada {ignorada['codigo_eol']}: {ignorada['motivo']}"))
+
+        prefixo = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefixo}Inseridas: {resumo['inseridas']} | Atualizadas: {resumo['atualizadas']} | "
+            f"Desativadas: {resumo['desativadas']} | Ignoradas: {len(resumo['ignoradas'])}"
+        ))
+
+    def _carregar_registros(self, arquivo):
+        if not arquivo:
+            try:
+                return ConsultaDadosEolService.listar_unidades()
+            except Exception as e:
+                raise CommandError(f"Falha ao consultar o catálogo do EOL: {e}")
+
+        caminho = Path(arquivo)
+        if not caminho.exists():
+            raise CommandError(f"Arquivo não encontrado: {arquivo}")
+
+        if caminho.suffix.lower() == ".json":
+            with caminho.open(encoding="utf-8") as f:
+                registros = json.load(f)
+            if not isinstance(registros, list):
+                raise CommandError("O arquivo .json deve conter uma lista de unidades.")
+            return registros
+
+        if caminho.suffix.lower() == ".csv":
+            with caminho.open(encoding="utf-8-sig", newline="") as f:
+                return list(csv.DictReader(f))
+
+        raise CommandError("Formato de arquivo inválido. Utilize .json ou .csv.")
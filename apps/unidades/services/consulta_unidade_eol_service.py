@@ -18,6 +18,7 @@ class ConsultaDadosEolService:
     }
 
     DEFAULT_TIMEOUT = 30
+    CATALOGO_TIMEOUT = 120
 
     @classmethod
     def consultar_dados_unidade(cls, codigo_escola_eol: str) -> dict:
@@ -74,4 +75,47 @@ class ConsultaDadosEolService:
                 codigo_escola_eol,
                 str(e),
             )
-            raise InternalError("Não foi possível realizar a consulta. Tente novamente mais tarde.")
\ No newline at end of file
+            raise InternalError("Não foi possível realizar a consulta. Tente novamente mais tarde.")
+
+    @classmethod
+    def listar_unidades(cls) -> list[dict]:
+        """
+        Consulta o catálogo completo de unidades no SME Integração.
+
+        Cada item segue o formato de consultar_dados_unidade
+        (codigo, nomeExibicao, codigoDRE, nomeDRE, siglaTipoEscola).
+        """
+
+        base_url = env("SME_INTEGRACAO_URL", default="")
+        url = f"{base_url}{env('EOL_CATALOGO_UNIDADES_PATH', default='/escolas')}"
+
+        try:
+            logger.info("Consultando catálogo de unidades no SME Integração.")
+
+            response = requests.get(
+                url,
+                headers=cls.DEFAULT_HEADERS,
+                timeout=cls.CATALOGO_TIMEOUT,
+            )
+
+            if response.status_code != 200:
+                logger.warning("Erro HTTP %s ao consultar catálogo de unidades", response.status_code)
+                raise SmeIntegracaoException(
+                    f"Erro ao consultar catálogo de unidades: {response.status_code}"
+                )
+
+            response_data = response.json()
+
+            if not isinstance(response_data, list):
+                raise SmeIntegracaoException("Formato inesperado no catálogo de unidades.")
+
+            logger.info("Catálogo de unidades consultado com sucesso. Total: %s", len(response_data))
+
+            return response_data
+
+        except SmeIntegracaoException:
+            raise
+
+        except Exception as e:
+            logger.error("Erro inesperado ao consultar catálogo de unidades: %s", str(e))
+            raise InternalError("Não foi possível realizar a consulta. Tente novamente mais tarde.")
@@ -1,3 +1,5 @@
+import logging
+
 from django.utils import timezone
 from django.db import transaction
 from rest_framework.exceptions import ValidationError
@@ -7,6 +9,19 @@ from apps.users.services.envia_email_service import EnviaEmailService
 from apps.users.services.gestao_usuario_service import InativarUsuarioService, ReativarUsuarioService
 from apps.unidades.models.unidades import TipoGestaoChoices
 
+logger = logging.getLogger(__name__)
+
+
+def _enviar_emails(mensagens) -> None:
+    """ Envia as notificações aos usuários da unidade por uma única conexão SMTP (por bloco). """
+    falhas = {
+        destinatario: erro
+        for destinatario, erro in EnviaEmailService.enviar_em_lote(mensagens).items()
+        if erro is not None
+    }
+    if falhas:
+        logger.warning("Falha ao enviar %s e-mail(s) da unidade: %s", len(falhas), falhas)
+
 
 class InativarUnidadeService:
 
@@ -45,6 +60,8 @@ class InativarUnidadeService:
         ])
 
     def _inativar_usuarios(self, usuarios):
+        mensagens = []
+
         for usuario in usuarios:
             if not usuario.is_active:
                 continue
@@ -62,12 +79,15 @@ class InativarUnidadeService:
                 "nome_ue": self.unidade.nome
             }
 
-            EnviaEmailService.enviar(
-                destinatario=usuario.email,
-                assunto="Inativação da Unidade Educacional no GIPE",
-                template_html="emails/inativacao_unidade.html",
-                contexto=contexto_email,
-            )
+            mensagens.append({
+                "destinatario": usuario.email,
+                "assunto": "Inativação da Unidade Educacional no GIPE",
+                "template_html": "emails/inativacao_unidade.html",
+                "contexto": contexto_email,
+            })
+
+        if mensagens:
+            transaction.on_commit(lambda: _enviar_emails(mensagens))
 
 
 class ReativarUnidadeService:
@@ -117,6 +137,8 @@ class ReativarUnidadeService:
         ])
     
     def _reativar_usuarios(self, usuarios):
+        mensagens = []
+
         for usuario in usuarios:
             ReativarUsuarioService.reativar(
                 usuario_a_ser_reativado=usuario
@@ -128,9 +150,12 @@ class ReativarUnidadeService:
                 "nome_ue": self.unidade.nome
             }
 
-            EnviaEmailService.enviar(
-                destinatario=usuario.email,
-                assunto="Reativação de perfil no GIPE",
-                template_html="emails/reativacao_unidade.html",
-                contexto=contexto_email,
-            )
\ No newline at end of file
+            mensagens.append({
+                "destinatario": usuario.email,
+                "assunto": "Reativação de perfil no GIPE",
+                "template_html": "emails/reativacao_unidade.html",
+                "contexto": contexto_email,
+            })
+
+        if mensagens:
+            transaction.on_commit(lambda: _enviar_emails(mensagens))
\ No newline at end of file
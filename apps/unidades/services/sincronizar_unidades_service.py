@@ -0,0 +1,153 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.helpers.utils import em_blocos
+from apps.unidades.models.unidades import TipoUnidadeChoices, Unidade
+from apps.users.cache_me import invalidar_me_catalogo
+
+logger = logging.getLogger(__name__)
+
+MOTIVO_INATIVACAO_SINCRONIZACAO = "Unidade ausente do catálogo do EOL."
+
+
+class SincronizarUnidadesService:
+    """
+    Sincroniza a tabela de unidades com o catálogo do EOL.
+
+    O catálogo é comparado em memória com as unidades locais (uma única consulta) e as
+    diferenças são aplicadas com bulk_create/bulk_update em blocos. Opcionalmente,
+    unidades locais que não constam no catálogo são marcadas como inativas; os usuários
+    vinculados não são alterados (para isso use a inativação de unidade da gestão).
+
+    A rede (direta/indireta) não vem do catálogo e é mantida como está.
+    """
+
+    def __init__(self, *, registros, desativar_ausentes=False, dry_run=False, tamanho_lote=500):
+        self.registros = registros
+        self.desativar_ausentes = desativar_ausentes
+        self.dry_run = dry_run
+        self.tamanho_lote = tamanho_lote
+        self.ignorados = []
+
+    def executar(self) -> dict:
+        catalogo = self._normalizar_catalogo()
+
+        locais = {
+            unidade.codigo_eol: unidade
+            for unidade in Unidade.objects.only(
+                "codigo_eol", "nome", "tipo_unidade", "dre_id", "ativa"
+            )
+        }
+
+        novas, alteradas = self._comparar(catalogo, locais)
+        ausentes = []
+        if self.desativar_ausentes:
+            ausentes = [
+                unidade for codigo, unidade in locais.items()
+                if codigo not in catalogo and unidade.ativa
+            ]
+
+        if not self.dry_run:
+            self._aplicar(novas, alteradas, ausentes)
+
+        resumo = {
+            "inseridas": len(novas),
+            "atualizadas": len(alteradas),
+            "desativadas": len(ausentes),
+            "ignoradas": self.ignorados,
+        }
+        logger.info(
+            "Sincronização de unidades%s: %d inserida(s), %d atualizada(s), %d desativada(s), %d ignorada(s).",
+            " (dry-run)" if self.dry_run else "",
+            resumo["inseridas"], resumo["atualizadas"], resumo["desativadas"], len(self.ignorados)
+        )
+        return resumo
+
+    def _normalizar_catalogo(self) -> dict:
+        """ Converte os registros do EOL em codigo_eol -> valores dos campos sincronizados. """
+
+        catalogo = {}
+        for registro in self.registros:
+            codigo = str(registro.get("codigo") or "").strip().zfill(6)
+            codigo_dre = str(registro.get("codigoDRE") or "").strip().zfill(6)
+            is_dre = codigo == codigo_dre
+
+            if is_dre:
+                tipo_unidade = TipoUnidadeChoices.DRE
+                nome = registro.get("nomeDRE") or registro.get("nomeExibicao") or ""
+            else:
+                tipo_unidade = (registro.get("siglaTipoEscola") or "").strip()
+                nome = registro.get("nomeExibicao") or registro.get("nome") or ""
+
+            nome = nome.strip()
+
+            if codigo == "000000" or not nome:
+                self.ignorados.append({"codigo_eol": codigo, "motivo": "Registro sem código ou nome."})
+                continue
+
+            if tipo_unidade not in TipoUnidadeChoices.values:
+                self.ignorados.append(
+                    {"codigo_eol": codigo, "motivo": f"Tipo de unidade desconhecido: {tipo_unidade}."}
+                )
+                continue
+
+            catalogo[codigo] = {
+                "nome": nome[:160],
+                "tipo_unidade": tipo_unidade,
+                "dre_id": None if is_dre else codigo_dre,
+            }
+
+        # Unidades cuja DRE não existe no catálogo violariam a FK
+        for codigo, valores in list(catalogo.items()):
+            dre_id = valores["dre_id"]
+            if dre_id and catalogo.get(dre_id, {}).get("tipo_unidade") != TipoUnidadeChoices.DRE:
+                self.ignorados.append({"codigo_eol": codigo, "motivo": f"DRE {dre_id} não encontrada no catálogo."})
+                del catalogo[codigo]
+
+        return catalogo
+
+    def _comparar(self, catalogo, locais):
+        novas = []
+        alteradas = []
+
+        for codigo, valores in catalogo.items():
+            unidade = locais.get(codigo)
+
+            if unidade is None:
+                novas.append(Unidade(codigo_eol=codigo, **valores))
+                continue
+
+            if any(getattr(unidade, campo) != valor for campo, valor in valores.items()):
+                for campo, valor in valores.items():
+                    setattr(unidade, campo, valor)
+                alteradas.append(unidade)
+
+        # DREs primeiro, para que as escolas já encontrem a DRE criada
+        novas.sort(key=lambda unidade: unidade.tipo_unidade != TipoUnidadeChoices.DRE)
+        return novas, alteradas
+
+    def _aplicar(self, novas, alteradas, ausentes):
+        agora = timezone.now()
+
+        with transaction.atomic():
+            for bloco in em_blocos(novas, self.tamanho_lote):
+                Unidade.objects.bulk_create(bloco)
+
+            for unidade in alteradas:
+                unidade.alterado_em = agora
+            for bloco in em_blocos(alteradas, self.tamanho_lote):
+                Unidade.objects.bulk_update(bloco, ["nome", "tipo_unidade", "dre", "alterado_em"])
+
+            for bloco in em_blocos(ausentes, self.tamanho_lote):
+                Unidade.objects.filter(pk__in=[unidade.pk for unidade in bloco]).update(
+                    ativa=False,
+                    data_inativacao=agora,
+                    motivo_inativacao=MOTIVO_INATIVACAO_SINCRONIZACAO,
+                    alterado_em=agora,
+                )
+
+            # bulk_create/bulk_update/update não disparam os sinais de Unidade
+            if novas or alteradas or ausentes:
+                invalidar_me_catalogo()
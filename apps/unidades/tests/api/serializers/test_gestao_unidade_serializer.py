@@ -1,6 +1,8 @@
 import pytest
 from django.utils import timezone
 from unittest.mock import Mock, patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from django.contrib.auth import get_user_model
@@ -65,8 +67,8 @@ class TestGestaoUnidadeSerializer:
         serializer = GestaoUnidadeSerializer(context={"request": request})
 
         # Deve aceitar ambas DREs
-        assert serializer.validate_dre(dre_sp.uuid) == dre_sp.uuid
-        assert serializer.validate_dre(dre_outra.uuid) == dre_outra.uuid
+        assert serializer.validate_dre(dre_sp.uuid) == dre_sp
+        assert serializer.validate_dre(dre_outra.uuid) == dre_outra
 
     def test_validate_dre_pf_apenas_sua_dre(
         self, api_rf, user_pf_admin, dre_sp, dre_outra
@@ -78,7 +80,7 @@ class TestGestaoUnidadeSerializer:
         serializer = GestaoUnidadeSerializer(context={"request": request})
 
         # Deve aceitar dre_sp (sua DRE)
-        assert serializer.validate_dre(dre_sp.uuid) == dre_sp.uuid
+        assert serializer.validate_dre(dre_sp.uuid) == dre_sp
 
         # Deve rejeitar dre_outra
         with pytest.raises(ValidationError) as excinfo:
@@ -408,7 +410,7 @@ class TestGestaoUnidadeSerializerExceptions:
 
         assert serializer.is_valid(raise_exception=True)
 
-        with patch.object(Unidade.objects, "create", side_effect=Exception("Erro inesperado")):
+        with patch.object(Unidade, "save", side_effect=Exception("Erro inesperado")):
             with pytest.raises(ValidationError) as excinfo:
                 serializer.save()
 
@@ -684,4 +686,35 @@ def test_update_dre_limpa_referencia_quando_instancia_e_dre(
         with patch.object(dre_sp, "full_clean"):
             unidade = serializer.save()
 
-    assert unidade.dre is None
\ No newline at end of file
+    assert unidade.dre is None
+
+
+@pytest.mark.django_db
+def test_create_resolve_dre_uma_vez_e_grava_com_um_insert(api_rf, user_gipe_admin, dre_sp):
+    request = api_rf.post("/fake/")
+    request.user = user_gipe_admin
+
+    serializer = GestaoUnidadeSerializer(
+        data={
+            "tipo_unidade": TipoUnidadeChoices.CEI,
+            "nome": "CEI Nova",
+            "rede": TipoGestaoChoices.INDIRETA,
+            "codigo_eol": "454545",
+            "dre": str(dre_sp.uuid),
+        },
+        context={"request": request},
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        assert serializer.is_valid()
+        unidade = serializer.save()
+
+    tabela = f'"{Unidade._meta.db_table}"'
+    sqls = [q["sql"] for q in queries.captured_queries if tabela in q["sql"]]
+    escritas = [sql for sql in sqls if sql.startswith(("INSERT", "UPDATE"))]
+    consultas_dre = [sql for sql in sqls if sql.startswith("SELECT") and str(dre_sp.uuid).replace("-", "") in sql]
+
+    assert len(escritas) == 1 and escritas[0].startswith("INSERT")
+    assert len(consultas_dre) == 1
+    assert Unidade.objects.get(codigo_eol="454545").dre == dre_sp
+    assert unidade.dre == dre_sp
@@ -3,7 +3,9 @@ import secrets
 import uuid as uuid_lib
 
 from unittest.mock import patch, Mock
+from django.db import connection
 from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from apps.users.models import Cargo, User
@@ -163,6 +165,38 @@ class TestGestaoUnidadeViewSetList:
         uuids = {item["uuid"] for item in response.data}
         assert str(escola_outra.uuid) not in uuids
         
+    def test_list_resolve_nomes_dos_responsaveis_na_mesma_consulta(
+        self, api_client, user_gipe_admin, dre_sp, dre_outra, escola_sp, escola_outra
+    ):
+        """O nome do responsável pela inativação não gera uma consulta por unidade."""
+        api_client.force_authenticate(user=user_gipe_admin)
+        url = reverse("unidades:gestao-unidades-list")
+        user_gipe_admin.name = "Admin GIPE"
+        user_gipe_admin.save()
+
+        def listar():
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            selects = [q for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+            return response, len(selects)
+
+        _, consultas_sem_inativas = listar()
+
+        Unidade.objects.filter(pk__in=[escola_sp.pk, escola_outra.pk]).update(
+            ativa=False, responsavel_inativacao=user_gipe_admin.username
+        )
+        Unidade.objects.filter(pk=dre_outra.pk).update(ativa=False, responsavel_inativacao="inexistente")
+
+        response, consultas_com_inativas = listar()
+
+        assert consultas_com_inativas == consultas_sem_inativas
+        nomes = {item["uuid"]: item["responsavel_inativacao_nome"] for item in response.data}
+        assert nomes[str(escola_sp.uuid)] == "Admin GIPE"
+        assert nomes[str(escola_outra.uuid)] == "Admin GIPE"
+        assert nomes[str(dre_outra.uuid)] is None
+        assert nomes[str(dre_sp.uuid)] is None
+
     def test_tipos_unidade_endpoint(
         self, api_client, user_gipe_admin
     ):
@@ -576,6 +610,22 @@ class TestGestaoUnidadeViewSetInativar:
 
         mock_executar.assert_called_once()
 
+    @patch("apps.unidades.api.views.gestao_unidade_viewset.InativarUnidadeService.executar")
+    def test_inativar_repetido_com_idempotency_key_executa_uma_vez(
+        self, mock_executar, api_client, user_gipe_admin, escola_sp, django_capture_on_commit_callbacks
+    ):
+        api_client.force_authenticate(user=user_gipe_admin)
+        url = reverse("unidades:gestao-unidades-inativar", kwargs={"uuid": escola_sp.uuid})
+        headers = {"HTTP_IDEMPOTENCY_KEY": str(uuid_lib.uuid4())}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            primeira = api_client.post(url, data={"motivo_inativacao": "Encerramento"}, **headers)
+        repetida = api_client.post(url, data={"motivo_inativacao": "Encerramento"}, **headers)
+
+        assert primeira.status_code == repetida.status_code == status.HTTP_200_OK
+        assert repetida.data == primeira.data
+        mock_executar.assert_called_once()
+
 
 @pytest.mark.django_db
 class TestGestaoUnidadeViewSetReativar:
@@ -1,18 +1,22 @@
+import logging
 import secrets
 import pytest
 import uuid as uuid_lib
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from django.db import connection
 from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
 
 from apps.unidades.models.unidades import (
     Unidade,
     TipoUnidadeChoices,
     TipoGestaoChoices,
 )
+from apps.helpers.utils import AvaliacaoTardia
 
 User = get_user_model()
 
@@ -262,4 +266,89 @@ class TestUnidadeViewSet:
         assert "DRE Teste" in nomes
         assert "UE Indireta" in nomes
         assert "DRE Inativa" not in nomes
-        assert "UE Indireta Inativa" not in nomes
\ No newline at end of file
+        assert "UE Indireta Inativa" not in nomes
+
+def test_avaliacao_tardia_so_calcula_quando_emitida(caplog):
+    calcular = Mock(return_value=42)
+    caplog.set_level(logging.INFO, logger="teste.avaliacao_tardia")
+    logger = logging.getLogger("teste.avaliacao_tardia")
+
+    logger.debug("Total: %s", AvaliacaoTardia(calcular))
+    calcular.assert_not_called()
+
+    logger.info("Total: %s", AvaliacaoTardia(calcular))
+    calcular.assert_called_once_with()
+    assert "Total: 42" in caplog.text
+
+
+def selects(queries):
+    return [q["sql"] for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+
+
+@pytest.fixture
+def varias_ues(dre):
+    return [
+        Unidade.objects.create(
+            codigo_eol=f"90000{i}",
+            nome=f"UE {i}",
+            tipo_unidade=TipoUnidadeChoices.CEI,
+            rede=TipoGestaoChoices.INDIRETA,
+            dre=dre,
+        )
+        for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+class TestUnidadeViewSetConsultas:
+
+    def test_listagem_nao_consulta_dre_por_unidade(self, api_client, varias_ues):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/api/unidades/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 6
+        assert len(selects(queries)) == 1
+
+    def test_listagem_de_ues_da_dre_nao_consulta_dre_por_unidade(self, api_client, dre, varias_ues):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(f"/api/unidades/?tipo=UE&dre={dre.uuid}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {u["dre_nome"] for u in response.data} == {"DRE Teste"}
+        # DRE do filtro + listagem (a quantidade do log vem da própria listagem)
+        assert len(selects(queries)) == 2
+
+    @pytest.mark.parametrize("nivel", [logging.INFO, logging.WARNING])
+    def test_listagem_de_dres_nao_faz_count_para_o_log(self, api_client, dre, caplog, nivel):
+        caplog.set_level(nivel, logger="apps.unidades.api.views.unidades")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/api/unidades/?tipo=DRE")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+        assert len(selects(queries)) == 1
+        assert not any("COUNT(" in sql for sql in selects(queries))
+        if nivel == logging.INFO:
+            assert "Quantidade encontrada: 1" in caplog.text
+
+    def test_batch_consulta_em_blocos(self, api_client, settings, varias_ues):
+        settings.UNIDADES_BATCH_LOTE = 2
+        codigos = [ue.codigo_eol for ue in varias_ues[:3]] + [varias_ues[0].codigo_eol]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post("/api/unidades/batch/", {"codigos": codigos}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == set(codigos)
+        assert response.data[codigos[0]]["dre_nome"] == "DRE Teste"
+        assert len(selects(queries)) == 2
+
+    def test_batch_acima_do_limite(self, api_client, settings):
+        settings.UNIDADES_BATCH_MAXIMO = 2
+
+        response = api_client.post("/api/unidades/batch/", {"codigos": ["1", "2", "3"]}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"] == "Informe no máximo 2 códigos por requisição."
@@ -88,4 +88,35 @@ class TestConsultaDadosEolService:
         with pytest.raises(InternalError) as exc:
             ConsultaDadosEolService.consultar_dados_unidade("222222")
 
-        assert str(exc.value) == "Não foi possível realizar a consulta. Tente novamente mais tarde."
\ No newline at end of file
+        assert str(exc.value) == "Não foi possível realizar a consulta. Tente novamente mais tarde."
+    @patch("apps.unidades.services.consulta_unidade_eol_service.env")
+    @patch("apps.unidades.services.consulta_unidade_eol_service.requests.get")
+    def test_listar_unidades_sucesso(self, mock_get, mock_env):
+        mock_env.side_effect = lambda chave, default="": {
+            "SME_INTEGRACAO_URL": self.BASE_URL,
+        }.get(chave, default)
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"codigo": "222222", "codigoDRE": "111111"}]
+        mock_get.return_value = mock_response
+
+        result = ConsultaDadosEolService.listar_unidades()
+
+        mock_get.assert_called_once_with(
+            f"{self.BASE_URL}/escolas",
+            headers=ConsultaDadosEolService.DEFAULT_HEADERS,
+            timeout=ConsultaDadosEolService.CATALOGO_TIMEOUT,
+        )
+        assert result == [{"codigo": "222222", "codigoDRE": "111111"}]
+
+    @patch("apps.unidades.services.consulta_unidade_eol_service.requests.get")
+    def test_listar_unidades_erro_http(self, mock_get):
+        mock_response = Mock()
+        mock_response.status_code = 500
+        mock_get.return_value = mock_response
+
+        with pytest.raises(SmeIntegracaoException) as exc:
+            ConsultaDadosEolService.listar_unidades()
+
+        assert "Erro ao consultar catálogo de unidades" in str(exc.value)
@@ -97,7 +97,7 @@ class TestInativarUnidadeService:
         assert usuario_vinculado_unidade.is_active is True
     
     def test_envia_email_com_contexto_correto_para_usuario_inativado(
-        self, escola_sp, user_gipe_admin, usuario_vinculado_unidade
+        self, escola_sp, user_gipe_admin, usuario_vinculado_unidade, django_capture_on_commit_callbacks
     ):
         escola_sp.rede = "INDIRETA"
         escola_sp.ativa = True
@@ -113,15 +113,19 @@ class TestInativarUnidadeService:
         with patch(
             "apps.users.services.gestao_usuario_service.InativarUsuarioService.inativar"
         ) as mock_inativar_usuario, patch(
-            "apps.users.services.envia_email_service.EnviaEmailService.enviar"
-        ) as mock_enviar_email:
+            "apps.users.services.envia_email_service.EnviaEmailService.enviar_em_lote",
+            return_value={usuario_vinculado_unidade.email: None},
+        ) as mock_enviar_em_lote:
 
-            service.executar()
+            with django_capture_on_commit_callbacks(execute=True):
+                service.executar()
 
             mock_inativar_usuario.assert_called_once()
-            mock_enviar_email.assert_called_once()
+            mock_enviar_em_lote.assert_called_once()
 
-            kwargs = mock_enviar_email.call_args.kwargs
+            mensagens = mock_enviar_em_lote.call_args.args[0]
+            assert len(mensagens) == 1
+            kwargs = mensagens[0]
 
             assert kwargs["destinatario"] == usuario_vinculado_unidade.email
             assert kwargs["assunto"] == "Inativação da Unidade Educacional no GIPE"
@@ -133,6 +137,27 @@ class TestInativarUnidadeService:
                 "nome_ue": "Escola Teste",
             }
 
+    def test_email_so_e_enviado_apos_commit(self, escola_sp, user_gipe_admin, usuario_vinculado_unidade):
+        escola_sp.rede = "INDIRETA"
+        escola_sp.ativa = True
+        escola_sp.save()
+
+        service = InativarUnidadeService(
+            unidade=escola_sp,
+            usuario_responsavel=str(user_gipe_admin),
+            motivo_inativacao="Motivo X",
+        )
+
+        with patch(
+            "apps.users.services.gestao_usuario_service.InativarUsuarioService.inativar"
+        ) as mock_inativar_usuario, patch(
+            "apps.users.services.envia_email_service.EnviaEmailService.enviar_em_lote"
+        ) as mock_enviar_em_lote:
+            service.executar()
+
+        mock_inativar_usuario.assert_called_once()
+        mock_enviar_em_lote.assert_not_called()
+
 
 @pytest.mark.django_db
 class TestReativarUnidadeService:
@@ -211,7 +236,7 @@ class TestReativarUnidadeService:
 
         assert escola_sp.data_reativacao is not None
 
-    @patch("apps.unidades.services.gestao_unidade_service.EnviaEmailService.enviar")
+    @patch("apps.unidades.services.gestao_unidade_service.EnviaEmailService.enviar_em_lote", return_value={})
     @patch("apps.unidades.services.gestao_unidade_service.ReativarUsuarioService.reativar")
     def test_reativa_usuarios_e_envia_email(
         self,
@@ -220,6 +245,7 @@ class TestReativarUnidadeService:
         escola_sp,
         user_gipe_admin,
         django_user_model,
+        django_capture_on_commit_callbacks,
     ):
         escola_sp.rede = "INDIRETA"
         escola_sp.ativa = False
@@ -251,23 +277,27 @@ class TestReativarUnidadeService:
             motivo_reativacao="Reabertura",
         )
 
-        service.executar()
+        with django_capture_on_commit_callbacks(execute=True):
+            service.executar()
 
         assert mock_reativar_usuario.call_count == 2
         mock_reativar_usuario.assert_any_call(usuario_a_ser_reativado=usuario1)
         mock_reativar_usuario.assert_any_call(usuario_a_ser_reativado=usuario2)
 
-        assert mock_envia_email.call_count == 2
-        mock_envia_email.assert_any_call(
-            destinatario="u1@test.com",
-            assunto="Reativação de perfil no GIPE",
-            template_html="emails/reativacao_unidade.html",
-            contexto={
+        # Uma única chamada com as mensagens de todos os usuários
+        mock_envia_email.assert_called_once()
+        mensagens = mock_envia_email.call_args.args[0]
+        assert len(mensagens) == 2
+        assert {
+            "destinatario": "u1@test.com",
+            "assunto": "Reativação de perfil no GIPE",
+            "template_html": "emails/reativacao_unidade.html",
+            "contexto": {
                 "nome_usuario": "Usuário 1",
                 "motivo_reativacao": "Reabertura",
                 "nome_ue": escola_sp.nome,
             },
-        )
+        } in mensagens
     
     @patch("apps.unidades.services.gestao_unidade_service.ReativarUsuarioService.reativar")
     def test_transaction_rollback_se_falhar_reativacao_usuario(
@@ -330,7 +360,7 @@ class TestReativarUnidadeService:
             cpf="22222222222",
             name="Usuário Ativo",
             cargo=cargo,
-            email="teste@teste.com",
+            email="ativo@teste.com",
             is_active=True,
         )
 
@@ -0,0 +1,113 @@
+import json
+import pytest
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.unidades.models.unidades import TipoUnidadeChoices, Unidade
+from apps.unidades.services.sincronizar_unidades_service import (
+    MOTIVO_INATIVACAO_SINCRONIZACAO,
+    SincronizarUnidadesService,
+)
+
+
+def registro_dre(codigo, nome):
+    return {"codigo": codigo, "codigoDRE": codigo, "nomeDRE": nome, "siglaTipoEscola": ""}
+
+
+def registro_escola(codigo, nome, codigo_dre, tipo="EMEI"):
+    return {"codigo": codigo, "codigoDRE": codigo_dre, "nomeExibicao": nome, "siglaTipoEscola": tipo}
+
+
+@pytest.mark.django_db
+class TestSincronizarUnidadesService:
+
+    def test_insere_atualiza_e_ignora(self, escola_sp, dre_sp):
+        registros = [
+            registro_dre("108500", "DRE São Paulo"),
+            registro_dre("108600", "DRE Nova"),
+            registro_escola("200237", "EMEI Nome Novo", "108500"),
+            registro_escola("400000", "EMEF Nova", "108600", tipo="EMEF"),
+            registro_escola("500000", "Escola Tipo Estranho", "108600", tipo="XYZ"),
+            registro_escola("600000", "Escola Sem DRE", "777777"),
+        ]
+
+        resumo = SincronizarUnidadesService(registros=registros, tamanho_lote=1).executar()
+
+        assert resumo["inseridas"] == 2
+        assert resumo["atualizadas"] == 1
+        assert resumo["desativadas"] == 0
+        assert {item["codigo_eol"] for item in resumo["ignoradas"]} == {"500000", "600000"}
+
+        escola_sp.refresh_from_db()
+        assert escola_sp.nome == "EMEI Nome Novo"
+
+        nova = Unidade.objects.get(codigo_eol="400000")
+        assert nova.tipo_unidade == TipoUnidadeChoices.EMEF
+        assert nova.dre_id == "108600"
+        assert Unidade.dres.filter(codigo_eol="108600").exists()
+
+    def test_sem_alteracoes_nao_atualiza(self, escola_sp, dre_sp):
+        registros = [
+            registro_dre("108500", dre_sp.nome),
+            registro_escola("200237", escola_sp.nome, "108500"),
+        ]
+
+        resumo = SincronizarUnidadesService(registros=registros).executar()
+
+        assert (resumo["inseridas"], resumo["atualizadas"]) == (0, 0)
+
+    def test_desativa_ausentes(self, escola_sp, dre_sp, dre_outra):
+        registros = [
+            registro_dre("108500", dre_sp.nome),
+            registro_escola("200237", escola_sp.nome, "108500"),
+        ]
+
+        resumo = SincronizarUnidadesService(registros=registros, desativar_ausentes=True).executar()
+
+        assert resumo["desativadas"] == 1
+        dre_outra.refresh_from_db()
+        assert dre_outra.ativa is False
+        assert dre_outra.motivo_inativacao == MOTIVO_INATIVACAO_SINCRONIZACAO
+
+    def test_dry_run_nao_grava(self, dre_sp):
+        registros = [registro_dre("108500", "Outro Nome"), registro_dre("108600", "DRE Nova")]
+
+        resumo = SincronizarUnidadesService(registros=registros, dry_run=True).executar()
+
+        assert (resumo["inseridas"], resumo["atualizadas"]) == (1, 1)
+        dre_sp.refresh_from_db()
+        assert dre_sp.nome == "DRE São Paulo"
+        assert not Unidade.objects.filter(codigo_eol="108600").exists()
+
+
+@pytest.mark.django_db
+class TestSincronizarUnidadesCommand:
+
+    def test_comando_com_arquivo_json(self, tmp_path):
+        arquivo = tmp_path / "unidades.json"
+        arquivo.write_text(json.dumps([registro_dre("108600", "DRE Nova")]), encoding="utf-8")
+        saida = StringIO()
+
+        call_command("sincronizar_unidades", arquivo=str(arquivo), stdout=saida)
+
+        assert "Inseridas: 1" in saida.getvalue()
+        assert Unidade.objects.filter(codigo_eol="108600").exists()
+
+    @patch("apps.unidades.management.commands.sincronizar_unidades.ConsultaDadosEolService.listar_unidades")
+    def test_comando_consulta_eol(self, mock_listar):
+        mock_listar.return_value = [registro_dre("108600", "DRE Nova")]
+        saida = StringIO()
+
+        call_command("sincronizar_unidades", "--dry-run", stdout=saida)
+
+        assert "[dry-run] Inseridas: 1" in saida.getvalue()
+        assert not Unidade.objects.exists()
+
+    @patch("apps.unidades.management.commands.sincronizar_unidades.ConsultaDadosEolService.listar_unidades")
+    def test_comando_falha_eol(self, mock_listar):
+        mock_listar.side_effect = Exception("fora do ar")
+
+        with pytest.raises(CommandError, match="Falha ao consultar o catálogo do EOL"):
+            call_command("sincronizar_unidades")
@@ -100,13 +100,14 @@ class UserAdmin(BaseUserAdmin):
         return ", ".join([str(unidade) for unidade in obj.unidades.all()]) or "-"
     get_unidades.short_description = "Unidades"
 
-    list_filter = ('rede', 'is_validado', 'is_core_sso')
+    list_filter = ('rede', 'is_validado', 'is_core_sso', 'status_core_sso')
 
     # Configuração dos fieldsets (formulário de edição)
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Informações Adicionais', {
             'fields': (
                 'name', 'cpf', 'cargo', 'uuid', 'rede', 'unidades', 'is_validado', 'is_app_admin', 'is_core_sso',
+                'status_core_sso', 'erro_core_sso',
                 'data_aprovacao', 'responsavel_aprovacao',
                 'data_inativacao', 'responsavel_inativacao',
                 'motivo_inativacao', 'inativado_via_unidade'
@@ -125,7 +126,7 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
     # Campos somente leitura
-    readonly_fields = ('uuid', 'date_joined', 'last_login')
+    readonly_fields = ('uuid', 'date_joined', 'last_login', 'erro_core_sso')
     autocomplete_fields = ('unidades',)
 
     def get_readonly_fields(self, request, obj=None):
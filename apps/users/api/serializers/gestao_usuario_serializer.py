@@ -1,13 +1,15 @@
 import re
 from django.utils import timezone
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from apps.unidades.models.unidades import TipoGestaoChoices, Unidade, TipoUnidadeChoices
-from apps.users.services.usuario_core_sso_service import CriaUsuarioCoreSSOService
+from apps.users.models import StatusCoreSSOChoices, violou_email_unico
+from apps.users.services.provisionamento_core_sso_service import ProvisionamentoCoreSSOService
 from apps.users.services.sme_integracao_service import SmeIntegracaoService
+from apps.users.perfil import carregar_perfil_usuario, obter_perfil_usuario
 
 User = get_user_model()
 
@@ -223,12 +225,9 @@ class GestaoUsuarioSerializer(serializers.ModelSerializer):
         Valida e-mail institucional e unicidade.
         """
 
-        qs = User.objects.filter(email=value)
+        excluir_pk = self.instance.pk if self.instance else None
 
-        if self.instance:
-            qs = qs.exclude(pk=self.instance.pk)
-
-        if qs.exists():
+        if User.email_em_uso(value, excluir_pk=excluir_pk):
             raise serializers.ValidationError(
                 "Este e-mail já está cadastrado."
             )
@@ -244,9 +243,9 @@ class GestaoUsuarioSerializer(serializers.ModelSerializer):
         """
         Valida se as unidades estão dentro do escopo do Ponto Focal.
         """
-        allowed_dres = set(
-            user.unidades.values_list("codigo_eol", flat=True).distinct()
-        )
+        request = self.context.get("request")
+        perfil = obter_perfil_usuario(request) if request else carregar_perfil_usuario(user)
+        allowed_dres = perfil.unidades
         
         for unidade in unidades:
             if unidade.tipo_unidade == TipoUnidadeChoices.DRE:
@@ -357,26 +356,25 @@ class GestaoUsuarioSerializer(serializers.ModelSerializer):
         if not user_request.is_gipe:
             is_app_admin = False
             
+        # Usuários da rede indireta são provisionados no CoreSSO após o commit, em segundo plano
+        provisionar_core_sso = validated_data.get("rede") == TipoGestaoChoices.INDIRETA
+        if provisionar_core_sso:
+            validated_data["status_core_sso"] = StatusCoreSSOChoices.PENDENTE
+
         try:
             
             with transaction.atomic():
-                novo_user = User.objects.create_user(**validated_data)
+                novo_user = User.objects.create_user(is_app_admin=is_app_admin, **validated_data)
                 novo_user.unidades.set(unidades)
-                novo_user.is_app_admin = is_app_admin
-                novo_user.save(update_fields=["is_app_admin"])
-                
-                rede = validated_data.get("rede", None)
-                
-                if rede and rede == TipoGestaoChoices.INDIRETA:
-                
-                    dados_usuario_a_ser_enviado_coresso = {
-                        "login": novo_user.username,
-                        "nome": novo_user.name,
-                        "email": novo_user.email,
-                    }
-                    
-                    CriaUsuarioCoreSSOService.cria_usuario_core_sso(dados_usuario_a_ser_enviado_coresso)
+
+                if provisionar_core_sso:
+                    ProvisionamentoCoreSSOService.agendar(novo_user)
                 
+        except IntegrityError as e:
+            if violou_email_unico(e):
+                raise serializers.ValidationError({"email": ["Este e-mail já está cadastrado."]})
+            raise serializers.ValidationError({'detail': f"Erro ao criar usuário: {str(e)}"})
+
         except Exception as e:
             raise serializers.ValidationError({'detail': f"Erro ao criar usuário: {str(e)}"})
 
@@ -397,7 +395,13 @@ class GestaoUsuarioSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        instance.save()
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError as e:
+            if violou_email_unico(e):
+                raise serializers.ValidationError({"email": ["Este e-mail já está cadastrado."]})
+            raise
 
         if unidades is not None:
             self.validate_unidades(unidades)  
@@ -465,6 +469,11 @@ class GestaoUsuarioRetrieveSerializer(GestaoUsuarioSerializer):
         if not obj.responsavel_inativacao:
             return None
 
+        # Anotado por GestaoUsuarioViewSet.get_object (User.nome_por_username) no retrieve;
+        # a consulta abaixo fica só para quem usa o serializer sem a anotação
+        if hasattr(obj, "responsavel_inativacao_nome"):
+            return obj.responsavel_inativacao_nome
+
         try:
             user = User.objects.only("name").get(
                 username=obj.responsavel_inativacao
@@ -0,0 +1,46 @@
+from auditlog.models import LogEntry
+from rest_framework import serializers
+
+
+class HistoricoUsuarioSerializer(serializers.ModelSerializer):
+    """
+    Entrada do histórico de alterações de um usuário (auditlog).
+
+    As mudanças já vêm calculadas do auditlog e são apenas reorganizadas em lista:
+    - campos simples: {"campo", "de", "para"}
+    - many-to-many (unidades): {"campo", "operacao", "objetos"}
+    - outros formatos: {"campo", "valor"}, com o valor como foi gravado
+    """
+
+    data = serializers.DateTimeField(source="timestamp", format="%d/%m/%Y %H:%M:%S", read_only=True)
+    acao = serializers.CharField(source="get_action_display", read_only=True)
+    responsavel = serializers.SerializerMethodField()
+    mudancas = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LogEntry
+        fields = ["id", "data", "acao", "responsavel", "mudancas"]
+
+    def get_responsavel(self, obj):
+        if obj.actor_id is None:
+            return None
+        return {"username": obj.actor.username, "nome": obj.actor.name}
+
+    def get_mudancas(self, obj):
+        mudancas = []
+
+        for campo, valor in obj.changes_dict.items():
+            if isinstance(valor, dict) and valor.get("type") == "m2m":
+                mudancas.append({
+                    "campo": campo,
+                    "operacao": valor.get("operation"),
+                    "objetos": valor.get("objects", []),
+                })
+            elif isinstance(valor, (list, tuple)) and len(valor) == 2:
+                de, para = valor
+                mudancas.append({"campo": campo, "de": de, "para": para})
+            else:
+                # Formato não previsto (entradas antigas ou gravadas manualmente): devolve o valor bruto
+                mudancas.append({"campo": campo, "valor": valor})
+
+        return mudancas
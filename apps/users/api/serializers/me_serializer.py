@@ -38,7 +38,10 @@ class UserMeSerializer(serializers.ModelSerializer):
         }
 
     def get_unidades(self, obj):
-        unidades = obj.unidades.select_related("dre").all()
+        # MeView já carrega as unidades (com a DRE) em unidades_cache
+        unidades = getattr(obj, "unidades_cache", None)
+        if unidades is None:
+            unidades = obj.unidades.select_related("dre").all()
         return [self._format_unidade(unidade) for unidade in unidades]
 
     def _format_unidade(self, unidade):
@@ -3,9 +3,11 @@ import environ
 
 
 from rest_framework import serializers
+from django.db import IntegrityError, transaction
 from django.contrib.auth import get_user_model
 
 from apps.unidades.models.unidades import Unidade
+from apps.users.models import violou_email_unico
 
 User = get_user_model()
 env = environ.Env()
@@ -64,7 +66,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if User.email_em_uso(value):
             raise serializers.ValidationError("Este e-mail já está cadastrado.")
 
         if not value.endswith("@sme.prefeitura.sp.gov.br"):
@@ -80,7 +82,14 @@ class UserCreateSerializer(serializers.ModelSerializer):
         username = validated_data.get("username")
         senha_padrao = f"{BASE_CORESSO_AUTH}{username[-4:]}"
         
-        user = User.objects.create_user(password=senha_padrao, **validated_data)
-        user.unidades.set(unidades)
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(password=senha_padrao, **validated_data)
+                user.unidades.set(unidades)
+        except IntegrityError as e:
+            # outro cadastro com o mesmo e-mail entre a validação e o insert
+            if violou_email_unico(e):
+                raise serializers.ValidationError({"email": ["Este e-mail já está cadastrado."]})
+            raise
         
         return user
\ No newline at end of file
@@ -1,26 +1,42 @@
 import environ
+from django.conf import settings
 from django.db.models import Q
+from django.contrib.contenttypes.models import ContentType
+from auditlog.models import LogEntry
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.http import Http404
+from django.http import Http404, FileResponse, StreamingHttpResponse
 
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
 from apps.users.api.serializers.gestao_usuario_serializer import GestaoUsuarioListaSerializer, GestaoUsuarioSerializer, GestaoUsuarioRetrieveSerializer
+from apps.users.api.serializers.historico_serializer import HistoricoUsuarioSerializer
 from apps.users.permissions import CanManageUsers, CanApproveUser
-from apps.unidades.models.unidades import TipoUnidadeChoices, TipoGestaoChoices
+from apps.users.perfil import obter_perfil_usuario
+from apps.unidades.models.unidades import TipoGestaoChoices
 
 from apps.users.services.envia_email_service import EnviaEmailService
 from apps.users.services.usuario_core_sso_service import CriaUsuarioCoreSSOService
 
 from uuid import UUID
-from apps.users.services.gestao_usuario_service import InativarUsuarioService, ReativarUsuarioService
+from apps.users.services.gestao_usuario_service import (
+    InativarUsuarioService,
+    ReativarUsuarioService,
+    AprovarUsuariosEmLoteService,
+    InativarUsuariosEmLoteService,
+    ReativarUsuariosEmLoteService,
+)
 from apps.users.services.sme_integracao_service import SmeIntegracaoService
-from apps.helpers.exceptions import IntercorrenciasDeletionError
+from apps.users.services.importar_usuarios_service import ImportarUsuariosService
+from apps.users.services.exportar_usuarios_service import ExportarUsuariosService
+from apps.helpers.exceptions import IntercorrenciasDeletionError, ImportacaoUsuariosException
+from apps.helpers.idempotencia import idempotente
 
 import logging
 
@@ -30,6 +46,17 @@ User = get_user_model()
 env = environ.Env()
 
 
+class HistoricoUsuarioPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) do histórico: cada página continua a partir da
+    última entrada vista, sem OFFSET, usando o índice (content_type, object_pk, timestamp, id).
+    """
+    ordering = ("-timestamp", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
 class GestaoUsuarioViewSet(ModelViewSet):
     """
     Gestão de usuários via painel Frontend.
@@ -52,8 +79,18 @@ class GestaoUsuarioViewSet(ModelViewSet):
         filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
         
         # Verifica se o objeto existe no banco de dados
+        objetos = User.objects
+        if self.action == "aprovar":
+            # Aprovações simultâneas do mesmo usuário (individual ou em lote) esperam
+            # o commit da primeira e veem is_validado atualizado
+            objetos = objetos.select_for_update()
+        elif self.action == "retrieve":
+            objetos = objetos.annotate(
+                responsavel_inativacao_nome=User.nome_por_username("responsavel_inativacao")
+            )
+
         try:
-            obj = User.objects.get(**filter_kwargs)
+            obj = objetos.get(**filter_kwargs)
         except User.DoesNotExist:
             raise Http404("Usuário não encontrado.")
         
@@ -90,12 +127,10 @@ class GestaoUsuarioViewSet(ModelViewSet):
 
         elif user.is_ponto_focal:
 
-            dres_pf_uuids = user.unidades.filter(
-                tipo_unidade=TipoUnidadeChoices.DRE
-            ).values_list("uuid", flat=True)
+            dres_pf = obter_perfil_usuario(self.request).dres
 
             base_qs = qs.filter(
-                Q(unidades__dre__uuid__in=dres_pf_uuids) | Q(unidades__uuid__in=dres_pf_uuids)
+                Q(unidades__dre_id__in=dres_pf) | Q(unidades__codigo_eol__in=dres_pf)
             ).distinct()
 
         else:
@@ -134,6 +169,7 @@ class GestaoUsuarioViewSet(ModelViewSet):
         return base_qs
 
     @action(detail=True, methods=["post"], permission_classes=[CanApproveUser])
+    @idempotente
     def aprovar(self, request, uuid=None):
 
         usuario = self.get_object()
@@ -195,6 +231,26 @@ class GestaoUsuarioViewSet(ModelViewSet):
             status=status.HTTP_200_OK,
         )
     
+    @action(detail=False, methods=["post"], permission_classes=[CanApproveUser], url_path="aprovar-em-lote")
+    def aprovar_em_lote(self, request):
+
+        uuids = self._validar_uuids_lote(request.data.get("uuids"))
+        usuarios, resultados = self._obter_usuarios_lote(uuids)
+
+        resultados.update(
+            AprovarUsuariosEmLoteService(
+                usuarios=usuarios,
+                usuario_responsavel=str(request.user),
+            ).executar()
+        )
+
+        logger.info(
+            "Aprovação em lote de %d usuário(s) solicitada por %s",
+            len(uuids), request.user.username
+        )
+
+        return self._resposta_lote(uuids, resultados, "Usuário aprovado com sucesso.")
+
     @action(detail=True, methods=["post"], permission_classes=[CanApproveUser])
     def reprovar(self, request, uuid=None):
 
@@ -233,6 +289,7 @@ class GestaoUsuarioViewSet(ModelViewSet):
         )
 
     @action(detail=True, methods=["post"], permission_classes=[CanApproveUser])
+    @idempotente
     def inativar(self, request, uuid=None):
 
         try:
@@ -324,6 +381,7 @@ class GestaoUsuarioViewSet(ModelViewSet):
         )
     
     @action(detail=True, methods=["post"], permission_classes=[CanApproveUser])
+    @idempotente
     def reativar(self, request, uuid=None):
         
         try:
@@ -345,6 +403,209 @@ class GestaoUsuarioViewSet(ModelViewSet):
             status=status.HTTP_200_OK
         )
     
+    @action(detail=False, methods=["post"], permission_classes=[CanApproveUser], url_path="inativar-em-lote")
+    def inativar_em_lote(self, request):
+
+        uuids = self._validar_uuids_lote(request.data.get("uuids"))
+        motivo_inativacao = request.data.get("motivo_inativacao")
+
+        if not motivo_inativacao:
+            return Response(
+                {"detail": "Motivo inativação é obrigatória para executar a inativação."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        usuarios, resultados = self._obter_usuarios_lote(uuids)
+
+        resultados.update(
+            InativarUsuariosEmLoteService(
+                usuarios=usuarios,
+                usuario_responsavel=str(request.user),
+                motivo_inativacao=motivo_inativacao,
+            ).executar()
+        )
+
+        logger.info(
+            "Inativação em lote de %d usuário(s) solicitada por %s",
+            len(uuids), request.user.username
+        )
+
+        return self._resposta_lote(uuids, resultados, "Usuário inativado com sucesso.")
+
+    @action(detail=False, methods=["post"], permission_classes=[CanApproveUser], url_path="reativar-em-lote")
+    def reativar_em_lote(self, request):
+
+        uuids = self._validar_uuids_lote(request.data.get("uuids"))
+        usuarios, resultados = self._obter_usuarios_lote(uuids)
+
+        resultados.update(ReativarUsuariosEmLoteService(usuarios=usuarios).executar())
+
+        logger.info(
+            "Reativação em lote de %d usuário(s) solicitada por %s",
+            len(uuids), request.user.username
+        )
+
+        return self._resposta_lote(uuids, resultados, "Usuário reativado com sucesso.")
+
+    @action(detail=False, methods=["post"], parser_classes=[MultiPartParser], url_path="importar")
+    def importar(self, request):
+
+        arquivo = request.FILES.get("arquivo")
+
+        if not arquivo:
+            return Response(
+                {"detail": "Campo arquivo é obrigatório!"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            resultado = ImportarUsuariosService(
+                arquivo=arquivo,
+                usuario_responsavel=request.user,
+            ).executar()
+        except ImportacaoUsuariosException as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "detail": (
+                    f"{resultado['total_importados']} de {resultado['total_linhas']} "
+                    f"usuário(s) importado(s) com sucesso."
+                ),
+                "erros": resultado["erros"],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="exportar")
+    def exportar(self, request):
+        """
+        Exporta a listagem (com os mesmos filtros do list) em CSV ou XLSX.
+        Use ?formato=xlsx para planilha Excel; o padrão é CSV.
+        """
+
+        formato = request.query_params.get("formato", "csv").lower()
+
+        if formato not in ("csv", "xlsx"):
+            return Response(
+                {"detail": "Formato inválido. Utilize csv ou xlsx."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        exportacao = ExportarUsuariosService(self.filter_queryset(self.get_queryset()))
+        nome_arquivo = f"usuarios_{timezone.localdate():%Y%m%d}.{formato}"
+
+        logger.info("Exportação de usuários (%s) solicitada por %s", formato, request.user.username)
+
+        if formato == "xlsx":
+            return FileResponse(
+                exportacao.gerar_xlsx(),
+                as_attachment=True,
+                filename=nome_arquivo,
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+
+        response = StreamingHttpResponse(exportacao.gerar_csv(), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{nome_arquivo}"'
+        return response
+
+    @action(detail=True, methods=["get"], permission_classes=[CanApproveUser])
+    def historico(self, request, uuid=None):
+        """
+        Histórico de alterações do usuário (dados, perfil, status e unidades), do mais
+        recente para o mais antigo, paginado por cursor (?cursor=...&page_size=...).
+        """
+        usuario = self.get_object()
+
+        entradas = (
+            LogEntry.objects
+            .filter(content_type=ContentType.objects.get_for_model(User), object_pk=str(usuario.pk))
+            .select_related("actor")
+            .only("id", "timestamp", "action", "changes", "actor_id", "actor__username", "actor__name")
+        )
+
+        paginator = HistoricoUsuarioPagination()
+        pagina = paginator.paginate_queryset(entradas, request, view=self)
+        return paginator.get_paginated_response(HistoricoUsuarioSerializer(pagina, many=True).data)
+
+    def _validar_uuids_lote(self, uuids):
+        """
+        Valida a lista de UUIDs recebida nas ações em lote, removendo duplicados.
+        """
+        limite = settings.GESTAO_USUARIOS_LOTE_MAXIMO
+
+        if not isinstance(uuids, list) or not uuids:
+            raise ValidationError({"detail": "Campo 'uuids' deve ser uma lista não vazia."})
+
+        if len(uuids) > limite:
+            raise ValidationError({"detail": f"Informe no máximo {limite} usuários por requisição."})
+
+        try:
+            return list(dict.fromkeys(UUID(str(valor)) for valor in uuids))
+        except (ValueError, TypeError):
+            raise ValidationError({"detail": "UUID informado é inválido."})
+
+    def _obter_usuarios_lote(self, uuids):
+        """
+        Retorna os usuários do lote que estão no escopo do usuário logado (uma consulta)
+        e as mensagens de erro dos UUIDs que ficaram de fora.
+
+        Os usuários ficam travados até o fim da requisição, na ordem do id: operações em
+        lote simultâneas sobre os mesmos usuários são executadas uma após a outra. O
+        escopo vai numa subconsulta porque FOR UPDATE não é permitido com o DISTINCT
+        do filtro por DRE.
+        """
+        escopo = self.get_queryset().filter(uuid__in=uuids).values("pk")
+        usuarios = list(
+            User.objects
+            .select_related("cargo")
+            .select_for_update(of=("self",))
+            .filter(pk__in=escopo)
+            .order_by("pk")
+        )
+
+        encontrados = {usuario.uuid for usuario in usuarios}
+        faltantes = [valor for valor in uuids if valor not in encontrados]
+
+        existentes = set()
+        if faltantes:
+            existentes = set(
+                User.objects.filter(uuid__in=faltantes).values_list("uuid", flat=True)
+            )
+
+        erros = {
+            valor: (
+                "Você não tem permissão para acessar ou editar este usuário."
+                if valor in existentes
+                else "Usuário não encontrado."
+            )
+            for valor in faltantes
+        }
+        return usuarios, erros
+
+    @staticmethod
+    def _resposta_lote(uuids, resultados, mensagem_sucesso):
+        """
+        Monta a resposta das ações em lote com o resultado de cada usuário.
+        """
+        itens = [
+            {
+                "uuid": str(valor),
+                "sucesso": resultados.get(valor) is None,
+                "detail": resultados.get(valor) or mensagem_sucesso,
+            }
+            for valor in uuids
+        ]
+        total_sucesso = sum(1 for item in itens if item["sucesso"])
+
+        return Response(
+            {
+                "detail": f"{total_sucesso} de {len(itens)} usuário(s) processado(s) com sucesso.",
+                "resultados": itens,
+            },
+            status=status.HTTP_200_OK,
+        )
+
     @action(detail=False, methods=["get"], permission_classes=[CanApproveUser], url_path="consultar-core-sso")
     def consultar_core_sso(self, request):
 
@@ -112,17 +112,23 @@ class LoginView(TokenObtainPairView):
         Retorna o cargo se o usuário for GIPE ou PONTO FOCAL DRE, senão None
         """
 
-        try:
-            usuario = User.objects.get(username=rf)
-
-            if usuario.cargo.codigo in [0, 1]:
-                return {
-                    'codigo': usuario.cargo.codigo,
-                    'nome': usuario.cargo.nome
-                }
-            
-        except User.DoesNotExist:
+        cargo = (
+            User.objects
+            .filter(username=rf)
+            .values_list("cargo__codigo", "cargo__nome")
+            .first()
+        )
+
+        if cargo is None:
             logger.warning("Usuário com RF %s não encontrado no model User", rf)
+            return None
+
+        codigo, nome = cargo
+        if codigo in [0, 1]:
+            return {
+                'codigo': codigo,
+                'nome': nome
+            }
 
         return None
     
@@ -219,34 +225,36 @@ class LoginView(TokenObtainPairView):
             logger.error(f'Erro inesperado: {e}')
             raise DatabaseError('Ocorreu um erro inesperado. Verifique os dados e tente novamente.')
         
-    def _generate_token(self, user) -> dict:
-        """Gera tokens JWT para o usuário"""
+    @staticmethod
+    def _unidades_do_usuario(user) -> list:
+        """ Unidades do usuário (por codigo_eol), carregadas uma vez para os claims e a resposta. """
+        return list(user.unidades.order_by("codigo_eol").only("codigo_eol", "nome"))
 
-        refresh = RefreshToken.for_user(user)
+    def _generate_token(self, user, unidades=None) -> dict:
+        """Gera tokens JWT para o usuário"""
 
-        primeira_unidade = user.unidades.first()
-        codigo_unidade_eol = primeira_unidade.codigo_eol if primeira_unidade else None
+        if unidades is None:
+            unidades = self._unidades_do_usuario(user)
 
-        refresh["username"] = user.username
-        refresh["name"] = getattr(user, "name", "") or ""
-        refresh["cpf"] = getattr(user, "cpf", "") or ""
-        refresh["email"] = getattr(user, "email", "") or ""
-        refresh["is_app_admin"] = getattr(user, "is_app_admin", False) or False
-        if getattr(user, "cargo", None):
-            refresh["perfil_codigo"] = user.cargo.codigo
-            refresh["perfil_nome"] = user.cargo.nome
-        refresh["codigo_unidade_eol"] = codigo_unidade_eol
+        claims = {
+            "username": user.username,
+            "uuid": str(user.uuid),
+            "name": getattr(user, "name", "") or "",
+            "cpf": getattr(user, "cpf", "") or "",
+            "email": getattr(user, "email", "") or "",
+            "is_app_admin": getattr(user, "is_app_admin", False) or False,
+        }
+        cargo = getattr(user, "cargo", None)
+        if cargo:
+            claims["perfil_codigo"] = cargo.codigo
+            claims["perfil_nome"] = cargo.nome
+        claims["codigo_unidade_eol"] = unidades[0].codigo_eol if unidades else None
 
+        refresh = RefreshToken.for_user(user)
         access = refresh.access_token
-        access["username"] = user.username
-        access["name"] = getattr(user, "name", "") or ""
-        access["cpf"] = getattr(user, "cpf", "") or ""
-        access["email"] = getattr(user, "email", "") or ""
-        access["is_app_admin"] = getattr(user, "is_app_admin", False) or False
-        if getattr(user, "cargo", None):
-            access["perfil_codigo"] = user.cargo.codigo
-            access["perfil_nome"] = user.cargo.nome
-        access["codigo_unidade_eol"] = codigo_unidade_eol
+        for token in (refresh, access):
+            for claim, valor in claims.items():
+                token[claim] = valor
 
         return {
             "access": str(access),
@@ -263,8 +271,9 @@ class LoginView(TokenObtainPairView):
             logger.warning("Tentativa de login com usuário inativo: %s", login)
             raise AuthenticationError({'detail': 'Usuário e/ou senha inválida'})
 
-        # Gera tokens JWT
-        tokens = self._generate_token(_user)
+        # Claims, token e unidade_lotacao partem do mesmo carregamento de unidades
+        unidades = self._unidades_do_usuario(_user)
+        tokens = self._generate_token(_user, unidades)
         return {
             "name": auth_data.get('nome', ''),
             "email": auth_data.get('email', ''),
@@ -275,8 +284,8 @@ class LoginView(TokenObtainPairView):
                 "nome": _user.cargo.nome
             },
             "unidade_lotacao": [
-                    {"codigo": u["codigo_eol"], "nomeUnidade": u["nome"]}
-                    for u in _user.unidades.all().values("codigo_eol", "nome")
-                ] if _user.unidades.exists() else [],
+                {"codigo": unidade.codigo_eol, "nomeUnidade": unidade.nome}
+                for unidade in unidades
+            ],
             "token": tokens['access']
         }
\ No newline at end of file
@@ -1,11 +1,16 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.contrib.auth import get_user_model
+from django.utils.http import parse_etags, quote_etag
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
 from rest_framework_simplejwt.exceptions import AuthenticationFailed
-from django.db.models import Prefetch
-from django.contrib.auth import get_user_model
 
+from apps.unidades.models.unidades import Unidade
 from apps.users.api.serializers.me_serializer import UserMeSerializer
+from apps.users.cache_me import me_cache_key, obter_versao_me
 
 User = get_user_model()
 
@@ -13,6 +18,10 @@ User = get_user_model()
 class MeView(APIView):
     """
     Retorna os dados do usuário autenticado (requer Bearer access token).
+
+    A resposta fica em cache por usuário, com chave versionada (ver apps.users.cache_me),
+    e é identificada por ETag: com If-None-Match igual à versão atual responde 304
+    sem consultar o banco nem o cache da resposta.
     """
     permission_classes = (permissions.IsAuthenticated,)
 
@@ -30,22 +39,37 @@ class MeView(APIView):
         if not username:
             return Response({"detail": "Não autenticado."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        qs = (
-            User.objects
-            .select_related("cargo")
-            .prefetch_related(
-                Prefetch("unidades", to_attr="unidades_cache"),
-                "unidades__dre"
-            )
-        )
+        versao = obter_versao_me(request.user.pk)
+        etag = quote_etag(versao)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
 
-        try:
-            user = qs.get(pk=request.user.pk)
-        except User.DoesNotExist:
-            return Response(
-                {"detail": "Usuário não encontrado."},
-                status=status.HTTP_404_NOT_FOUND
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        dados = cache.get(me_cache_key(versao))
+
+        if dados is None:
+            qs = (
+                User.objects
+                .select_related("cargo")
+                .prefetch_related(
+                    Prefetch(
+                        "unidades",
+                        queryset=Unidade.objects.select_related("dre"),
+                        to_attr="unidades_cache",
+                    )
+                )
             )
 
-        serializer = UserMeSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+            try:
+                user = qs.get(pk=request.user.pk)
+            except User.DoesNotExist:
+                return Response(
+                    {"detail": "Usuário não encontrado."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            dados = dict(UserMeSerializer(user).data)
+            cache.set(me_cache_key(versao), dados, settings.ME_CACHE_TTL)
+
+        return Response(dados, status=status.HTTP_200_OK, headers=headers)
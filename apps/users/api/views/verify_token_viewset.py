@@ -1,10 +1,14 @@
+from django.conf import settings
 from rest_framework import status
 from rest_framework.views import APIView
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework.permissions import AllowAny
 from rest_framework.authentication import get_authorization_header
-from rest_framework_simplejwt.serializers import TokenVerifySerializer
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from apps.users.permissions import IsInternalServiceRequest
+from apps.users.services.verifica_token_service import VerificaTokenService
 
 
 class VerifyTokenFlexibleView(APIView):
@@ -16,6 +20,8 @@ class VerifyTokenFlexibleView(APIView):
     """
     permission_classes = [AllowAny]
     authentication_classes = []
+    throttle_classes = []
+    renderer_classes = [JSONRenderer]
 
     def post(self, request, *args, **kwargs):
 
@@ -26,14 +32,11 @@ class VerifyTokenFlexibleView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = TokenVerifySerializer(data={"token": token})
-        try:
-            serializer.is_valid(raise_exception=True)
-
-        except (InvalidToken, TokenError) as exc:
-            return Response({"detail": str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+        resultado = VerificaTokenService.verificar(str(token))
+        if not resultado["valido"]:
+            return Response({"detail": resultado["detail"]}, status=status.HTTP_401_UNAUTHORIZED)
 
-        return Response({"detail": "Token válido.", "status": status.HTTP_200_OK})
+        return Response({"detail": "Token válido.", "status": status.HTTP_200_OK, "claims": resultado["claims"]})
 
     @staticmethod
     def _extract_token(request) -> str | None:
@@ -49,4 +52,41 @@ class VerifyTokenFlexibleView(APIView):
             
             except Exception:
                 return None
-        return None
\ No newline at end of file
+        return None
+
+
+class VerifyTokenLoteView(APIView):
+    """
+    Verifica vários tokens de acesso em uma única chamada (uso dos microserviços internos).
+    Body: {"tokens": ["<ACCESS_TOKEN>", ...]}
+    Retorna, na ordem recebida, {"valido": true, "claims": {...}} ou {"valido": false, "detail": "..."}.
+    """
+    permission_classes = [IsInternalServiceRequest]
+    authentication_classes = []
+    throttle_classes = []
+    parser_classes = [JSONParser]
+    renderer_classes = [JSONRenderer]
+
+    def post(self, request, *args, **kwargs):
+
+        tokens = request.data.get("tokens")
+        if not isinstance(tokens, list) or not tokens:
+            return Response(
+                {"detail": "Informe a lista de tokens no campo 'tokens'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limite = settings.VERIFY_TOKEN_LOTE_MAXIMO
+        if len(tokens) > limite:
+            return Response(
+                {"detail": f"Informe no máximo {limite} tokens por requisição."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not all(isinstance(token, str) and token for token in tokens):
+            return Response(
+                {"detail": "Token informado é inválido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response({"resultados": VerificaTokenService.verificar_em_lote(tokens)})
@@ -9,4 +9,5 @@ class UsersConfig(AppConfig):
     verbose_name = _("Users")
 
     def ready(self):
-        import apps.users.auditlog_registry
\ No newline at end of file
+        import apps.users.auditlog_registry  # noqa: F401
+        import apps.users.signals  # noqa: F401
\ No newline at end of file
@@ -1,9 +1,14 @@
-from auditlog.registry import auditlog
 from django.contrib.auth import get_user_model
 
+from apps.users.auditoria import conectar_auditoria_em_lote
+
 User = get_user_model()
 
-auditlog.register(
+# Nas requisições, os logs de User são acumulados e gravados em lote após o commit.
+# As alterações de unidades são registradas no usuário, inclusive pelo lado da unidade.
+conectar_auditoria_em_lote(
     User,
+    m2m_fields=["unidades"],
     exclude_fields=['last_login'],
-)
\ No newline at end of file
+    mask_fields=['password'],
+)
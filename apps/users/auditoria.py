@@ -0,0 +1,249 @@
+import logging
+import contextlib
+from contextvars import ContextVar
+
+from auditlog.cid import get_cid
+from auditlog.models import LogEntry
+from auditlog.diff import model_instance_diff
+from auditlog.registry import auditlog
+from auditlog.context import auditlog_disabled, disable_auditlog
+from django.conf import settings
+from django.db import transaction
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.encoding import smart_str
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.contrib.contenttypes.models import ContentType
+
+logger = logging.getLogger(__name__)
+
+_lote_atual = ContextVar("auditoria_lote_atual", default=None)
+
+# Models registrados no auditlog por conectar_auditoria_em_lote()
+_modelos_em_lote = set()
+
+
+class LoteAuditoria:
+    """
+    Entradas do auditlog acumuladas durante uma requisição.
+
+    Cada entrada só é confirmada quando a transação em que a alteração ocorreu é
+    commitada (alterações desfeitas por rollback não geram log). As confirmadas são
+    gravadas com um único bulk_create ao final do lote.
+    """
+
+    def __init__(self):
+        self.confirmadas = []
+
+    def adicionar(self, entrada) -> None:
+        transaction.on_commit(lambda: self.confirmadas.append(entrada))
+
+    def gravar(self, actor=None, remote_addr=None, remote_port=None) -> None:
+        if not self.confirmadas:
+            return
+
+        entradas, self.confirmadas = self.confirmadas, []
+
+        # bulk_create não dispara o pre_save do set_actor: ator e origem vêm do lote
+        actor_id = getattr(actor, "pk", None)
+        actor_email = getattr(actor, "email", None) if actor_id else None
+        for entrada in entradas:
+            entrada.actor_id = actor_id
+            entrada.actor_email = actor_email
+            entrada.remote_addr = remote_addr
+            entrada.remote_port = remote_port
+
+        try:
+            LogEntry.objects.bulk_create(entradas)
+        except Exception:
+            logger.exception("Falha ao gravar %s entrada(s) do auditlog.", len(entradas))
+
+
+def _montar_entrada(instance, action, changes):
+    """ LogEntry ainda não salvo, com os mesmos campos de LogEntry.objects.log_create. """
+    pk = instance.pk
+    entrada = LogEntry(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_pk=pk,
+        object_id=pk if isinstance(pk, int) else None,
+        object_repr=smart_str(instance),
+        action=action,
+        changes=changes,
+        cid=get_cid(),
+    )
+
+    get_additional_data = getattr(instance, "get_additional_data", None)
+    if callable(get_additional_data):
+        entrada.additional_data = get_additional_data()
+
+    return entrada
+
+
+def registrar_log(instance, action, changes) -> None:
+    """
+    Registra uma alteração no auditlog.
+
+    Dentro de auditoria_em_lote() a entrada é acumulada e gravada após o commit;
+    fora dele (comandos, shell) é gravada imediatamente.
+    """
+    lote = _lote_atual.get()
+
+    if lote is None:
+        LogEntry.objects.log_create(instance, action=action, changes=changes)
+    else:
+        lote.adicionar(_montar_entrada(instance, action, changes))
+
+
+@contextlib.contextmanager
+def auditoria_em_lote(actor=None, remote_addr=None, remote_port=None):
+    """
+    Acumula os logs do auditlog gerados no bloco e os grava de uma vez ao final.
+
+    Os receivers do auditlog ficam desativados no bloco para todos os models e são
+    substituídos pelos de conectar_auditoria_em_lote(), por isso todo model auditado
+    deve ser registrado por ela (ver verificar_registros_auditoria). Se o bloco terminar dentro de uma transação, a
+    gravação é feita após o commit. O actor pode ser um objeto lazy: só é avaliado
+    na gravação.
+    """
+    if _lote_atual.get() is not None:
+        yield _lote_atual.get()
+        return
+
+    lote = LoteAuditoria()
+    token = _lote_atual.set(lote)
+
+    try:
+        with disable_auditlog():
+            yield lote
+    finally:
+        _lote_atual.reset(token)
+        transaction.on_commit(lambda: lote.gravar(actor, remote_addr, remote_port))
+
+
+def _diff(old, new, update_fields=None):
+    return model_instance_diff(
+        old,
+        new,
+        fields_to_check=update_fields,
+        use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+    )
+
+
+def _ignorar(raw) -> bool:
+    return _lote_atual.get() is None or (raw and settings.AUDITLOG_DISABLE_ON_RAW_SAVE)
+
+
+def _log_update(sender, instance, raw=False, update_fields=None, **kwargs):
+    if _ignorar(raw) or instance._state.adding or instance.pk is None:
+        return
+
+    old = sender._default_manager.filter(pk=instance.pk).first()
+    changes = _diff(old, instance, update_fields)
+    if changes:
+        registrar_log(instance, LogEntry.Action.UPDATE, changes)
+
+
+def _log_create(sender, instance, created, raw=False, **kwargs):
+    if _ignorar(raw) or not created:
+        return
+
+    changes = _diff(None, instance)
+    if changes:
+        registrar_log(instance, LogEntry.Action.CREATE, changes)
+
+
+def _log_delete(sender, instance, **kwargs):
+    if _ignorar(False) or instance.pk is None:
+        return
+
+    changes = _diff(instance, None)
+    if changes:
+        registrar_log(instance, LogEntry.Action.DELETE, changes)
+
+
+def _mudancas_m2m(field_name, operacao, objetos):
+    """ Mesmo formato de LogEntry.objects.log_m2m_changes. """
+    return {
+        field_name: {
+            "type": "m2m",
+            "operation": operacao,
+            "objects": [smart_str(objeto) for objeto in objetos],
+        }
+    }
+
+
+def _log_m2m(field_name):
+    """
+    Receiver de m2m_changed para o campo informado, usado no lugar do m2m_fields do
+    auditlog (dentro e fora do lote). Alterações feitas pelo lado reverso
+    (ex.: unidade.usuarios.add(...)) são registradas em cada objeto do model auditado,
+    e o clear registra os vínculos que existiam.
+    """
+
+    def receiver(sender, instance, action, reverse, model, pk_set, **kwargs):
+        if action not in ("post_add", "post_remove", "pre_clear"):
+            return
+        if _lote_atual.get() is None and auditlog_disabled.get():
+            return
+
+        operacao = "add" if action == "post_add" else "delete"
+
+        if not reverse:
+            if action == "pre_clear":
+                objetos = list(getattr(instance, field_name).all())
+            else:
+                objetos = list(model._default_manager.filter(pk__in=pk_set))
+            if objetos:
+                registrar_log(instance, LogEntry.Action.UPDATE, _mudancas_m2m(field_name, operacao, objetos))
+            return
+
+        if action == "pre_clear":
+            auditados = model._default_manager.filter(**{field_name: instance})
+        else:
+            auditados = model._default_manager.filter(pk__in=pk_set)
+
+        for auditado in auditados:
+            registrar_log(auditado, LogEntry.Action.UPDATE, _mudancas_m2m(field_name, operacao, [instance]))
+
+    return receiver
+
+
+def conectar_auditoria_em_lote(model, m2m_fields=(), **opcoes) -> None:
+    """
+    Registra o model no auditlog e conecta os receivers que acumulam no lote os logs de
+    criação, alteração e exclusão. É o único caminho de registro no auditlog.
+
+    `opcoes` são repassadas ao auditlog.register (exclude_fields, mask_fields, ...). Os
+    campos many-to-many informados em m2m_fields são registrados pelo lote, não pelo
+    auditlog.
+    """
+    auditlog.register(model, **opcoes)
+
+    label = model._meta.label_lower
+    pre_save.connect(_log_update, sender=model, dispatch_uid=f"auditoria_lote_update_{label}")
+    post_save.connect(_log_create, sender=model, dispatch_uid=f"auditoria_lote_create_{label}")
+    post_delete.connect(_log_delete, sender=model, dispatch_uid=f"auditoria_lote_delete_{label}")
+
+    for field_name in m2m_fields:
+        m2m_changed.connect(
+            _log_m2m(field_name),
+            sender=getattr(model, field_name).through,
+            weak=False,
+            dispatch_uid=f"auditoria_lote_m2m_{label}_{field_name}",
+        )
+
+    _modelos_em_lote.add(model)
+
+
+def verificar_registros_auditoria() -> None:
+    """
+    Garante que nenhum model foi registrado direto no auditlog: dentro de
+    auditoria_em_lote() (todas as requisições) ele deixaria de ser auditado.
+    """
+    fora_do_lote = sorted(
+        model._meta.label for model in auditlog.get_models() if model not in _modelos_em_lote
+    )
+    if fora_do_lote:
+        raise ImproperlyConfigured(
+            "Models registrados no auditlog sem conectar_auditoria_em_lote(): {}. "
+            "Nas requisições eles não seriam auditados.".format(", ".join(fora_do_lote))
+        )
@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.db import transaction
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.utils.functional import LazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.users.revogacao import token_revogado
+
+User = get_user_model()
+
+ESTADO_USUARIO_CACHE_KEY = "users:estado:{}"
+
+# Claims gravadas por LoginView._generate_token que viram atributos do usuário
+CLAIMS_USUARIO = ("username", "name", "cpf", "email", "uuid")
+
+
+def _estado_cache_key(user_id) -> str:
+    return ESTADO_USUARIO_CACHE_KEY.format(user_id)
+
+
+def obter_estado_usuario(user_id):
+    """
+    Retorna o estado de autorização do usuário (is_active, is_app_admin, cargo_id),
+    guardado em cache por JWT_ESTADO_USUARIO_CACHE_TTL segundos.
+    Retorna None se o usuário não existir.
+    """
+    chave = _estado_cache_key(user_id)
+    estado = cache.get(chave)
+
+    if estado is None:
+        estado = (
+            User.objects
+            .filter(pk=user_id)
+            .values("is_active", "is_app_admin", "cargo_id")
+            .first()
+        )
+        if estado is None:
+            return None
+        cache.set(chave, estado, settings.JWT_ESTADO_USUARIO_CACHE_TTL)
+
+    return estado
+
+
+def invalidar_estado_usuarios(user_ids) -> None:
+    """
+    Remove do cache o estado dos usuários (chamar após alterações via QuerySet.update()).
+
+    A remoção é repetida após o commit para descartar um estado antigo que outra
+    requisição tenha gravado enquanto a transação estava aberta.
+    """
+    chaves = [_estado_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(chaves)
+    transaction.on_commit(lambda: cache.delete_many(chaves))
+
+
+class UsuarioToken(LazyObject):
+    """
+    Usuário autenticado montado a partir das claims do access token.
+
+    Identidade (username, name, cpf, email, uuid) vem das claims e o perfil
+    (is_active, is_app_admin, cargo) do estado em cache, sem consultar o banco.
+    Qualquer outro atributo (unidades, cargo, save(), ...) carrega o User do banco
+    uma única vez e passa a delegar para ele.
+    """
+
+    def __init__(self, user_id, atributos):
+        self.__dict__["_atributos"] = {"id": user_id, "pk": user_id, **atributos}
+        super().__init__()
+
+    def _setup(self):
+        self._wrapped = User.objects.select_related("cargo").get(pk=self._atributos["pk"])
+
+    def __getattr__(self, name):
+        if self._wrapped is empty and name in self._atributos:
+            return self._atributos[name]
+        return super().__getattr__(name)
+
+    def __str__(self):
+        if self._wrapped is empty:
+            return self._atributos["username"]
+        return str(self._wrapped)
+
+    def __repr__(self):
+        return f"<UsuarioToken: {self._atributos['username']}>"
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Autenticação JWT que não carrega o User a cada requisição.
+
+    Tokens emitidos pelo LoginView trazem as claims de identidade; o estado do usuário
+    (ativo, administrador, cargo) é consultado em cache com TTL curto e invalidado
+    quando o usuário é salvo, de modo que inativações e mudanças de perfil continuam
+    valendo sem aguardar a expiração do token.
+
+    Tokens emitidos antes da inativação do usuário são recusados pela lista de
+    revogação (apps.users.revogacao). Tokens sem as claims (emitidos por outros
+    fluxos) seguem o caminho padrão.
+    """
+
+    def get_user(self, validated_token):
+        if token_revogado(validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        if not all(claim in validated_token for claim in ("username", "name")):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        estado = obter_estado_usuario(user_id)
+
+        if estado is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not estado["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        cargo_id = estado["cargo_id"]
+        atributos = {
+            claim: validated_token[claim]
+            for claim in CLAIMS_USUARIO
+            if claim in validated_token
+        }
+        atributos.update({
+            "is_active": True,
+            "is_authenticated": True,
+            "is_anonymous": False,
+            "is_app_admin": estado["is_app_admin"],
+            "cargo_id": cargo_id,
+            "is_gipe": cargo_id == User.PERFIL_GIPE,
+            "is_ponto_focal": cargo_id == User.PERFIL_PONTO_FOCAL,
+            "is_diretor": cargo_id == User.PERFIL_DIRETOR,
+        })
+
+        return UsuarioToken(user_id, atributos)
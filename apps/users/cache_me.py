@@ -0,0 +1,57 @@
+import uuid
+
+from django.db import transaction
+from django.core.cache import cache
+
+ME_VERSAO_USUARIO_CACHE_KEY = "users:me:versao:{}"
+ME_VERSAO_CATALOGO_CACHE_KEY = "users:me:versao_catalogo"
+ME_CACHE_KEY = "users:me:{}"
+
+
+def _versao_usuario_cache_key(user_id) -> str:
+    return ME_VERSAO_USUARIO_CACHE_KEY.format(user_id)
+
+
+def obter_versao_me(user_id) -> str:
+    """
+    Versão atual da resposta de /me do usuário, usada na chave do cache, como ETag e na
+    chave do perfil de acesso (apps.users.perfil).
+
+    Combina a versão do usuário (dados, cargo e vínculos com unidades) com a versão do
+    catálogo (unidades e cargos). Invalidar é descartar a versão: a próxima leitura gera
+    uma nova e as respostas antigas deixam de ser encontradas (expiram pelo TTL). As
+    versões ficam no cache compartilhado, então todos os workers usam as mesmas.
+    """
+    chaves = [_versao_usuario_cache_key(user_id), ME_VERSAO_CATALOGO_CACHE_KEY]
+    versoes = cache.get_many(chaves)
+
+    faltando = [chave for chave in chaves if chave not in versoes]
+    if faltando:
+        novas = {chave: uuid.uuid4().hex[:12] for chave in faltando}
+        # add não sobrescreve: workers que geram a versão ao mesmo tempo ficam com a primeira gravada
+        for chave, versao in novas.items():
+            cache.add(chave, versao, None)
+        versoes.update(novas | cache.get_many(faltando))
+
+    return "{}-{}-{}".format(user_id, *(versoes[chave] for chave in chaves))
+
+
+def me_cache_key(versao) -> str:
+    return ME_CACHE_KEY.format(versao)
+
+
+def invalidar_me_usuarios(user_ids) -> None:
+    """
+    Descarta a versão de /me dos usuários informados.
+
+    Assim como o estado da autenticação, a remoção é repetida após o commit.
+    """
+    chaves = [_versao_usuario_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(chaves)
+    transaction.on_commit(lambda: cache.delete_many(chaves))
+
+
+def invalidar_me_catalogo() -> None:
+    """ Descarta a versão de /me de todos os usuários (alteração em unidades ou cargos). """
+    cache.delete(ME_VERSAO_CATALOGO_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(ME_VERSAO_CATALOGO_CACHE_KEY))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.services.retencao_auditoria_service import RetencaoAuditoriaService
+
+
+class Command(BaseCommand):
+    help = (
+        "Move para auditlog_logentry_arquivo (ou apaga) as entradas do auditlog mais "
+        "antigas que o período de retenção, em lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dias",
+            type=int,
+            help="Período de retenção em dias (padrão: AUDITLOG_RETENCAO_DIAS).",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            help="Quantidade de entradas por transação (padrão: AUDITLOG_RETENCAO_LOTE).",
+        )
+        parser.add_argument(
+            "--apagar",
+            action="store_true",
+            help="Apaga as entradas em vez de arquivá-las.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Apenas informa quantas entradas seriam processadas.",
+        )
+
+    def handle(self, *args, **options):
+        resumo = RetencaoAuditoriaService(
+            dias=options["dias"],
+            tamanho_lote=options["lote"],
+            apagar=options["apagar"],
+            dry_run=options["dry_run"],
+        ).executar()
+
+        if options["dry_run"]:
+            acao = "[dry-run] Seriam processadas"
+        else:
+            acao = "Apagadas" if options["apagar"] else "Arquivadas"
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{acao}: {resumo['processadas']} entrada(s) anteriores a "
+            f"{resumo['limite']:%d/%m/%Y %H:%M} | Lotes: {resumo['lotes']}"
+        ))
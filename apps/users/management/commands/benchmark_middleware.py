@@ -0,0 +1,74 @@
+import time
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.test import Client
+from django.urls import reverse
+from django.test.utils import override_settings
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import AccessToken
+
+# Middlewares "fora da API" e os originais do Django que eles substituem
+MIDDLEWARES_ORIGINAIS = {
+    "apps.users.middleware.SessionForaDaApiMiddleware": "django.contrib.sessions.middleware.SessionMiddleware",
+    "apps.users.middleware.CsrfForaDaApiMiddleware": "django.middleware.csrf.CsrfViewMiddleware",
+    "apps.users.middleware.AuthenticationForaDaApiMiddleware": "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.users.middleware.MessageForaDaApiMiddleware": "django.contrib.messages.middleware.MessageMiddleware",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o tempo médio por requisição de um endpoint da API com o stack de middlewares "
+        "completo e com o stack atual (sem sessão nas rotas da API)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="Endpoint medido (padrão: verify-token, que não consulta o banco além da transação).",
+        )
+        parser.add_argument(
+            "--requisicoes",
+            type=int,
+            default=1000,
+            help="Quantidade de requisições por medição (padrão: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        url = options["url"] or reverse("users:verify-token")
+        requisicoes = options["requisicoes"]
+        token = str(AccessToken.for_user(SimpleNamespace(id=0)))
+
+        stacks = (
+            ("Stack completo", [MIDDLEWARES_ORIGINAIS.get(m, m) for m in settings.MIDDLEWARE]),
+            ("Stack atual", list(settings.MIDDLEWARE)),
+        )
+
+        tempos = {}
+        for nome, middleware in stacks:
+            with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                tempos[nome] = self._medir(url, token, requisicoes)
+            self.stdout.write(f"{nome}: {tempos[nome] * 1e6:.1f} µs/requisição")
+
+        completo, atual = (tempos[nome] for nome, _ in stacks)
+        self.stdout.write(self.style.SUCCESS(
+            f"Diferença: {(completo - atual) * 1e6:.1f} µs/requisição "
+            f"({(completo - atual) / completo:.1%} do tempo com o stack completo)"
+        ))
+
+    @staticmethod
+    def _medir(url, token, requisicoes):
+        cliente = Client()
+
+        def requisicao():
+            return cliente.post(url, {"token": token}, content_type="application/json")
+
+        # Aquecimento: carrega os middlewares e preenche caches
+        for _ in range(min(50, requisicoes)):
+            requisicao()
+
+        inicio = time.perf_counter()
+        for _ in range(requisicoes):
+            requisicao()
+        return (time.perf_counter() - inicio) / requisicoes
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.services.provisionamento_core_sso_service import ProvisionamentoCoreSSOService
+
+
+class Command(BaseCommand):
+    help = (
+        "Devolve à fila de tarefas o provisionamento no CoreSSO dos usuários com falha "
+        "e dos que continuam pendentes após CORESSO_PROVISIONAMENTO_PENDENTE_MINUTOS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limite",
+            type=int,
+            help="Quantidade máxima de usuários processados nesta execução.",
+        )
+
+    def handle(self, *args, **options):
+        quantidade = ProvisionamentoCoreSSOService.reprocessar(limite=options["limite"])
+
+        self.stdout.write(self.style.SUCCESS(f"Usuários reenfileirados: {quantidade}"))
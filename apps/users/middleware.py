@@ -1,9 +1,31 @@
+from functools import lru_cache
+
 from auditlog.context import set_actor
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import Resolver404, resolve
 from django.utils.functional import SimpleLazyObject
+from django.middleware.csrf import CsrfViewMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.contrib.auth.middleware import AuthenticationMiddleware
 from auditlog.middleware import AuditlogMiddleware as _AuditlogMiddleware
+from rest_framework.views import APIView
+
+from apps.users.auditoria import auditoria_em_lote, verificar_registros_auditoria
 
 
 class AuditlogMiddleware(_AuditlogMiddleware):
+    """
+    Define o ator do auditlog e acumula os logs da requisição, gravados com um
+    único bulk_create depois do commit (ver apps.users.auditoria).
+    """
+
+    def __init__(self, get_response=None):
+        # Carregado na inicialização, com todos os apps prontos e registrados no auditlog
+        verificar_registros_auditoria()
+        super().__init__(get_response)
 
     def __call__(self, request):
 
@@ -11,5 +33,67 @@ class AuditlogMiddleware(_AuditlogMiddleware):
         user = SimpleLazyObject(lambda: getattr(request, "user", None))
         context = set_actor(actor=user, remote_addr=remote_addr)
 
-        with context:
-            return self.get_response(request)
\ No newline at end of file
+        with context, auditoria_em_lote(actor=user, remote_addr=remote_addr):
+            return self.get_response(request)
+
+
+@lru_cache(maxsize=2048)
+def is_rota_api_sem_sessao(path_info: str) -> bool:
+    """
+    Indica se o caminho é atendido por uma view DRF da API, autenticada por JWT e
+    sem uso de sessão. Páginas do site montadas sob /api/ (ex.: ~update) e as views
+    de API_SEM_SESSAO_VIEWS_EXCLUIDAS (documentação) mantêm o stack completo.
+    """
+    if not path_info.startswith(settings.API_SEM_SESSAO_PREFIXO):
+        return False
+
+    try:
+        match = resolve(path_info)
+    except Resolver404:
+        return False
+
+    view_class = getattr(match.func, "cls", None)
+    return (
+        view_class is not None
+        and issubclass(view_class, APIView)
+        and match.view_name not in settings.API_SEM_SESSAO_VIEWS_EXCLUIDAS
+    )
+
+
+@receiver(setting_changed, dispatch_uid="users_limpar_rotas_api_sem_sessao")
+def _limpar_rotas_api_sem_sessao(setting, **kwargs):
+    if setting in ("ROOT_URLCONF", "API_SEM_SESSAO_PREFIXO", "API_SEM_SESSAO_VIEWS_EXCLUIDAS"):
+        is_rota_api_sem_sessao.cache_clear()
+
+
+class ForaDaApiMixin:
+    """
+    Executa o middleware apenas fora das rotas da API sem sessão.
+    As subclasses continuam sendo subclasses dos middlewares do Django, o que mantém
+    válidas as verificações do admin sobre MIDDLEWARE.
+    """
+
+    def __call__(self, request):
+        if is_rota_api_sem_sessao(request.path_info):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionForaDaApiMiddleware(ForaDaApiMixin, SessionMiddleware):
+    pass
+
+
+class CsrfForaDaApiMiddleware(ForaDaApiMixin, CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_rota_api_sem_sessao(request.path_info):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationForaDaApiMiddleware(ForaDaApiMixin, AuthenticationMiddleware):
+    pass
+
+
+class MessageForaDaApiMiddleware(ForaDaApiMixin, MessageMiddleware):
+    pass
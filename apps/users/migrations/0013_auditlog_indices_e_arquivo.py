@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# Índices e tabela de arquivo do auditlog (app de terceiros, sem migrations próprias
+# para isso). Os índices atendem ao histórico por objeto e por ator, ambos ordenados
+# por data; a tabela de arquivo recebe as entradas movidas pelo comando
+# arquivar_auditoria e tem a mesma estrutura de auditlog_logentry.
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0012_user_inativado_via_unidade_user_motivo_inativacao'),
+        ('auditlog', '0017_add_actor_email'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS auditlog_le_ct_obj_ts_idx '
+                'ON auditlog_logentry (content_type_id, object_pk, "timestamp" DESC, id DESC);'
+            ),
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auditlog_le_ct_obj_ts_idx;',
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS auditlog_le_actor_ts_idx '
+                'ON auditlog_logentry (actor_id, "timestamp" DESC);'
+            ),
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auditlog_le_actor_ts_idx;',
+        ),
+        migrations.RunSQL(
+            sql=[
+                'CREATE TABLE IF NOT EXISTS auditlog_logentry_arquivo '
+                '(LIKE auditlog_logentry, PRIMARY KEY (id));',
+                'CREATE INDEX IF NOT EXISTS auditlog_le_arquivo_ct_obj_idx '
+                'ON auditlog_logentry_arquivo (content_type_id, object_pk);',
+                'CREATE INDEX IF NOT EXISTS auditlog_le_arquivo_ts_idx '
+                'ON auditlog_logentry_arquivo ("timestamp");',
+            ],
+            reverse_sql='DROP TABLE IF EXISTS auditlog_logentry_arquivo;',
+        ),
+    ]
@@ -0,0 +1,30 @@
+import uuid
+from django.db import migrations
+
+
+def popula_uuid_usuarios(apps, schema_editor):
+    """
+    Preenche o uuid dos usuários que ainda não têm, em lotes, para que a migration
+    seguinte possa torná-lo obrigatório e único.
+    """
+    User = apps.get_model('users', 'User')
+
+    while True:
+        pendentes = list(User.objects.filter(uuid__isnull=True).only('pk')[:1000])
+        if not pendentes:
+            break
+
+        for usuario in pendentes:
+            usuario.uuid = uuid.uuid4()
+        User.objects.bulk_update(pendentes, ['uuid'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_auditlog_indices_e_arquivo'),
+    ]
+
+    operations = [
+        migrations.RunPython(popula_uuid_usuarios, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.8 on 2026-10-19 01:00
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0014_popula_uuid_usuarios'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.8 on 2026-10-19 01:01
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def verifica_emails_duplicados(apps, schema_editor):
+    """
+    Interrompe a migration, listando os e-mails, se houver usuários com o mesmo
+    e-mail (sem diferenciar maiúsculas); eles precisam ser corrigidos antes.
+    """
+    User = apps.get_model('users', 'User')
+
+    duplicados = list(
+        User.objects
+        .exclude(email='')
+        .exclude(email__isnull=True)
+        .values(email_lower=Lower('email'))
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .values_list('email_lower', flat=True)[:50]
+    )
+
+    if duplicados:
+        raise RuntimeError(
+            'Existem usuários com e-mails duplicados (sem diferenciar maiúsculas): '
+            + ', '.join(duplicados)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('unidades', '0005_alter_unidade_tipo_unidade'),
+        ('users', '0015_user_uuid_unico'),
+    ]
+
+    operations = [
+        migrations.RunPython(verifica_emails_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='users_user_email_lower_unico', violation_error_message='Este e-mail já está cadastrado.'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.8 on 2026-10-19 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('unidades', '0005_alter_unidade_tipo_unidade'),
+        ('users', '0016_user_email_unico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='erro_core_sso',
+            field=models.TextField(blank=True, help_text='Motivo da última falha no provisionamento do usuário no CoreSSO', verbose_name='Erro no CoreSSO'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='status_core_sso',
+            field=models.CharField(blank=True, choices=[('PENDENTE', 'Pendente'), ('PROVISIONADO', 'Provisionado'), ('FALHA', 'Falha')], default='', help_text='Situação do provisionamento do usuário no CoreSSO (vazio quando não se aplica)', max_length=12, verbose_name='Status no CoreSSO'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('status_core_sso__in', ['PENDENTE', 'FALHA'])), fields=['status_core_sso'], name='users_user_core_sso_pend_idx'),
+        ),
+    ]
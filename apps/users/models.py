@@ -1,14 +1,29 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 from apps.unidades.models.unidades import Unidade, TipoGestaoChoices
 
+EMAIL_UNICO_CONSTRAINT = "users_user_email_lower_unico"
+
+
+def violou_email_unico(erro) -> bool:
+    """ Indica se o IntegrityError veio da unicidade de e-mail (lower(email)). """
+    diag = getattr(erro.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == EMAIL_UNICO_CONSTRAINT
+
+
+class StatusCoreSSOChoices(models.TextChoices):
+    PENDENTE = "PENDENTE", "Pendente"
+    PROVISIONADO = "PROVISIONADO", "Provisionado"
+    FALHA = "FALHA", "Falha"
+
 
 class User(AbstractUser):
     """
     Modelo de usuário customizado do sistema
     """
-    uuid = models.UUIDField(default=uuid.uuid4, editable=False, null=True)
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     name = models.CharField("Nome", max_length=150)
     cpf = models.CharField("CPF", max_length=11, unique=True)
     email = models.EmailField("E-mail", max_length=254, null=True, blank=True, default="")
@@ -31,6 +46,19 @@ class User(AbstractUser):
     )
     is_validado = models.BooleanField("Validado", default=False, help_text="Indica se o usuário foi validado")
     is_core_sso = models.BooleanField("CoreSSO", default=False, help_text="Indica se o usuário possue cadastro no coreSSO")
+    status_core_sso = models.CharField(
+        "Status no CoreSSO",
+        max_length=12,
+        choices=StatusCoreSSOChoices.choices,
+        blank=True,
+        default="",
+        help_text="Situação do provisionamento do usuário no CoreSSO (vazio quando não se aplica)"
+    )
+    erro_core_sso = models.TextField(
+        "Erro no CoreSSO",
+        blank=True,
+        help_text="Motivo da última falha no provisionamento do usuário no CoreSSO"
+    )
     
     # mapeamento dos códigos de cargo para facilitar as permissões
     PERFIL_GIPE = 0        # ajuste para o código real no Cargo
@@ -88,6 +116,49 @@ class User(AbstractUser):
     class Meta:
         verbose_name = "Usuário"
         verbose_name_plural = "Usuários"
+        constraints = [
+            # E-mail único sem diferenciar maiúsculas; e-mails vazios ficam de fora
+            models.UniqueConstraint(
+                Lower("email"),
+                name=EMAIL_UNICO_CONSTRAINT,
+                condition=~models.Q(email=""),
+                violation_error_message="Este e-mail já está cadastrado.",
+            ),
+        ]
+        indexes = [
+            # Apenas os usuários que o reprocessamento do CoreSSO precisa encontrar
+            models.Index(
+                fields=["status_core_sso"],
+                name="users_user_core_sso_pend_idx",
+                condition=models.Q(status_core_sso__in=["PENDENTE", "FALHA"]),
+            ),
+        ]
+
+    @classmethod
+    def email_em_uso(cls, email, excluir_pk=None) -> bool:
+        """
+        Verifica se o e-mail (sem diferenciar maiúsculas) já pertence a outro usuário.
+        A consulta repete a expressão e a condição da constraint para usar o índice único.
+        """
+        qs = (
+            cls.objects
+            .alias(email_lower=Lower("email"))
+            .filter(email_lower=email.lower())
+            .exclude(email="")
+        )
+        if excluir_pk is not None:
+            qs = qs.exclude(pk=excluir_pk)
+        return qs.exists()
+
+    @classmethod
+    def nome_por_username(cls, campo):
+        """
+        Subquery com o nome do usuário cujo username está no campo informado, para uso em
+        annotate: resolve os nomes de todas as linhas de uma listagem na mesma consulta.
+        """
+        return models.Subquery(
+            cls.objects.filter(username=models.OuterRef(campo)).values("name")[:1]
+        )
     
     def __str__(self) -> str:
         return self.username
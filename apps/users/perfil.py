@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+
+from apps.unidades.models.unidades import TipoUnidadeChoices
+from apps.users.cache_me import obter_versao_me
+
+User = get_user_model()
+
+PERFIL_USUARIO_CACHE_KEY = "users:perfil:{}"
+
+
+def _perfil_cache_key(user_id) -> str:
+    # Mesma versão de /me: muda quando o usuário, seus vínculos ou as unidades são alterados
+    return PERFIL_USUARIO_CACHE_KEY.format(obter_versao_me(user_id))
+
+
+class PerfilUsuario:
+    """
+    Perfil de acesso do usuário autenticado: cargo e conjuntos de unidades/DREs.
+
+    - unidades: codigo_eol de todas as unidades vinculadas ao usuário
+    - dres: codigo_eol das unidades do tipo DRE
+    - dres_das_unidades: DRE (dre_id) das unidades que não são DRE
+    """
+
+    def __init__(self, user, vinculos):
+        self.user_id = user.pk
+        self.is_app_admin = user.is_app_admin
+        self.is_gipe = user.is_gipe
+        self.is_ponto_focal = user.is_ponto_focal
+        self.is_diretor = user.is_diretor
+
+        self.unidades = frozenset(codigo for codigo, _, _ in vinculos)
+        self.dres = frozenset(
+            codigo for codigo, tipo, _ in vinculos if tipo == TipoUnidadeChoices.DRE
+        )
+        self.dres_das_unidades = frozenset(
+            dre_id for _, tipo, dre_id in vinculos
+            if tipo != TipoUnidadeChoices.DRE and dre_id
+        )
+
+    @property
+    def codigo_unidade_principal(self):
+        """ Menor codigo_eol entre as unidades do usuário (a primeira por ordem de chave). """
+        return min(self.unidades, default=None)
+
+
+def _carregar_vinculos(user_id):
+    """ Lista (codigo_eol, tipo_unidade, dre_id) das unidades do usuário, numa única consulta. """
+
+    cache_key = _perfil_cache_key(user_id)
+    vinculos = cache.get(cache_key)
+
+    if vinculos is None:
+        vinculos = list(
+            User.unidades.through.objects
+            .filter(user_id=user_id)
+            .values_list("unidade_id", "unidade__tipo_unidade", "unidade__dre_id")
+        )
+        cache.set(cache_key, vinculos, settings.PERFIL_USUARIO_CACHE_TTL)
+
+    return vinculos
+
+
+def carregar_perfil_usuario(user):
+    """ Monta o PerfilUsuario de um usuário (fora do ciclo de uma requisição). """
+    return PerfilUsuario(user, _carregar_vinculos(user.pk))
+
+
+def obter_perfil_usuario(request):
+    """
+    Retorna o PerfilUsuario de request.user, montado uma única vez por requisição.
+
+    As unidades do usuário ficam no cache compartilhado por PERFIL_USUARIO_CACHE_TTL
+    segundos, na versão do usuário (ver apps.users.cache_me): alterar o usuário, seus
+    vínculos ou as unidades gera uma nova versão, visível para todos os workers.
+    """
+    user = request.user
+    perfil = getattr(request, "_perfil_usuario", None)
+
+    if perfil is None or perfil.user_id != user.pk:
+        perfil = carregar_perfil_usuario(user)
+        request._perfil_usuario = perfil
+
+    return perfil
+
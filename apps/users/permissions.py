@@ -1,46 +1,32 @@
 from django.conf import settings
 from rest_framework.permissions import BasePermission
 from apps.unidades.models.unidades import TipoUnidadeChoices
-
-
-def _get_user_dres_ids(user):
-    """
-    Retorna os IDs (codigo_eol) das DREs do usuário.
-    """
-    return set(
-        user.unidades
-            .filter(tipo_unidade=TipoUnidadeChoices.DRE)
-            .values_list("codigo_eol", flat=True)
-    )
+from apps.users.perfil import obter_perfil_usuario
 
 
 def _get_obj_related_dres_ids(obj):
     """
     Retorna os IDs das DREs relacionadas ao objeto.
     Inclui tanto DREs diretas quanto DREs de unidades vinculadas.
+    Usa obj.unidades.all() para aproveitar o prefetch_related das views.
     """
-    # 1. DREs diretas (se obj for Ponto Focal de DRE)
-    obj_dres = set(
-        obj.unidades
-            .filter(tipo_unidade=TipoUnidadeChoices.DRE)
-            .values_list("codigo_eol", flat=True)
-    )
-    # 2. DREs das unidades não-DRE (se obj for de escola, etc.)
-    obj_dres_unidades = set(
-        obj.unidades
-            .exclude(tipo_unidade=TipoUnidadeChoices.DRE)
-            .exclude(dre__isnull=True)
-            .values_list("dre_id", flat=True)
-    )
-    
-    return obj_dres | obj_dres_unidades
+    obj_dres = set()
+    for unidade in obj.unidades.all():
+        # 1. DREs diretas (se obj for Ponto Focal de DRE)
+        if unidade.tipo_unidade == TipoUnidadeChoices.DRE:
+            obj_dres.add(unidade.codigo_eol)
+        # 2. DREs das unidades não-DRE (se obj for de escola, etc.)
+        elif unidade.dre_id:
+            obj_dres.add(unidade.dre_id)
+
+    return obj_dres
 
 
-def _ponto_focal_has_access_to_user(ponto_focal, target_user):
+def _ponto_focal_has_access_to_user(request, target_user):
     """
-    Verifica se um Ponto Focal tem acesso a um usuário alvo.
+    Verifica se o Ponto Focal autenticado tem acesso a um usuário alvo.
     """
-    user_dres = _get_user_dres_ids(ponto_focal)
+    user_dres = obter_perfil_usuario(request).dres
     obj_dres = _get_obj_related_dres_ids(target_user)
     return bool(user_dres & obj_dres)
 
@@ -69,7 +55,7 @@ class CanManageUsers(BasePermission):
 
             # Ponto Focal admin → list/retrieve/create/update/partial_update
             if user.is_ponto_focal and view.action in [
-                "list", "retrieve", "create", "update", "partial_update"
+                "list", "retrieve", "create", "update", "partial_update", "importar", "exportar"
             ]:
                 return True
 
@@ -90,7 +76,7 @@ class CanManageUsers(BasePermission):
 
         # Ponto Focal admin → somente usuários com unidades na(s) DRE(s) dele
         if user.is_app_admin and user.is_ponto_focal:
-            return _ponto_focal_has_access_to_user(user, obj)
+            return _ponto_focal_has_access_to_user(request, obj)
 
         # Qualquer outro (não-admin ou outro perfil) → só o próprio registro
         return obj.pk == user.pk
@@ -131,7 +117,7 @@ class CanApproveUser(BasePermission):
 
         # Ponto Focal admin aprova apenas usuários da(s) DRE(s) dele
         if user.is_app_admin and user.is_ponto_focal:
-            return _ponto_focal_has_access_to_user(user, obj)
+            return _ponto_focal_has_access_to_user(request, obj)
 
         return False
     
@@ -0,0 +1,202 @@
+import math
+import time
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _tempo_de_vida() -> float:
+    """ Entradas da lista vivem o mesmo tempo que o access token. """
+    return api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom em memória para descartar, sem ir ao Redis, os usuários
+    que certamente não estão na lista de revogação.
+    """
+
+    def __init__(self, capacidade, taxa_falso_positivo=0.01):
+        capacidade = max(capacidade, 1)
+        self.tamanho = math.ceil(-capacidade * math.log(taxa_falso_positivo) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.tamanho / capacidade * math.log(2)))
+        self.bits = bytearray((self.tamanho + 7) // 8)
+
+    def _posicoes(self, item):
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.tamanho for i in range(self.num_hashes))
+
+    def adicionar(self, item):
+        for posicao in self._posicoes(item):
+            self.bits[posicao >> 3] |= 1 << (posicao & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(item))
+
+
+class RevogacaoRedisBackend:
+    """
+    Lista de revogação em um sorted set do Redis: membro = id do usuário,
+    score = instante (epoch) da revogação. Entradas mais antigas que o tempo de vida
+    do access token são descartadas a cada gravação.
+    """
+
+    chave = "users:tokens_revogados"
+
+    def __init__(self):
+        self.cliente = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.TOKEN_REVOGACAO_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.TOKEN_REVOGACAO_REDIS_TIMEOUT,
+        )
+
+    def revogar(self, user_ids, revogado_em):
+        tempo_de_vida = _tempo_de_vida()
+        pipeline = self.cliente.pipeline()
+        pipeline.zadd(self.chave, {str(user_id): revogado_em for user_id in user_ids})
+        pipeline.zremrangebyscore(self.chave, "-inf", revogado_em - tempo_de_vida)
+        pipeline.expire(self.chave, math.ceil(tempo_de_vida))
+        pipeline.execute()
+
+    def revogado_em(self, user_id):
+        return self.cliente.zscore(self.chave, str(user_id))
+
+    def listar(self):
+        inicio = time.time() - _tempo_de_vida()
+        return [membro.decode() for membro in self.cliente.zrangebyscore(self.chave, inicio, "+inf")]
+
+    def limpar(self):
+        self.cliente.delete(self.chave)
+
+
+class RevogacaoMemoriaBackend:
+    """ Lista de revogação no próprio processo, para desenvolvimento local e testes. """
+
+    def __init__(self):
+        self._revogados = {}
+
+    def revogar(self, user_ids, revogado_em):
+        for user_id in user_ids:
+            self._revogados[str(user_id)] = revogado_em
+
+    def revogado_em(self, user_id):
+        revogado_em = self._revogados.get(str(user_id))
+        if revogado_em is not None and revogado_em < time.time() - _tempo_de_vida():
+            return None
+        return revogado_em
+
+    def listar(self):
+        return [user_id for user_id in self._revogados if self.revogado_em(user_id) is not None]
+
+    def limpar(self):
+        self._revogados.clear()
+
+
+class ListaRevogacao:
+    """
+    Lista de revogação de tokens consultada pela autenticação JWT.
+
+    Um token é revogado quando foi emitido (claim iat) antes da revogação do seu usuário.
+    A consulta passa primeiro por um filtro de Bloom reconstruído a cada
+    TOKEN_REVOGACAO_BLOOM_INTERVALO segundos; só os usuários que o filtro aponta como
+    possivelmente revogados são conferidos no backend. Revogações feitas por outros
+    processos passam a valer na próxima reconstrução do filtro.
+
+    Falhas no backend são registradas e o token é aceito: a inativação continua sendo
+    barrada pelo estado do usuário usado na autenticação.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._filtro = None
+        self._atualizado_em = 0.0
+
+    def _filtro_atual(self):
+        if self._filtro is None or time.monotonic() - self._atualizado_em >= settings.TOKEN_REVOGACAO_BLOOM_INTERVALO:
+            with self._lock:
+                if self._filtro is None or time.monotonic() - self._atualizado_em >= settings.TOKEN_REVOGACAO_BLOOM_INTERVALO:
+                    self._reconstruir_filtro()
+        return self._filtro
+
+    def _reconstruir_filtro(self):
+        self._atualizado_em = time.monotonic()
+        try:
+            user_ids = self.backend.listar()
+        except redis.RedisError as e:
+            logger.warning("Falha ao carregar a lista de tokens revogados: %s", e)
+            if self._filtro is None:
+                self._filtro = FiltroBloom(settings.TOKEN_REVOGACAO_BLOOM_CAPACIDADE)
+            return
+
+        filtro = FiltroBloom(max(settings.TOKEN_REVOGACAO_BLOOM_CAPACIDADE, 2 * len(user_ids)))
+        for user_id in user_ids:
+            filtro.adicionar(user_id)
+        self._filtro = filtro
+
+    def revogar(self, user_ids):
+        user_ids = [str(user_id) for user_id in user_ids]
+        if not user_ids:
+            return
+
+        try:
+            self.backend.revogar(user_ids, time.time())
+        except redis.RedisError as e:
+            logger.error("Falha ao revogar os tokens dos usuários %s: %s", user_ids, e)
+            return
+
+        filtro = self._filtro_atual()
+        for user_id in user_ids:
+            filtro.adicionar(user_id)
+
+    def token_revogado(self, user_id, emitido_em) -> bool:
+        if str(user_id) not in self._filtro_atual():
+            return False
+
+        try:
+            revogado_em = self.backend.revogado_em(user_id)
+        except redis.RedisError as e:
+            logger.warning("Falha ao consultar a lista de tokens revogados: %s", e)
+            return False
+
+        if revogado_em is None:
+            return False
+
+        # O iat do JWT tem resolução de segundos: um token emitido (novo login) no mesmo
+        # segundo da revogação tem iat menor que o instante fracionário da revogação
+        return emitido_em is None or emitido_em < int(revogado_em)
+
+    def limpar(self):
+        self.backend.limpar()
+        with self._lock:
+            self._filtro = None
+
+
+@lru_cache(maxsize=None)
+def obter_lista_revogacao() -> ListaRevogacao:
+    return ListaRevogacao(import_string(settings.TOKEN_REVOGACAO_BACKEND)())
+
+
+def revogar_tokens_usuarios(user_ids) -> None:
+    """ Revoga os tokens já emitidos para os usuários, após o commit da transação. """
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: obter_lista_revogacao().revogar(user_ids))
+
+
+def token_revogado(validated_token) -> bool:
+    """ Indica se o token (já validado) pertence a um usuário revogado depois da emissão. """
+    user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return False
+    return obter_lista_revogacao().token_revogado(user_id, validated_token.get("iat"))
@@ -1,8 +1,11 @@
 import logging
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.template.loader import render_to_string
-from django.core.mail import EmailMessage, BadHeaderError
+from django.core.mail import EmailMessage, BadHeaderError, get_connection
+
+from apps.helpers.utils import em_blocos
 
 logger = logging.getLogger(__name__)
 
@@ -21,21 +24,27 @@ class EnviaEmailService:
     def renderizar_corpo(template_html, contexto):
         return render_to_string(template_html, contexto)
 
+    @classmethod
+    def montar(cls, destinatario, assunto, template_html, contexto, connection=None):
+        """ Valida os dados e monta o e-mail HTML, sem enviar. """
+
+        cls.validar(destinatario, assunto)
+
+        email = EmailMessage(
+            subject=assunto,
+            body=cls.renderizar_corpo(template_html, contexto),
+            to=[destinatario] if isinstance(destinatario, str) else destinatario,
+            connection=connection,
+        )
+        email.content_subtype = 'html'
+        return email
+
     @classmethod
     def enviar(cls, destinatario, assunto, template_html, contexto):
         """ Envia e-mail HTML sem necessidade de instanciar a classe. """
 
         try:
-            cls.validar(destinatario, assunto)
-
-            corpo_html = cls.renderizar_corpo(template_html, contexto)
-
-            email = EmailMessage(
-                subject=assunto,
-                body=corpo_html,
-                to=[destinatario] if isinstance(destinatario, str) else destinatario,
-            )
-            email.content_subtype = 'html'
+            email = cls.montar(destinatario, assunto, template_html, contexto)
             email.send()
 
             logger.info(
@@ -48,4 +57,52 @@ class EnviaEmailService:
 
         except Exception as e:
             logger.exception("Erro inesperado ao enviar e-mail.")
-            raise RuntimeError("Erro inesperado ao enviar e-mail.") from e
\ No newline at end of file
+            raise RuntimeError("Erro inesperado ao enviar e-mail.") from e
+
+    @classmethod
+    def enviar_em_lote(cls, mensagens, tamanho_lote=None) -> dict[str, str | None]:
+        """
+        Envia vários e-mails HTML reaproveitando uma conexão SMTP a cada `tamanho_lote`
+        mensagens (padrão: EMAIL_ENVIO_LOTE).
+
+        Cada mensagem é um dicionário com os argumentos de enviar() e o corpo é renderizado
+        por destinatário. Falhas não interrompem o lote: retorna um dicionário
+        destinatario -> mensagem de erro (ou None quando o e-mail foi enviado).
+        """
+
+        resultados = {}
+
+        for bloco in em_blocos(mensagens, tamanho_lote or settings.EMAIL_ENVIO_LOTE):
+            resultados.update(cls._enviar_bloco(bloco))
+
+        enviados = sum(1 for erro in resultados.values() if erro is None)
+        logger.info("Envio em lote: %s de %s e-mail(s) enviados.", enviados, len(resultados))
+        return resultados
+
+    @classmethod
+    def _enviar_bloco(cls, bloco) -> dict[str, str | None]:
+        """ Monta e envia as mensagens do bloco por uma única conexão, registrando o resultado de cada uma. """
+
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            logger.exception("Erro ao abrir conexão com o servidor de e-mail.")
+            return {
+                mensagem["destinatario"]: f"Falha na conexão com o servidor de e-mail: {e}" for mensagem in bloco
+            }
+
+        resultados = {}
+        try:
+            for mensagem in bloco:
+                destinatario = mensagem["destinatario"]
+                try:
+                    cls.montar(**mensagem, connection=connection).send()
+                    resultados[destinatario] = None
+                except Exception as e:
+                    logger.warning("Falha ao enviar e-mail para %s: %s", destinatario, e)
+                    resultados[destinatario] = str(e)
+        finally:
+            connection.close()
+
+        return resultados
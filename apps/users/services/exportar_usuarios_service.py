@@ -0,0 +1,143 @@
+import csv
+import logging
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+
+from openpyxl import Workbook
+from django.conf import settings
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from apps.unidades.models.unidades import TipoGestaoChoices, TipoUnidadeChoices
+from apps.users.api.serializers.gestao_usuario_serializer import format_cpf
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+CABECALHO = [
+    "Perfil",
+    "RF",
+    "Nome",
+    "Data de solicitação",
+    "RF ou CPF",
+    "E-mail",
+    "Rede",
+    "Diretoria Regional",
+    "Unidade Educacional",
+    "Validado",
+    "Ativo",
+]
+
+CAMPOS = [
+    "pk",
+    "cargo__nome",
+    "username",
+    "name",
+    "date_joined",
+    "cpf",
+    "email",
+    "rede",
+    "is_validado",
+    "is_active",
+]
+
+
+class _Echo:
+    """ Buffer que apenas devolve o valor escrito, para o csv.writer gerar as linhas sob demanda. """
+
+    def write(self, value):
+        return value
+
+
+class ExportarUsuariosService:
+    """
+    Exporta a listagem da gestão de usuários em CSV ou XLSX.
+
+    O queryset é percorrido com cursor no servidor e projeção via values(); as unidades
+    de cada bloco de usuários são carregadas com uma única consulta na tabela de vínculo.
+    As colunas seguem as regras do GestaoUsuarioListaSerializer.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset.prefetch_related(None).order_by("pk").values(*CAMPOS)
+
+    def linhas(self):
+        """ Gera as linhas da planilha (sem cabeçalho), bloco a bloco. """
+
+        tamanho_bloco = settings.GESTAO_USUARIOS_EXPORTACAO_LOTE
+        usuarios = self.queryset.iterator(chunk_size=tamanho_bloco)
+
+        while bloco := list(islice(usuarios, tamanho_bloco)):
+            unidades = self._unidades_por_usuario([usuario["pk"] for usuario in bloco])
+            for usuario in bloco:
+                yield self._linha(usuario, unidades.get(usuario["pk"], []))
+
+    def gerar_csv(self):
+        """ Gera o CSV linha a linha, para uso com StreamingHttpResponse. """
+
+        writer = csv.writer(_Echo(), delimiter=";")
+        yield "\ufeff" + writer.writerow(CABECALHO)
+        for linha in self.linhas():
+            yield writer.writerow(linha)
+
+    def gerar_xlsx(self):
+        """ Gera o XLSX em modo write-only e devolve o arquivo temporário posicionado no início. """
+
+        workbook = Workbook(write_only=True)
+        planilha = workbook.create_sheet("Usuários")
+        planilha.append(CABECALHO)
+        for linha in self.linhas():
+            planilha.append(linha)
+
+        arquivo = SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+        workbook.save(arquivo)
+        arquivo.seek(0)
+        return arquivo
+
+    @staticmethod
+    def _unidades_por_usuario(pks):
+        """ Retorna user_id -> lista de (tipo_unidade, nome, nome da DRE), na ordem do codigo_eol. """
+
+        UsuarioUnidade = User.unidades.through
+        vinculos = (
+            UsuarioUnidade.objects
+            .filter(user_id__in=pks)
+            .order_by("user_id", "unidade_id")
+            .values_list("user_id", "unidade__tipo_unidade", "unidade__nome", "unidade__dre__nome")
+        )
+
+        unidades = {}
+        for user_id, tipo_unidade, nome, nome_dre in vinculos:
+            unidades.setdefault(user_id, []).append((tipo_unidade, nome, nome_dre))
+        return unidades
+
+    @staticmethod
+    def _linha(usuario, unidades):
+        dre = next((nome for tipo, nome, _ in unidades if tipo == TipoUnidadeChoices.DRE), None)
+        escola = next(
+            ((nome, nome_dre) for tipo, nome, nome_dre in unidades if tipo != TipoUnidadeChoices.DRE),
+            None,
+        )
+        if not dre and escola and escola[1]:
+            dre = escola[1]
+
+        data_solicitacao = usuario["date_joined"]
+        if data_solicitacao:
+            data_solicitacao = timezone.localtime(data_solicitacao).strftime("%d/%m/%Y")
+
+        rede = TipoGestaoChoices(usuario["rede"]).label if usuario["rede"] in TipoGestaoChoices.values else usuario["rede"]
+
+        return [
+            usuario["cargo__nome"],
+            usuario["username"],
+            usuario["name"],
+            data_solicitacao or "",
+            format_cpf(usuario["cpf"]) if usuario["cpf"] else usuario["username"] or "",
+            usuario["email"] or "",
+            rede or "-",
+            dre or "-",
+            escola[0] if escola else "-",
+            "Sim" if usuario["is_validado"] else "Não",
+            "Sim" if usuario["is_active"] else "Não",
+        ]
@@ -1,13 +1,52 @@
+import environ
+from auditlog.models import LogEntry
 from django.utils import timezone
 from django.db import transaction
+from django.contrib.auth import get_user_model
 
 from apps.helpers.exceptions import IntercorrenciasDeletionError
+from apps.users.auditoria import registrar_log
+from apps.users.authentication import invalidar_estado_usuarios
+from apps.users.cache_me import invalidar_me_usuarios
+from apps.users.revogacao import revogar_tokens_usuarios
+from apps.users.services.envia_email_service import EnviaEmailService
 from apps.users.services.intercorrencias_service import IntercorrenciasService
+from apps.users.services.usuario_core_sso_service import CriaUsuarioCoreSSOService
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+env = environ.Env()
+
+
+def _enviar_emails(mensagens, descricao) -> None:
+    """ Envia as notificações do lote por uma única conexão SMTP (por bloco), registrando as falhas. """
+    falhas = {
+        destinatario: erro
+        for destinatario, erro in EnviaEmailService.enviar_em_lote(mensagens).items()
+        if erro is not None
+    }
+    if falhas:
+        logger.warning("Falha ao enviar %s e-mail(s) de %s: %s", len(falhas), descricao, falhas)
+
+
+def _registrar_auditoria_em_lote(usuarios, valores: dict) -> None:
+    """
+    Registra no auditlog as alterações feitas via QuerySet.update(), que não
+    dispara os sinais de save. Nas requisições, as entradas são gravadas em lote
+    pelo AuditlogMiddleware, que também preenche o ator.
+    """
+    for usuario in usuarios:
+        changes = {
+            campo: [str(getattr(usuario, campo)), str(valor)]
+            for campo, valor in valores.items()
+            if getattr(usuario, campo) != valor
+        }
+        if changes:
+            registrar_log(usuario, LogEntry.Action.UPDATE, changes)
+
 
 class InativarUsuarioService:
 
@@ -33,7 +72,8 @@ class InativarUsuarioService:
                     "inativado_via_unidade",
                 ]
             )
-            
+            revogar_tokens_usuarios([usuario_a_ser_inativado.pk])
+
             try:
                 resultado = IntercorrenciasService.deletar_intercorrencias_usuario_inativo(
                     username=usuario_a_ser_inativado.username
@@ -85,4 +125,203 @@ class ReativarUsuarioService:
                 ]
             )
 
-        return usuario_a_ser_reativado
\ No newline at end of file
+        return usuario_a_ser_reativado
+
+
+class AprovarUsuariosEmLoteService:
+    """
+    Aprova vários usuários pendentes de uma só vez.
+
+    O provisionamento no CoreSSO é feito em paralelo, os usuários provisionados são
+    marcados como aprovados em um único UPDATE e os e-mails de aprovação são enviados
+    somente após o commit da transação. Os usuários devem chegar travados
+    (select_for_update), para que aprovações simultâneas não provisionem nem notifiquem
+    o mesmo usuário duas vezes.
+    """
+
+    def __init__(self, *, usuarios, usuario_responsavel):
+        self.usuarios = list(usuarios)
+        self.usuario_responsavel = usuario_responsavel
+
+    def executar(self) -> dict:
+        """ Retorna um dicionário uuid -> mensagem de erro (None quando aprovado). """
+
+        resultados = {}
+        pendentes = []
+
+        for usuario in self.usuarios:
+            if usuario.is_validado:
+                resultados[usuario.uuid] = "Usuário já está aprovado."
+            else:
+                pendentes.append(usuario)
+
+        erros_core_sso = CriaUsuarioCoreSSOService.cria_usuarios_core_sso_em_lote([
+            {
+                "login": usuario.username,
+                "nome": usuario.name,
+                "email": usuario.email,
+            }
+            for usuario in pendentes
+        ])
+
+        aprovados = []
+        for usuario in pendentes:
+            erro = erros_core_sso.get(usuario.username)
+            if erro:
+                logger.warning("Falha ao criar usuário %s no CoreSSO: %s", usuario.username, erro)
+                resultados[usuario.uuid] = "Erro ao criar o usuário no Core SSO."
+            else:
+                resultados[usuario.uuid] = None
+                aprovados.append(usuario)
+
+        if aprovados:
+            valores = {
+                "is_validado": True,
+                "is_core_sso": True,
+                "data_aprovacao": timezone.now(),
+                "responsavel_aprovacao": self.usuario_responsavel,
+            }
+            with transaction.atomic():
+                User.objects.filter(pk__in=[usuario.pk for usuario in aprovados]).update(**valores)
+                _registrar_auditoria_em_lote(aprovados, valores)
+                invalidar_me_usuarios([usuario.pk for usuario in aprovados])
+                transaction.on_commit(lambda: self._enviar_emails_aprovacao(aprovados))
+
+        return resultados
+
+    @staticmethod
+    def _enviar_emails_aprovacao(usuarios):
+        aplicacao_url = env("FRONTEND_URL")
+        senha = env("BASE_CORESSO_AUTH")
+        _enviar_emails(
+            [
+                {
+                    "destinatario": usuario.email,
+                    "assunto": "Seu acesso ao GIPE foi aprovado!",
+                    "template_html": "emails/cadastro_aprovado.html",
+                    "contexto": {
+                        "nome_usuario": usuario.name,
+                        "aplicacao_url": aplicacao_url,
+                        "senha": senha,
+                    },
+                }
+                for usuario in usuarios
+            ],
+            "aprovação",
+        )
+
+
+class InativarUsuariosEmLoteService:
+    """
+    Inativa vários usuários de uma só vez.
+
+    Segue a mesma ordem da inativação individual: os usuários são inativados em um
+    único UPDATE e, dentro da mesma transação, as intercorrências em preenchimento são
+    deletadas em paralelo. Os usuários cuja exclusão falhou voltam aos valores
+    anteriores (as instâncias em memória não são alteradas pelo UPDATE). Os e-mails de
+    inativação são enviados após o commit da transação.
+    """
+
+    CAMPOS = ["is_active", "data_inativacao", "responsavel_inativacao", "motivo_inativacao", "inativado_via_unidade"]
+
+    def __init__(self, *, usuarios, usuario_responsavel, motivo_inativacao):
+        self.usuarios = list(usuarios)
+        self.usuario_responsavel = usuario_responsavel
+        self.motivo_inativacao = motivo_inativacao
+
+    def executar(self) -> dict:
+        """ Retorna um dicionário uuid -> mensagem de erro (None quando inativado). """
+
+        resultados = {usuario.uuid: None for usuario in self.usuarios}
+        ativos = [usuario for usuario in self.usuarios if usuario.is_active]
+        if not ativos:
+            return resultados
+
+        valores = {
+            "is_active": False,
+            "data_inativacao": timezone.now(),
+            "responsavel_inativacao": self.usuario_responsavel,
+            "motivo_inativacao": self.motivo_inativacao,
+            "inativado_via_unidade": False,
+        }
+
+        with transaction.atomic():
+            User.objects.filter(pk__in=[usuario.pk for usuario in ativos]).update(**valores)
+
+            resultados_intercorrencias = IntercorrenciasService.deletar_intercorrencias_usuarios_inativos(
+                [usuario.username for usuario in ativos]
+            )
+
+            inativados, falhas = [], []
+            for usuario in ativos:
+                resultado = resultados_intercorrencias[usuario.username]
+                if resultado["success"]:
+                    inativados.append(usuario)
+                    continue
+
+                logger.warning(
+                    "Falha ao deletar intercorrências do usuário %s: %s",
+                    usuario.username, resultado.get("error")
+                )
+                resultados[usuario.uuid] = (
+                    f"Não foi possível inativar o usuário. {resultado.get('error')}"
+                )
+                falhas.append(usuario)
+
+            if falhas:
+                User.objects.bulk_update(falhas, self.CAMPOS)
+
+            if inativados:
+                ids = [usuario.pk for usuario in inativados]
+                _registrar_auditoria_em_lote(inativados, valores)
+                invalidar_estado_usuarios(ids)
+                invalidar_me_usuarios(ids)
+                revogar_tokens_usuarios(ids)
+                transaction.on_commit(lambda: self._enviar_emails_inativacao(inativados))
+
+        return resultados
+
+    def _enviar_emails_inativacao(self, usuarios):
+        _enviar_emails(
+            [
+                {
+                    "destinatario": usuario.email,
+                    "assunto": "Inativação de perfil no GIPE",
+                    "template_html": "emails/inativacao_usuario.html",
+                    "contexto": {
+                        "nome_usuario": usuario.name,
+                        "motivo_inativacao": self.motivo_inativacao,
+                    },
+                }
+                for usuario in usuarios
+            ],
+            "inativação",
+        )
+
+
+class ReativarUsuariosEmLoteService:
+    """ Reativa vários usuários de uma só vez, em um único UPDATE. """
+
+    def __init__(self, *, usuarios):
+        self.usuarios = list(usuarios)
+
+    def executar(self) -> dict:
+        """ Retorna um dicionário uuid -> mensagem de erro (None quando reativado). """
+
+        inativos = [usuario for usuario in self.usuarios if not usuario.is_active]
+
+        if inativos:
+            valores = {
+                "is_active": True,
+                "data_inativacao": None,
+                "responsavel_inativacao": None,
+                "motivo_inativacao": "",
+                "inativado_via_unidade": False,
+            }
+            with transaction.atomic():
+                User.objects.filter(pk__in=[usuario.pk for usuario in inativos]).update(**valores)
+                _registrar_auditoria_em_lote(inativos, valores)
+                invalidar_estado_usuarios([usuario.pk for usuario in inativos])
+                invalidar_me_usuarios([usuario.pk for usuario in inativos])
+
+        return {usuario.uuid: None for usuario in self.usuarios}
@@ -0,0 +1,392 @@
+import csv
+import re
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from openpyxl import load_workbook
+from auditlog.diff import model_instance_diff
+from auditlog.models import LogEntry
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.core.validators import validate_email
+from django.core.exceptions import ValidationError
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from apps.users.models import Cargo, StatusCoreSSOChoices, violou_email_unico
+from apps.helpers.exceptions import ImportacaoUsuariosException
+from apps.unidades.models.unidades import TipoGestaoChoices, TipoUnidadeChoices, Unidade
+from apps.users.services.sme_integracao_service import SmeIntegracaoService
+from apps.users.services.provisionamento_core_sso_service import ProvisionamentoCoreSSOService
+from apps.users.auditoria import registrar_log
+from apps.users.perfil import carregar_perfil_usuario
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+# Nome da coluna no arquivo -> campo interno
+COLUNAS = {
+    "rf": "username",
+    "username": "username",
+    "nome": "name",
+    "name": "name",
+    "cpf": "cpf",
+    "email": "email",
+    "e-mail": "email",
+    "cargo": "cargo",
+    "rede": "rede",
+    "unidades": "unidades",
+    "codigo_eol": "unidades",
+}
+
+COLUNAS_OBRIGATORIAS = {"username", "name", "cpf", "email", "cargo", "rede", "unidades"}
+
+
+class ImportarUsuariosService:
+    """
+    Importa usuários a partir de um arquivo CSV ou XLSX.
+
+    O arquivo é lido em streaming e processado em lotes (GESTAO_USUARIOS_IMPORTACAO_LOTE):
+    as validações de unicidade, cargos e unidades são feitas com consultas IN por lote,
+    a existência no CoreSSO (rede DIRETA) é consultada em paralelo, e os usuários e
+    vínculos com unidades são criados com bulk_create. Usuários da rede INDIRETA são
+    gravados como PENDENTE e provisionados no CoreSSO pela fila de tarefas após o commit.
+
+    Linhas inválidas não interrompem a importação: são devolvidas em `erros`.
+    """
+
+    def __init__(self, *, arquivo, usuario_responsavel):
+        self.arquivo = arquivo
+        self.usuario_responsavel = usuario_responsavel
+        self.erros = []
+        self.total_linhas = 0
+        self.total_importados = 0
+
+        # Unicidade dentro do próprio arquivo
+        self._usernames_arquivo = set()
+        self._cpfs_arquivo = set()
+        self._emails_arquivo = set()
+
+        self._dres_permitidas = None
+        if not usuario_responsavel.is_gipe:
+            self._dres_permitidas = carregar_perfil_usuario(usuario_responsavel).dres
+
+    def executar(self) -> dict:
+        tamanho_lote = settings.GESTAO_USUARIOS_IMPORTACAO_LOTE
+        maximo_linhas = settings.GESTAO_USUARIOS_IMPORTACAO_MAX_LINHAS
+        linhas = self._ler_linhas()
+
+        while lote := list(islice(linhas, min(tamanho_lote, maximo_linhas - self.total_linhas))):
+            self.total_linhas += len(lote)
+            self._processar_lote(lote)
+
+        if next(linhas, None):
+            self._erro(
+                maximo_linhas + 1,
+                f"Limite de {maximo_linhas} usuários por arquivo atingido. "
+                f"As linhas seguintes não foram importadas."
+            )
+
+        if not self.total_linhas:
+            raise ImportacaoUsuariosException("O arquivo não contém usuários para importar.")
+
+        logger.info(
+            "Importação de usuários por %s: %d de %d linha(s) importada(s).",
+            self.usuario_responsavel.username, self.total_importados, self.total_linhas
+        )
+
+        return {
+            "total_linhas": self.total_linhas,
+            "total_importados": self.total_importados,
+            "erros": sorted(self.erros, key=lambda erro: erro["linha"]),
+        }
+
+    # Leitura do arquivo
+
+    def _ler_linhas(self):
+        """ Gera tuplas (número da linha, dict campo -> valor) a partir do arquivo. """
+
+        nome = (getattr(self.arquivo, "name", "") or "").lower()
+
+        if nome.endswith(".csv"):
+            registros = self._ler_csv()
+        elif nome.endswith(".xlsx"):
+            registros = self._ler_xlsx()
+        else:
+            raise ImportacaoUsuariosException("Formato de arquivo inválido. Envie um arquivo .csv ou .xlsx.")
+
+        cabecalho = next(registros, None)
+        if not cabecalho:
+            raise ImportacaoUsuariosException("O arquivo não contém usuários para importar.")
+
+        campos = [COLUNAS.get(str(coluna or "").strip().lower()) for coluna in cabecalho]
+        faltantes = COLUNAS_OBRIGATORIAS - set(campos)
+        if faltantes:
+            raise ImportacaoUsuariosException(
+                f"Colunas obrigatórias ausentes: {', '.join(sorted(faltantes))}."
+            )
+
+        for numero, valores in enumerate(registros, start=2):
+            if not any(valores):
+                continue
+            yield numero, {
+                campo: str(valor).strip() if valor is not None else ""
+                for campo, valor in zip(campos, valores)
+                if campo
+            }
+
+    def _ler_csv(self):
+        texto = io.TextIOWrapper(self.arquivo, encoding="utf-8-sig", newline="")
+        amostra = texto.read(4096)
+        texto.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;")
+        except csv.Error:
+            dialeto = csv.excel
+        try:
+            yield from csv.reader(texto, dialeto)
+        finally:
+            texto.detach()
+
+    def _ler_xlsx(self):
+        try:
+            workbook = load_workbook(self.arquivo, read_only=True, data_only=True)
+        except Exception:
+            raise ImportacaoUsuariosException("Não foi possível ler o arquivo .xlsx enviado.")
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    # Processamento
+
+    def _erro(self, numero, mensagem):
+        self.erros.append({"linha": numero, "detail": mensagem})
+
+    def _processar_lote(self, lote):
+        linhas = []
+        for numero, dados in lote:
+            mensagem = self._normalizar(dados)
+            if mensagem:
+                self._erro(numero, mensagem)
+            else:
+                linhas.append((numero, dados))
+
+        linhas = self._validar_unicidade(linhas)
+        linhas = self._validar_cargos_e_unidades(linhas)
+        linhas = self._validar_core_sso(linhas)
+
+        if linhas:
+            self._criar_usuarios(linhas)
+
+    def _normalizar(self, dados):
+        """ Validações que dependem apenas da própria linha (mesmas regras do cadastro). """
+
+        dados["cpf"] = re.sub(r"\D", "", dados["cpf"])
+        dados["rede"] = dados["rede"].upper()
+        dados["unidades"] = [
+            codigo.strip() for codigo in re.split(r"[;,|]", dados["unidades"]) if codigo.strip()
+        ]
+
+        if len(dados["username"]) < 7:
+            return "O RF deve conter no mínimo 7 caracteres."
+        if not dados["name"]:
+            return "Campo nome é obrigatório!"
+        cpf = dados["cpf"]
+        if len(cpf) != 11 or cpf == cpf[0] * 11:
+            return "CPF informado é inválido!"
+        try:
+            validate_email(dados["email"])
+        except ValidationError:
+            return "E-mail inválido."
+        if not dados["email"].endswith("@sme.prefeitura.sp.gov.br"):
+            return "Utilize seu e-mail institucional."
+        if dados["rede"] not in TipoGestaoChoices.values:
+            return "Valor inválido para o campo rede."
+        if not dados["cargo"].isdigit():
+            return "Cargo inválido."
+        if not dados["unidades"]:
+            return "Campo unidades é obrigatório!"
+        return None
+
+    def _validar_unicidade(self, linhas):
+        """ Verifica RF, CPF e e-mail contra o arquivo e contra o banco com três consultas IN. """
+
+        usernames = {dados["username"] for _, dados in linhas}
+        cpfs = {dados["cpf"] for _, dados in linhas}
+        emails = {dados["email"] for _, dados in linhas}
+
+        usernames_existentes = set(
+            User.objects.filter(username__in=usernames).values_list("username", flat=True)
+        )
+        cpfs_existentes = set(User.objects.filter(cpf__in=cpfs).values_list("cpf", flat=True))
+        emails_existentes = set(
+            User.objects
+            .annotate(email_lower=Lower("email"))
+            .filter(email_lower__in={email.lower() for email in emails})
+            .exclude(email="")
+            .values_list("email_lower", flat=True)
+        )
+
+        validas = []
+        for numero, dados in linhas:
+            if dados["username"] in usernames_existentes or dados["username"] in self._usernames_arquivo:
+                self._erro(numero, "Já existe um usuário cadastrado com este RF.")
+            elif dados["cpf"] in cpfs_existentes or dados["cpf"] in self._cpfs_arquivo:
+                self._erro(numero, "Já existe um usuário cadastrado com este CPF.")
+            elif dados["email"].lower() in emails_existentes or dados["email"].lower() in self._emails_arquivo:
+                self._erro(numero, "Este e-mail já está cadastrado.")
+            else:
+                validas.append((numero, dados))
+
+            self._usernames_arquivo.add(dados["username"])
+            self._cpfs_arquivo.add(dados["cpf"])
+            self._emails_arquivo.add(dados["email"].lower())
+
+        return validas
+
+    def _validar_cargos_e_unidades(self, linhas):
+        cargos = Cargo.objects.in_bulk({int(dados["cargo"]) for _, dados in linhas})
+        unidades = Unidade.objects.only("codigo_eol", "tipo_unidade", "dre_id").in_bulk(
+            {codigo for _, dados in linhas for codigo in dados["unidades"]}
+        )
+
+        validas = []
+        for numero, dados in linhas:
+            cargo = cargos.get(int(dados["cargo"]))
+            if not cargo:
+                self._erro(numero, "Cargo inválido.")
+                continue
+
+            codigos_invalidos = [codigo for codigo in dados["unidades"] if codigo not in unidades]
+            if codigos_invalidos:
+                self._erro(numero, f"Unidade inválida: {', '.join(codigos_invalidos)}.")
+                continue
+
+            unidades_linha = [unidades[codigo] for codigo in dados["unidades"]]
+            if self._dres_permitidas is not None and not all(
+                (
+                    unidade.codigo_eol
+                    if unidade.tipo_unidade == TipoUnidadeChoices.DRE
+                    else unidade.dre_id
+                ) in self._dres_permitidas
+                for unidade in unidades_linha
+            ):
+                self._erro(numero, "Ponto Focal só pode cadastrar usuários para unidades de sua DRE.")
+                continue
+
+            dados["cargo"] = cargo
+            dados["unidades"] = unidades_linha
+            validas.append((numero, dados))
+
+        return validas
+
+    def _validar_core_sso(self, linhas):
+        """ Rede DIRETA: o usuário precisa existir no CoreSSO (consultas em paralelo). """
+
+        diretas = [dados for _, dados in linhas if dados["rede"] == TipoGestaoChoices.DIRETA]
+        if not diretas:
+            return linhas
+
+        def _consultar(dados):
+            try:
+                return dados["username"], bool(
+                    SmeIntegracaoService.usuario_core_sso_or_none(login=dados["username"])
+                )
+            except Exception:
+                return dados["username"], None
+
+        max_workers = min(settings.CORESSO_MAX_WORKERS, len(diretas))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            encontrados = dict(executor.map(_consultar, diretas))
+
+        validas = []
+        for numero, dados in linhas:
+            if dados["rede"] == TipoGestaoChoices.DIRETA:
+                encontrado = encontrados[dados["username"]]
+                if encontrado is None:
+                    self._erro(numero, "Não foi possível validar o usuário no momento. Tente novamente mais tarde.")
+                    continue
+                if not encontrado:
+                    self._erro(numero, "Usuário não encontrado no CoreSSO.")
+                    continue
+
+            validas.append((numero, dados))
+
+        return validas
+
+    def _criar_usuarios(self, linhas):
+        """
+        Grava o lote num savepoint. Se outro cadastro concorrente violar a unicidade de
+        RF, CPF ou e-mail entre a validação e o insert, o lote é regravado linha a linha
+        para que só as linhas em conflito sejam devolvidas como erro.
+        """
+        try:
+            with transaction.atomic():
+                novos = self._inserir(linhas)
+        except IntegrityError:
+            novos = []
+            for numero, dados in linhas:
+                try:
+                    with transaction.atomic():
+                        novos += self._inserir([(numero, dados)])
+                except IntegrityError as e:
+                    if violou_email_unico(e):
+                        self._erro(numero, "Este e-mail já está cadastrado.")
+                    else:
+                        self._erro(numero, "Já existe um usuário cadastrado com este RF ou CPF.")
+
+        indiretos = [usuario for usuario in novos if usuario.rede == TipoGestaoChoices.INDIRETA]
+        if indiretos:
+            transaction.on_commit(lambda: _agendar_provisionamento(indiretos))
+
+        self.total_importados += len(novos)
+
+    def _inserir(self, linhas):
+        senha_inutilizavel = make_password(None)
+
+        novos = User.objects.bulk_create([
+            User(
+                username=dados["username"],
+                name=dados["name"],
+                cpf=dados["cpf"],
+                email=dados["email"],
+                cargo=dados["cargo"],
+                rede=dados["rede"],
+                is_validado=True,
+                status_core_sso=(
+                    StatusCoreSSOChoices.PENDENTE if dados["rede"] == TipoGestaoChoices.INDIRETA else ""
+                ),
+                password=senha_inutilizavel,
+            )
+            for _, dados in linhas
+        ])
+
+        UsuarioUnidade = User.unidades.through
+        UsuarioUnidade.objects.bulk_create([
+            UsuarioUnidade(user_id=usuario.pk, unidade_id=unidade.pk)
+            for usuario, (_, dados) in zip(novos, linhas, strict=True)
+            for unidade in dados["unidades"]
+        ])
+
+        # bulk_create não dispara os sinais do auditlog
+        for usuario in novos:
+            registrar_log(usuario, LogEntry.Action.CREATE, model_instance_diff(None, usuario))
+
+        return novos
+
+
+def _agendar_provisionamento(usuarios):
+    """
+    Enfileira o provisionamento no CoreSSO dos usuários importados. Se o processo cair
+    antes disso, os usuários continuam PENDENTE e são reenfileirados pelo comando
+    reprocessar_core_sso.
+    """
+    with transaction.atomic():
+        for usuario in usuarios:
+            ProvisionamentoCoreSSOService.agendar(usuario)
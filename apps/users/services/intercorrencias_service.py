@@ -1,5 +1,6 @@
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -15,13 +16,14 @@ class IntercorrenciasService:
     TIMEOUT = 30  # segundos
     
     @classmethod
-    def deletar_intercorrencias_usuario_inativo(cls, username: str) -> dict:
+    def deletar_intercorrencias_usuario_inativo(cls, username: str, session=None) -> dict:
         """
         Solicita ao microserviço de intercorrências que delete as intercorrências
         em preenchimento de um usuário inativado.
         
         Args:
             username: Username do usuário inativado
+            session: requests.Session opcional, para reaproveitar conexões
             
         Returns:
             dict com resultado da operação
@@ -40,7 +42,7 @@ class IntercorrenciasService:
         try:
             logger.info(f"Solicitando exclusão de intercorrências do usuário: {username}")
             
-            response = requests.post(
+            response = (session or requests).post(
                 url,
                 json=payload,
                 headers=headers,
@@ -133,4 +135,32 @@ class IntercorrenciasService:
                 'data': None,
                 'error': error_msg,
                 'error_type': 'UNEXPECTED_ERROR'
-            }
\ No newline at end of file
+            }
+
+    @classmethod
+    def deletar_intercorrencias_usuarios_inativos(cls, usernames: list[str]) -> dict:
+        """
+        Deleta as intercorrências em preenchimento de vários usuários inativados.
+
+        O microserviço recebe um usuário por chamada, então as requisições são feitas
+        em paralelo (INTERCORRENCIAS_MAX_WORKERS) compartilhando o pool de conexões.
+
+        Returns:
+            dict username -> resultado no mesmo formato de deletar_intercorrencias_usuario_inativo
+        """
+        if not usernames:
+            return {}
+
+        max_workers = min(settings.INTERCORRENCIAS_MAX_WORKERS, len(usernames))
+
+        with requests.Session() as session:
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                resultados = executor.map(
+                    lambda username: cls.deletar_intercorrencias_usuario_inativo(username, session=session),
+                    usernames,
+                )
+                return dict(zip(usernames, resultados, strict=True))
@@ -0,0 +1,108 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.users.models import User, StatusCoreSSOChoices
+from apps.helpers.exceptions import CargaUsuarioException
+from apps.users.services.usuario_core_sso_service import CriaUsuarioCoreSSOService
+from apps.tarefas.services.fila_tarefas_service import enfileirar
+
+logger = logging.getLogger(__name__)
+
+TAREFA_PROVISIONAR = "users.provisionar_core_sso"
+
+
+def _dados_core_sso(usuario) -> dict:
+    return {"login": usuario.username, "nome": usuario.name, "email": usuario.email}
+
+
+class ProvisionamentoCoreSSOService:
+    """
+    Provisionamento de usuários no CoreSSO fora da requisição que os criou.
+
+    O usuário é gravado como PENDENTE e provisionado pela fila de tarefas, que retenta
+    com backoff; o resultado fica em status_core_sso (PROVISIONADO, ou FALHA quando as
+    tentativas da tarefa se esgotam). A fila é o único caminho de provisionamento: o
+    comando reprocessar_core_sso apenas devolve à fila as falhas e as pendências que
+    ficaram para trás.
+    """
+
+    @classmethod
+    def agendar(cls, usuario) -> None:
+        """
+        Enfileira o provisionamento na transação corrente (executado após o commit).
+        Há uma única tarefa por usuário: se ela já terminou, volta para a fila.
+        """
+        enfileirar(
+            TAREFA_PROVISIONAR,
+            chave_idempotencia=f"core_sso:{usuario.uuid}",
+            reabrir=True,
+            usuario_id=usuario.pk,
+        )
+
+    @classmethod
+    def provisionar(cls, pk) -> bool:
+        """
+        Provisiona o usuário no CoreSSO e registra o resultado. Retorna True em caso de sucesso.
+        Em caso de falha o usuário continua PENDENTE, com o erro em erro_core_sso, até a
+        fila esgotar as tentativas (ver registrar_falha_definitiva).
+        """
+        usuario = User.objects.only("username", "name", "email", "status_core_sso").filter(pk=pk).first()
+        if usuario is None:
+            logger.warning("Usuário %s não encontrado para provisionamento no CoreSSO.", pk)
+            return False
+
+        if usuario.status_core_sso == StatusCoreSSOChoices.PROVISIONADO:
+            return True
+
+        try:
+            CriaUsuarioCoreSSOService.cria_usuario_core_sso(_dados_core_sso(usuario), atualiza_flag_local=False)
+        except CargaUsuarioException as e:
+            logger.warning("Falha ao provisionar o usuário %s no CoreSSO: %s", usuario.username, e)
+            User.objects.filter(pk=pk).update(erro_core_sso=str(e))
+            return False
+
+        User.objects.filter(pk=pk).update(
+            status_core_sso=StatusCoreSSOChoices.PROVISIONADO, erro_core_sso="", is_core_sso=True
+        )
+        return True
+
+    @staticmethod
+    def registrar_falha_definitiva(usuario_id) -> None:
+        """ Chamado pela fila quando a tarefa de provisionamento esgota as tentativas. """
+        User.objects.filter(pk=usuario_id).exclude(status_core_sso=StatusCoreSSOChoices.PROVISIONADO).update(
+            status_core_sso=StatusCoreSSOChoices.FALHA
+        )
+
+    @classmethod
+    def reprocessar(cls, limite=None) -> int:
+        """
+        Devolve à fila os usuários com falha e os pendentes há mais de
+        CORESSO_PROVISIONAMENTO_PENDENTE_MINUTOS minutos. Retorna quantos foram enfileirados.
+        """
+        pendentes_ate = timezone.now() - timedelta(minutes=settings.CORESSO_PROVISIONAMENTO_PENDENTE_MINUTOS)
+        usuarios = (
+            User.objects
+            .filter(
+                Q(status_core_sso=StatusCoreSSOChoices.FALHA)
+                | Q(status_core_sso=StatusCoreSSOChoices.PENDENTE, date_joined__lt=pendentes_ate)
+            )
+            .only("pk", "uuid")
+            .order_by("pk")
+        )
+        if limite:
+            usuarios = usuarios[:limite]
+
+        usuarios = list(usuarios)
+        with transaction.atomic():
+            User.objects.filter(pk__in=[usuario.pk for usuario in usuarios]).update(
+                status_core_sso=StatusCoreSSOChoices.PENDENTE
+            )
+            for usuario in usuarios:
+                cls.agendar(usuario)
+
+        return len(usuarios)
@@ -0,0 +1,98 @@
+import logging
+from datetime import timedelta
+
+from auditlog.models import LogEntry
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TABELA_ARQUIVO = "auditlog_logentry_arquivo"
+
+# Colunas da tabela de arquivo (criada com LIKE na migration 0013). São listadas
+# explicitamente para que colunas novas ou reordenadas em versões futuras do auditlog
+# não desloquem os valores arquivados.
+COLUNAS_ARQUIVO = (
+    "id", "content_type_id", "object_pk", "object_id", "object_repr", "serialized_data",
+    "action", "changes_text", "changes", "actor_id", "cid", "remote_addr", "remote_port",
+    "timestamp", "additional_data", "actor_email",
+)
+_COLUNAS = ", ".join(f'"{coluna}"' for coluna in COLUNAS_ARQUIVO)
+_COLUNAS_ENTRADA = ", ".join(f'entrada."{coluna}"' for coluna in COLUNAS_ARQUIVO)
+
+# O lote é escolhido pela ordem de id, que acompanha o timestamp, e travado com
+# SKIP LOCKED para não disputar linhas com uma execução concorrente. O CTE
+# materializado garante que a seleção (com LIMIT) seja avaliada uma única vez.
+_LOTE = f"""
+    lote AS MATERIALIZED (
+        SELECT id FROM {LogEntry._meta.db_table}
+        WHERE "timestamp" < %s
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+_ARQUIVAR_LOTE = f"""
+    WITH {_LOTE},
+    movidas AS (
+        DELETE FROM {LogEntry._meta.db_table} entrada
+        USING lote WHERE entrada.id = lote.id
+        RETURNING {_COLUNAS_ENTRADA}
+    )
+    INSERT INTO {TABELA_ARQUIVO} ({_COLUNAS}) SELECT {_COLUNAS} FROM movidas
+"""
+
+_APAGAR_LOTE = f"""
+    WITH {_LOTE}
+    DELETE FROM {LogEntry._meta.db_table} entrada
+    USING lote WHERE entrada.id = lote.id
+"""
+
+
+class RetencaoAuditoriaService:
+    """
+    Aplica a retenção do auditlog: entradas com mais de `dias` dias são movidas para
+    a tabela de arquivo (ou apagadas, com apagar=True).
+
+    Cada lote é processado numa transação curta, de modo que a tabela principal não
+    fica travada durante toda a execução e o autovacuum acompanha as exclusões.
+    """
+
+    def __init__(self, *, dias=None, tamanho_lote=None, apagar=False, dry_run=False):
+        self.dias = dias if dias is not None else settings.AUDITLOG_RETENCAO_DIAS
+        self.tamanho_lote = tamanho_lote or settings.AUDITLOG_RETENCAO_LOTE
+        self.apagar = apagar
+        self.dry_run = dry_run
+
+    def executar(self) -> dict:
+        limite = timezone.now() - timedelta(days=self.dias)
+
+        if self.dry_run:
+            total = LogEntry.objects.filter(timestamp__lt=limite).count()
+            return {"limite": limite, "processadas": total, "lotes": 0}
+
+        sql = _APAGAR_LOTE if self.apagar else _ARQUIVAR_LOTE
+        processadas = 0
+        lotes = 0
+
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, [limite, self.tamanho_lote])
+                quantidade = cursor.rowcount
+
+            if not quantidade:
+                break
+
+            processadas += quantidade
+            lotes += 1
+            logger.info(
+                "Auditlog: %s entrada(s) %s (lote %s).",
+                quantidade, "apagadas" if self.apagar else "arquivadas", lotes,
+            )
+
+            if quantidade < self.tamanho_lote:
+                break
+
+        return {"limite": limite, "processadas": processadas, "lotes": lotes}
@@ -1,4 +1,7 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
 from rest_framework import serializers
 from requests import ConnectTimeout, ReadTimeout
 
@@ -16,19 +19,28 @@ class CriaUsuarioCoreSSOService:
     """
 
     @classmethod
-    def cria_usuario_core_sso(cls, dados_usuario: dict) -> None:
-        """ Verifica se o usuário já existe no CoreSSO e cria se não existir. """
+    def cria_usuario_core_sso(cls, dados_usuario: dict, atualiza_flag_local: bool = True) -> None:
+        """
+        Verifica se o usuário já existe no CoreSSO e cria se não existir.
+
+        Com `atualiza_flag_local=False` apenas as chamadas ao CoreSSO são feitas,
+        cabendo ao chamador marcar `is_core_sso` no DB local.
+        """
 
         try:
             login = dados_usuario.get("login")
             if user_core_sso := cls._usuario_existe(login):
                 logger.info("Usuário já cadastrado no CoreSSO %s.", login)
                 cls._adiciona_perfil_guide_core_sso(login=login)
-                cls._adiciona_flag_core_sso(login=login)
+                if atualiza_flag_local:
+                    cls._adiciona_flag_core_sso(login=login)
                 return user_core_sso
 
             dados_validados = cls._validar_dados(dados_usuario)
-            cls._criar_usuario(dados_validados)
+            if atualiza_flag_local:
+                cls._criar_usuario(dados_validados)
+            else:
+                cls._registrar_usuario(dados_validados)
 
             logger.info("Usuário criado no CoreSSO %s.", dados_validados["login"])
 
@@ -50,6 +62,29 @@ class CriaUsuarioCoreSSOService:
             logger.exception("Erro inesperado ao criar/atualizar usuário %s", dados_usuario["login"])
             raise CargaUsuarioException(f"Erro inesperado: {str(e)}")
 
+    @classmethod
+    def cria_usuarios_core_sso_em_lote(cls, lista_dados_usuarios: list[dict]) -> dict[str, str | None]:
+        """
+        Cria/atualiza vários usuários no CoreSSO em paralelo.
+
+        As chamadas não tocam o DB local; retorna um dicionário login -> mensagem de
+        erro (ou None quando o usuário foi provisionado com sucesso).
+        """
+
+        if not lista_dados_usuarios:
+            return {}
+
+        def _provisionar(dados_usuario):
+            try:
+                cls.cria_usuario_core_sso(dados_usuario, atualiza_flag_local=False)
+                return dados_usuario["login"], None
+            except Exception as e:
+                return dados_usuario["login"], str(e)
+
+        max_workers = min(settings.CORESSO_MAX_WORKERS, len(lista_dados_usuarios))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(executor.map(_provisionar, lista_dados_usuarios))
+
     @classmethod
     def remover_perfil_usuario_core_sso(cls, login: str) -> None:
         """
@@ -140,11 +175,17 @@ class CriaUsuarioCoreSSOService:
     def _criar_usuario(cls, dados_usuario: dict) -> None:
         """ Cria o usuário no CoreSSO. """
 
+        cls._registrar_usuario(dados_usuario)
+        cls._adiciona_flag_core_sso(login=dados_usuario["login"])
+
+    @classmethod
+    def _registrar_usuario(cls, dados_usuario: dict) -> None:
+        """ Cria o usuário e atribui o perfil no CoreSSO, sem alterar o DB local. """
+
         SmeIntegracaoService.cria_usuario_core_sso(
             login=dados_usuario["login"],
             nome=dados_usuario["nome"],
             email=dados_usuario["email"]
         )
 
-        cls._adiciona_perfil_guide_core_sso(login=dados_usuario["login"])
-        cls._adiciona_flag_core_sso(login=dados_usuario["login"])
\ No newline at end of file
+        cls._adiciona_perfil_guide_core_sso(login=dados_usuario["login"])
\ No newline at end of file
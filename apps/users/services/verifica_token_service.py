@@ -0,0 +1,61 @@
+import time
+import hashlib
+
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.exceptions import TokenError
+
+from apps.users.revogacao import token_revogado
+
+TOKEN_VALIDO_CACHE_KEY = "users:token_valido:{}"
+
+
+def _token_cache_key(token) -> str:
+    return TOKEN_VALIDO_CACHE_KEY.format(hashlib.sha256(token.encode()).hexdigest())
+
+
+class VerificaTokenService:
+    """
+    Verificação de access tokens para os serviços que consomem a API.
+
+    Tokens válidos têm as claims guardadas em cache até a expiração, de modo que
+    verificações repetidas do mesmo token não decodificam nem validam a assinatura
+    novamente. A lista de revogação é consultada sempre, inclusive nos acertos de cache.
+    """
+
+    @staticmethod
+    def verificar(token: str) -> dict:
+        return VerificaTokenService.verificar_em_lote([token])[0]
+
+    @staticmethod
+    def verificar_em_lote(tokens) -> list:
+        """
+        Retorna, na ordem recebida, {"valido": True, "claims": {...}} ou
+        {"valido": False, "detail": "..."} para cada token.
+        """
+        chaves = {token: _token_cache_key(token) for token in tokens}
+        em_cache = cache.get_many(list(chaves.values()))
+
+        verificados = {}
+        agora = time.time()
+
+        for token, chave in chaves.items():
+            claims = em_cache.get(chave)
+
+            if claims is None:
+                try:
+                    claims = UntypedToken(token).payload
+                except TokenError as exc:
+                    verificados[token] = {"valido": False, "detail": str(exc)}
+                    continue
+
+                ttl = int(claims.get("exp", agora) - agora)
+                if ttl > 0:
+                    cache.set(chave, claims, ttl)
+
+            if token_revogado(claims):
+                verificados[token] = {"valido": False, "detail": "Token revogado."}
+            else:
+                verificados[token] = {"valido": True, "claims": claims}
+
+        return [verificados[token] for token in tokens]
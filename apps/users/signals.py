@@ -0,0 +1,44 @@
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_save, post_delete
+
+from apps.users.models import Cargo
+from apps.unidades.models.unidades import Unidade
+from apps.users.authentication import invalidar_estado_usuarios
+from apps.users.cache_me import invalidar_me_catalogo, invalidar_me_usuarios
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid="users_invalidar_estado_post_save")
+@receiver(post_delete, sender=User, dispatch_uid="users_invalidar_estado_post_delete")
+def invalidar_estado_usuario(sender, instance, **kwargs):
+    """ Mantém o estado usado pela autenticação JWT coerente com o banco. """
+    invalidar_estado_usuarios([instance.pk])
+    invalidar_me_usuarios([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.unidades.through, dispatch_uid="users_invalidar_perfil_unidades")
+def invalidar_perfil_unidades(sender, instance, action, reverse, pk_set, **kwargs):
+    """ Descarta o perfil e o /me em cache quando os vínculos usuário x unidade mudam. """
+
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == "pre_clear":
+        user_ids = list(instance.usuarios.values_list("pk", flat=True))
+    else:
+        user_ids = list(pk_set)
+
+    invalidar_me_usuarios(user_ids)
+
+
+@receiver(post_save, sender=Unidade, dispatch_uid="users_invalidar_me_unidade_post_save")
+@receiver(post_delete, sender=Unidade, dispatch_uid="users_invalidar_me_unidade_post_delete")
+@receiver(post_save, sender=Cargo, dispatch_uid="users_invalidar_me_cargo_post_save")
+@receiver(post_delete, sender=Cargo, dispatch_uid="users_invalidar_me_cargo_post_delete")
+def invalidar_me_catalogo_alterado(sender, **kwargs):
+    """ Nome, sigla e DRE das unidades e o nome do cargo fazem parte da resposta de /me. """
+    invalidar_me_catalogo()
@@ -0,0 +1,10 @@
+from apps.tarefas.registro import tarefa
+from apps.helpers.exceptions import CargaUsuarioException
+from apps.users.services.provisionamento_core_sso_service import TAREFA_PROVISIONAR, ProvisionamentoCoreSSOService
+
+
+@tarefa(TAREFA_PROVISIONAR, ao_esgotar=ProvisionamentoCoreSSOService.registrar_falha_definitiva)
+def provisionar_core_sso(usuario_id):
+    # O erro já fica registrado no usuário; a exceção faz a fila retentar com backoff
+    if not ProvisionamentoCoreSSOService.provisionar(usuario_id):
+        raise CargaUsuarioException(f"Falha ao provisionar o usuário {usuario_id} no CoreSSO.")
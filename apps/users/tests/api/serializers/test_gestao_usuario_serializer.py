@@ -4,7 +4,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
-from apps.users.models import Cargo
+from apps.users.models import Cargo, StatusCoreSSOChoices
 
 from apps.users.api.serializers.gestao_usuario_serializer import (
     GestaoUsuarioSerializer,
@@ -809,9 +809,9 @@ def test_create_usuario_pf_nao_admin(api_rf, user_pf_admin, cargo_comum, escola_
     assert user.is_app_admin is False
 
 @pytest.mark.django_db
-@patch("apps.users.api.serializers.gestao_usuario_serializer.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
-def test_create_indireta_chama_core_sso(
-    mock_core, api_rf, user_gipe_admin, cargo_comum, escola_sp
+@patch("apps.users.api.serializers.gestao_usuario_serializer.ProvisionamentoCoreSSOService.agendar")
+def test_create_indireta_agenda_core_sso(
+    mock_agendar, api_rf, user_gipe_admin, cargo_comum, escola_sp
 ):
     request = api_rf.post("/fake/")
     request.user = user_gipe_admin
@@ -830,9 +830,36 @@ def test_create_indireta_chama_core_sso(
         context={"request": request}
     )
 
-    serializer.create(data)
+    user = serializer.create(data)
+
+    mock_agendar.assert_called_once_with(user)
+    user.refresh_from_db()
+    assert user.status_core_sso == StatusCoreSSOChoices.PENDENTE
+    assert user.is_core_sso is False
+
+
+@pytest.mark.django_db
+@patch("apps.users.api.serializers.gestao_usuario_serializer.ProvisionamentoCoreSSOService.agendar")
+def test_create_direta_nao_agenda_core_sso(
+    mock_agendar, api_rf, user_gipe_admin, cargo_comum, escola_sp
+):
+    request = api_rf.post("/fake/")
+    request.user = user_gipe_admin
+
+    data = {
+        "username": "novo8888",
+        "name": "Novo",
+        "email": "novo.direta@sme.prefeitura.sp.gov.br",
+        "cpf": "32132132132",
+        "cargo": cargo_comum,
+        "rede": TipoGestaoChoices.DIRETA,
+        "unidades": [escola_sp],
+    }
+
+    user = GestaoUsuarioSerializer(context={"request": request}).create(data)
 
-    mock_core.assert_called_once()
+    mock_agendar.assert_not_called()
+    assert user.status_core_sso == ""
 
 @pytest.mark.django_db
 @patch("apps.users.api.serializers.gestao_usuario_serializer.User.objects.create_user")
@@ -0,0 +1,35 @@
+import pytest
+from auditlog.models import LogEntry
+
+from apps.users.api.serializers.historico_serializer import HistoricoUsuarioSerializer
+
+
+@pytest.mark.django_db
+class TestHistoricoUsuarioSerializer:
+
+    def test_mudancas_em_todos_os_formatos(self):
+        entrada = LogEntry(
+            action=LogEntry.Action.UPDATE,
+            changes={
+                "name": ["Antigo", "Novo"],
+                "unidades": {"type": "m2m", "operation": "delete", "objects": ["Escola (200237)"]},
+                "perfis": {"type": "m2m", "operation": "clear"},
+                "inesperado": "valor solto",
+                "lista": ["a", "b", "c"],
+            },
+        )
+
+        mudancas = HistoricoUsuarioSerializer().get_mudancas(entrada)
+
+        assert mudancas == [
+            {"campo": "name", "de": "Antigo", "para": "Novo"},
+            {"campo": "unidades", "operacao": "delete", "objetos": ["Escola (200237)"]},
+            {"campo": "perfis", "operacao": "clear", "objetos": []},
+            {"campo": "inesperado", "valor": "valor solto"},
+            {"campo": "lista", "valor": ["a", "b", "c"]},
+        ]
+
+    def test_entrada_sem_mudancas(self):
+        entrada = LogEntry(action=LogEntry.Action.CREATE, changes=None)
+
+        assert HistoricoUsuarioSerializer().get_mudancas(entrada) == []
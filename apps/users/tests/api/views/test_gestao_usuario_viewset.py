@@ -1,8 +1,11 @@
 import pytest
 import uuid
+from django.db import connection, transaction
 from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from unittest.mock import patch
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import status
 
 from apps.unidades.models.unidades import TipoGestaoChoices
@@ -240,6 +243,21 @@ def test_retrieve_gipe_admin_ve_qualquer_usuario(
     assert response.data["username"] == "usuario_dre_sp"
 
 
+@pytest.mark.django_db
+def test_retrieve_resolve_nome_do_responsavel_pela_inativacao(
+    api_client, user_gipe_admin, usuario_inativo
+):
+    """O nome do responsável vem anotado na consulta do próprio usuário."""
+    User.objects.create(username="ADMIN001", cpf="55566677788", name="Admin Responsável")
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    with patch.object(User.objects, "only", side_effect=AssertionError("consulta extra")):
+        response = api_client.get(f"/api/users/gestao-usuarios/{usuario_inativo.uuid}/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["responsavel_inativacao_nome"] == "Admin Responsável"
+
+
 @pytest.mark.django_db
 def test_retrieve_pf_admin_nao_ve_usuario_de_outra_dre(
     api_client, user_pf_admin, usuario_dre_outra
@@ -522,6 +540,125 @@ def test_inativar_usuario_com_sucesso(
         )
 
 
+@pytest.mark.django_db
+def test_inativar_usuario_com_idempotency_key_repete_a_primeira_resposta(
+    api_client,
+    user_gipe_admin,
+    usuario_validado,
+    django_capture_on_commit_callbacks,
+):
+    """Repetições com a mesma Idempotency-Key não executam a inativação de novo."""
+    api_client.force_authenticate(user=user_gipe_admin)
+    url = f"/api/users/gestao-usuarios/{usuario_validado.uuid}/inativar/"
+    headers = {"HTTP_IDEMPOTENCY_KEY": str(uuid.uuid4())}
+
+    with patch(
+        "apps.users.services.gestao_usuario_service.InativarUsuarioService.inativar"
+    ) as mock_inativar:
+        with django_capture_on_commit_callbacks(execute=True):
+            primeira = api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+        repetida = api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+        outro_conteudo = api_client.post(url, data={"motivo_inativacao": "Outro"}, **headers)
+
+    assert primeira.status_code == repetida.status_code == status.HTTP_200_OK
+    assert repetida.data == primeira.data
+    assert repetida["Idempotent-Replayed"] == "true"
+    assert outro_conteudo.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_inativar.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_inativar_usuario_idempotency_key_em_andamento_retorna_409(
+    api_client,
+    user_gipe_admin,
+    usuario_validado,
+):
+    """Enquanto a primeira resposta não é confirmada, repetições recebem 409."""
+    api_client.force_authenticate(user=user_gipe_admin)
+    url = f"/api/users/gestao-usuarios/{usuario_validado.uuid}/inativar/"
+    headers = {"HTTP_IDEMPOTENCY_KEY": str(uuid.uuid4())}
+
+    with patch(
+        "apps.users.services.gestao_usuario_service.InativarUsuarioService.inativar"
+    ) as mock_inativar:
+        api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+        repetida = api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+
+    assert repetida.status_code == status.HTTP_409_CONFLICT
+    mock_inativar.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_inativar_usuario_erro_500_libera_idempotency_key(
+    api_client,
+    user_gipe_admin,
+    usuario_validado,
+):
+    """Após um erro 5xx a mesma Idempotency-Key pode ser usada em nova tentativa."""
+    api_client.force_authenticate(user=user_gipe_admin)
+    url = f"/api/users/gestao-usuarios/{usuario_validado.uuid}/inativar/"
+    headers = {"HTTP_IDEMPOTENCY_KEY": str(uuid.uuid4())}
+
+    with patch(
+        "apps.users.api.views.gestao_usuario_viewset.InativarUsuarioService.inativar",
+        side_effect=[Exception("boom"), None],
+    ) as mock_inativar:
+        falha = api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+        nova_tentativa = api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+
+    assert falha.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert nova_tentativa.status_code == status.HTTP_200_OK
+    assert mock_inativar.call_count == 2
+
+
+@pytest.mark.django_db
+def test_inativar_usuario_rollback_libera_idempotency_key(
+    api_client,
+    user_gipe_admin,
+    usuario_validado,
+):
+    """Se a ação marca a transação para rollback, a chave é liberada em vez de ficar em andamento."""
+    api_client.force_authenticate(user=user_gipe_admin)
+    url = f"/api/users/gestao-usuarios/{usuario_validado.uuid}/inativar/"
+    headers = {"HTTP_IDEMPOTENCY_KEY": str(uuid.uuid4())}
+
+    def _inativar_e_reverter(**kwargs):
+        if mock_inativar.call_count == 1:
+            transaction.set_rollback(True)
+
+    with patch(
+        "apps.users.api.views.gestao_usuario_viewset.InativarUsuarioService.inativar",
+        side_effect=_inativar_e_reverter,
+    ) as mock_inativar:
+        revertida = api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+        nova_tentativa = api_client.post(url, data={"motivo_inativacao": "Teste"}, **headers)
+
+    assert revertida.status_code == status.HTTP_200_OK
+    assert nova_tentativa.status_code == status.HTTP_200_OK
+    assert mock_inativar.call_count == 2
+
+
+@pytest.mark.django_db
+def test_inativar_usuario_cache_indisponivel_executa_sem_idempotency_key(
+    api_client,
+    user_gipe_admin,
+    usuario_validado,
+):
+    """Com o cache fora do ar (add retorna None), a ação é executada normalmente."""
+    api_client.force_authenticate(user=user_gipe_admin)
+    url = f"/api/users/gestao-usuarios/{usuario_validado.uuid}/inativar/"
+
+    with patch("apps.helpers.idempotencia.cache.add", return_value=None), patch(
+        "apps.users.services.gestao_usuario_service.InativarUsuarioService.inativar"
+    ) as mock_inativar:
+        response = api_client.post(
+            url, data={"motivo_inativacao": "Teste"}, HTTP_IDEMPOTENCY_KEY=str(uuid.uuid4())
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_inativar.assert_called_once()
+
+
 @pytest.mark.django_db
 def test_inativar_usuario_inexistente_retorna_404(
     api_client,
@@ -859,4 +996,380 @@ def test_consultar_core_sso_erro_inesperado_retorna_400(api_client, user_gipe_ad
         )
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert response.data["detail"] == "Falha na integração"
\ No newline at end of file
+    assert response.data["detail"] == "Falha na integração"
+
+@pytest.mark.django_db
+@patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+@patch("apps.users.services.usuario_core_sso_service.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+def test_aprovar_em_lote_com_sucesso(
+    mock_cria_usuario,
+    mock_envia_email,
+    api_client,
+    user_gipe_admin,
+    usuario_nao_validado,
+    usuario_validado,
+    django_capture_on_commit_callbacks,
+):
+    """Aprova os pendentes do lote e informa o resultado de cada usuário."""
+    api_client.force_authenticate(user=user_gipe_admin)
+    uuid_inexistente = str(uuid.uuid4())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            "/api/users/gestao-usuarios/aprovar-em-lote/",
+            {"uuids": [str(usuario_nao_validado.uuid), str(usuario_validado.uuid), uuid_inexistente]},
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["detail"] == "1 de 3 usuário(s) processado(s) com sucesso."
+
+    resultados = {item["uuid"]: item for item in response.data["resultados"]}
+    assert resultados[str(usuario_nao_validado.uuid)]["sucesso"] is True
+    assert resultados[str(usuario_validado.uuid)]["detail"] == "Usuário já está aprovado."
+    assert resultados[uuid_inexistente]["detail"] == "Usuário não encontrado."
+
+    usuario_nao_validado.refresh_from_db()
+    assert usuario_nao_validado.is_validado is True
+    assert usuario_nao_validado.responsavel_aprovacao == str(user_gipe_admin)
+
+    mock_cria_usuario.assert_called_once()
+    mock_envia_email.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch("apps.users.services.usuario_core_sso_service.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+def test_aprovar_em_lote_pf_admin_usuario_de_outra_dre(
+    mock_cria_usuario, api_client, user_pf_admin, usuario_nao_validado, escola_outra
+):
+    """PF admin recebe erro de permissão para usuários fora da sua DRE."""
+    usuario_nao_validado.unidades.clear()
+    usuario_nao_validado.unidades.add(escola_outra)
+
+    api_client.force_authenticate(user=user_pf_admin)
+
+    response = api_client.post(
+        "/api/users/gestao-usuarios/aprovar-em-lote/",
+        {"uuids": [str(usuario_nao_validado.uuid)]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["resultados"][0]["sucesso"] is False
+    assert response.data["resultados"][0]["detail"] == (
+        "Você não tem permissão para acessar ou editar este usuário."
+    )
+    mock_cria_usuario.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+@patch("apps.users.services.usuario_core_sso_service.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+def test_aprovar_em_lote_trava_os_usuarios(
+    mock_cria_usuario, mock_envia_email, api_client, user_pf_admin, usuario_nao_validado
+):
+    """Os usuários do lote são lidos com FOR UPDATE, inclusive no escopo do PF (com DISTINCT)."""
+    api_client.force_authenticate(user=user_pf_admin)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post(
+            "/api/users/gestao-usuarios/aprovar-em-lote/",
+            {"uuids": [str(usuario_nao_validado.uuid)]},
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["resultados"][0]["sucesso"] is True
+    assert any(
+        'FOR UPDATE OF "users_user"' in query["sql"] for query in queries.captured_queries
+    )
+
+
+@pytest.mark.django_db
+@patch("apps.users.api.views.gestao_usuario_viewset.EnviaEmailService.enviar")
+@patch("apps.users.api.views.gestao_usuario_viewset.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+def test_aprovar_trava_o_usuario(mock_cria_usuario, mock_envia_email, api_client, user_gipe_admin, usuario_nao_validado):
+    """A aprovação individual lê o usuário com FOR UPDATE."""
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post(f"/api/users/gestao-usuarios/{usuario_nao_validado.uuid}/aprovar/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert any("FOR UPDATE" in query["sql"] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "payload",
+    [{}, {"uuids": []}, {"uuids": "nao-e-lista"}, {"uuids": ["uuid-invalido"]}],
+)
+def test_aprovar_em_lote_payload_invalido_retorna_400(api_client, user_gipe_admin, payload):
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    response = api_client.post("/api/users/gestao-usuarios/aprovar-em-lote/", payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_aprovar_em_lote_acima_do_limite_retorna_400(api_client, user_gipe_admin, settings):
+    settings.GESTAO_USUARIOS_LOTE_MAXIMO = 2
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    response = api_client.post(
+        "/api/users/gestao-usuarios/aprovar-em-lote/",
+        {"uuids": [str(uuid.uuid4()) for _ in range(3)]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["detail"] == "Informe no máximo 2 usuários por requisição."
+
+
+@pytest.mark.django_db
+def test_aprovar_em_lote_usuario_comum_negado(api_client, user_comum, usuario_nao_validado):
+    api_client.force_authenticate(user=user_comum)
+
+    response = api_client.post(
+        "/api/users/gestao-usuarios/aprovar-em-lote/",
+        {"uuids": [str(usuario_nao_validado.uuid)]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+@patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+@patch(
+    "apps.users.services.gestao_usuario_service.IntercorrenciasService"
+    ".deletar_intercorrencias_usuarios_inativos"
+)
+def test_inativar_em_lote_com_sucesso(
+    mock_intercorrencias,
+    mock_envia_email,
+    api_client,
+    user_gipe_admin,
+    usuario_dre_sp,
+    usuario_dre_outra,
+    django_capture_on_commit_callbacks,
+):
+    """Inativa os usuários do lote e informa falhas nas intercorrências."""
+    mock_intercorrencias.return_value = {
+        usuario_dre_sp.username: {"success": True, "data": {}, "error": None},
+        usuario_dre_outra.username: {"success": False, "data": None, "error": "Timeout"},
+    }
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            "/api/users/gestao-usuarios/inativar-em-lote/",
+            {
+                "uuids": [str(usuario_dre_sp.uuid), str(usuario_dre_outra.uuid)],
+                "motivo_inativacao": "Fim do contrato",
+            },
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["detail"] == "1 de 2 usuário(s) processado(s) com sucesso."
+    assert response.data["resultados"][1]["detail"] == "Não foi possível inativar o usuário. Timeout"
+
+    usuario_dre_sp.refresh_from_db()
+    usuario_dre_outra.refresh_from_db()
+    assert usuario_dre_sp.is_active is False
+    assert usuario_dre_sp.responsavel_inativacao == str(user_gipe_admin)
+    assert usuario_dre_outra.is_active is True
+    mock_envia_email.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_inativar_em_lote_sem_motivo_retorna_400(api_client, user_gipe_admin, usuario_dre_sp):
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    response = api_client.post(
+        "/api/users/gestao-usuarios/inativar-em-lote/",
+        {"uuids": [str(usuario_dre_sp.uuid)]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["detail"] == "Motivo inativação é obrigatória para executar a inativação."
+
+
+@pytest.mark.django_db
+@patch(
+    "apps.users.services.gestao_usuario_service.IntercorrenciasService"
+    ".deletar_intercorrencias_usuarios_inativos"
+)
+def test_inativar_em_lote_pf_admin_usuario_de_outra_dre(
+    mock_intercorrencias, api_client, user_pf_admin, usuario_dre_outra
+):
+    mock_intercorrencias.return_value = {}
+    api_client.force_authenticate(user=user_pf_admin)
+
+    response = api_client.post(
+        "/api/users/gestao-usuarios/inativar-em-lote/",
+        {"uuids": [str(usuario_dre_outra.uuid)], "motivo_inativacao": "Teste"},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["resultados"][0]["sucesso"] is False
+    usuario_dre_outra.refresh_from_db()
+    assert usuario_dre_outra.is_active is True
+
+
+@pytest.mark.django_db
+def test_reativar_em_lote_com_sucesso(api_client, user_gipe_admin, usuario_inativo):
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    response = api_client.post(
+        "/api/users/gestao-usuarios/reativar-em-lote/",
+        {"uuids": [str(usuario_inativo.uuid)]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["resultados"][0]["detail"] == "Usuário reativado com sucesso."
+
+    usuario_inativo.refresh_from_db()
+    assert usuario_inativo.is_active is True
+    assert usuario_inativo.data_inativacao is None
+
+
+@pytest.mark.django_db
+def test_importar_usuarios_csv(api_client, user_pf_admin, cargo_comum, escola_sp):
+    """PF admin importa usuários da sua DRE via arquivo CSV."""
+    conteudo = (
+        "rf,nome,cpf,email,cargo,rede,unidades\n"
+        "1234567,Fulano,39053344705,fulano@sme.prefeitura.sp.gov.br,9999,INDIRETA,200237\n"
+    ).encode("utf-8")
+
+    api_client.force_authenticate(user=user_pf_admin)
+
+    response = api_client.post(
+        "/api/users/gestao-usuarios/importar/",
+        {"arquivo": SimpleUploadedFile("usuarios.csv", conteudo, content_type="text/csv")},
+        format="multipart",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["detail"] == "1 de 1 usuário(s) importado(s) com sucesso."
+    assert response.data["erros"] == []
+    assert User.objects.filter(username="1234567", unidades=escola_sp).exists()
+
+
+@pytest.mark.django_db
+def test_importar_usuarios_sem_arquivo_retorna_400(api_client, user_gipe_admin):
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    response = api_client.post("/api/users/gestao-usuarios/importar/", {}, format="multipart")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["detail"] == "Campo arquivo é obrigatório!"
+
+
+@pytest.mark.django_db
+def test_importar_usuarios_usuario_comum_negado(api_client, user_comum):
+    api_client.force_authenticate(user=user_comum)
+
+    response = api_client.post("/api/users/gestao-usuarios/importar/", {}, format="multipart")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_exportar_csv_pf_admin_somente_sua_dre(
+    api_client, user_pf_admin, usuario_dre_sp, usuario_dre_outra
+):
+    api_client.force_authenticate(user=user_pf_admin)
+
+    response = api_client.get("/api/users/gestao-usuarios/exportar/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert "attachment" in response["Content-Disposition"]
+
+    conteudo = b"".join(response.streaming_content).decode("utf-8")
+    assert usuario_dre_sp.username in conteudo
+    assert usuario_dre_outra.username not in conteudo
+
+
+@pytest.mark.django_db
+def test_exportar_xlsx(api_client, user_gipe_admin, usuario_dre_sp):
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    response = api_client.get("/api/users/gestao-usuarios/exportar/?formato=xlsx")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Disposition"].endswith('.xlsx"')
+    assert b"".join(response.streaming_content)[:2] == b"PK"
+
+
+@pytest.mark.django_db
+def test_exportar_formato_invalido_retorna_400(api_client, user_gipe_admin):
+    api_client.force_authenticate(user=user_gipe_admin)
+
+    response = api_client.get("/api/users/gestao-usuarios/exportar/?formato=pdf")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_exportar_usuario_comum_negado(api_client, user_comum):
+    api_client.force_authenticate(user=user_comum)
+
+    response = api_client.get("/api/users/gestao-usuarios/exportar/")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_historico_paginado_por_cursor(
+    api_client, user_gipe_admin, usuario_dre_sp, dre_outra, django_capture_on_commit_callbacks
+):
+    api_client.force_authenticate(user=user_gipe_admin)
+    url = f"/api/users/gestao-usuarios/{usuario_dre_sp.uuid}/"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.patch(url, {"name": "Nome Alterado"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    dre_outra.usuarios.add(usuario_dre_sp)
+
+    response = api_client.get(f"{url}historico/?page_size=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["previous"] is None
+    primeira, segunda = response.data["results"]
+    assert primeira["mudancas"] == [
+        {"campo": "unidades", "operacao": "add", "objetos": ["DRE Outra (999999)"]}
+    ]
+    assert segunda["acao"] == "update"
+    assert segunda["responsavel"]["username"] == user_gipe_admin.username
+    assert {"campo": "name", "de": "", "para": "Nome Alterado"} in segunda["mudancas"]
+
+    response = api_client.get(response.data["next"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [entrada["acao"] for entrada in response.data["results"]][-1] == "create"
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_historico_pf_admin_usuario_de_outra_dre(api_client, user_pf_admin, usuario_dre_outra):
+    api_client.force_authenticate(user=user_pf_admin)
+
+    response = api_client.get(f"/api/users/gestao-usuarios/{usuario_dre_outra.uuid}/historico/")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_historico_usuario_comum_negado(api_client, user_comum):
+    api_client.force_authenticate(user=user_comum)
+
+    response = api_client.get(f"/api/users/gestao-usuarios/{user_comum.uuid}/historico/")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -5,6 +5,7 @@ from django.db import IntegrityError, DatabaseError
 
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 from apps.users.models import User, Cargo
 from apps.unidades.models.unidades import Unidade
@@ -532,4 +533,34 @@ class TestValidarOuVincularUnidade:
 
         assert user.unidades.count() == 1
         assert user.unidades.first().nome == unidade.nome
-        assert int(user.unidades.first().codigo_eol) == unidade.codigo_eol
\ No newline at end of file
+        assert int(user.unidades.first().codigo_eol) == unidade.codigo_eol
+
+
+@pytest.mark.django_db
+class TestLoginQueries:
+
+    @patch("apps.users.api.views.login_viewset.CargosService.get_cargo_permitido")
+    @patch("apps.users.api.views.login_viewset.AutenticacaoService.autentica")
+    def test_login_quantidade_de_consultas(
+        self, mock_autentica, mock_cargo_permitido, cargo_diretor, escola_sp, django_assert_max_num_queries
+    ):
+        usuario = User.objects.create_user(username="1234567", cargo=cargo_diretor)
+        usuario.unidades.add(escola_sp)
+        mock_autentica.return_value = {
+            "nome": "Diretor",
+            "email": "diretor@sme.prefeitura.sp.gov.br",
+            "numeroDocumento": "33333333333",
+        }
+        mock_cargo_permitido.return_value = {"codigo": 3360, "nome": "Diretor de Escola"}
+
+        request = APIRequestFactory().post(
+            "/api/login", {"username": usuario.username, LOGIN_PASS_FIELD: DUMMY_PASS}, format="json"
+        )
+
+        # Inclui savepoints e a consulta do auditlog para o diff do usuário
+        with django_assert_max_num_queries(16):
+            response = LoginView.as_view()(request)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["unidade_lotacao"] == [{"codigo": "200237", "nomeUnidade": escola_sp.nome}]
+        assert AccessToken(response.data["token"])["codigo_unidade_eol"] == "200237"
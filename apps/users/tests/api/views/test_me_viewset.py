@@ -6,11 +6,15 @@ from rest_framework import status
 from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from django.db import connection
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 
-from apps.users.models import Cargo, User
+from apps.users.models import Cargo
 from apps.users.api.views.me_viewset import MeView
+from apps.users.cache_me import obter_versao_me, ME_VERSAO_CATALOGO_CACHE_KEY
 from apps.unidades.models.unidades import Unidade, TipoUnidadeChoices
 
 User = get_user_model()
@@ -162,4 +166,79 @@ def test_get_user_inativo(api_client, cargo, django_user_model):
     response = api_client.get("/api/users/me")
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
-    assert response.data["detail"] == "Não autenticado."
\ No newline at end of file
+    assert response.data["detail"] == "Não autenticado."
+
+def consultas(queries):
+    """ Consultas executadas, sem os savepoints do ATOMIC_REQUESTS. """
+    return [q["sql"] for q in queries.captured_queries if "SAVEPOINT" not in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestMeViewCache:
+
+    @pytest.fixture(autouse=True)
+    def _limpa_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_segunda_chamada_nao_consulta_banco(self, api_client, user_with_unidade):
+        api_client.force_authenticate(user=user_with_unidade)
+
+        with CaptureQueriesContext(connection) as queries:
+            primeira = api_client.get("/api/users/me")
+        # usuário + unidades com a DRE
+        assert len(consultas(queries)) == 2
+
+        with CaptureQueriesContext(connection) as queries:
+            segunda = api_client.get("/api/users/me")
+        assert consultas(queries) == []
+
+        assert segunda.status_code == status.HTTP_200_OK
+        assert segunda.data == primeira.data
+        assert segunda["ETag"] == primeira["ETag"]
+
+    def test_if_none_match_retorna_304(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        etag = api_client.get("/api/users/me")["ETag"]
+
+        response = api_client.get("/api/users/me", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_alteracao_de_unidade_muda_versao(self, api_client, user_with_unidade, unidade, dre):
+        api_client.force_authenticate(user=user_with_unidade)
+        etag = api_client.get("/api/users/me")["ETag"]
+
+        unidade.nome = "Unidade Renomeada"
+        unidade.save()
+
+        response = api_client.get("/api/users/me", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["unidades"][0]["ue"]["nome"] == "Unidade Renomeada"
+
+        etag = response["ETag"]
+        user_with_unidade.unidades.remove(unidade)
+
+        response = api_client.get("/api/users/me", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["unidades"] == []
+
+    def test_versao_gravada_por_outro_worker_prevalece(self, user):
+        get_many = cache.get_many
+        leituras = []
+
+        def get_many_com_concorrencia(chaves):
+            resultado = get_many(chaves)
+            if not leituras:
+                # Outro worker grava a versão logo após a primeira leitura
+                cache.set(ME_VERSAO_CATALOGO_CACHE_KEY, "outroworker", None)
+            leituras.append(chaves)
+            return resultado
+
+        with patch.object(cache, "get_many", side_effect=get_many_com_concorrencia):
+            versao = obter_versao_me(user.pk)
+
+        assert versao.endswith("-outroworker")
+        assert obter_versao_me(user.pk) == versao
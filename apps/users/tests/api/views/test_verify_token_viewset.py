@@ -1,6 +1,7 @@
 import pytest
 import importlib
 
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import AccessToken
@@ -17,6 +18,13 @@ def valid_token():
     return str(AccessToken.for_user(type("User", (), {"id": 1})()))
 
 
+@pytest.fixture(autouse=True)
+def _limpa_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.mark.django_db
 class TestVerifyTokenFlexibleView:
 
@@ -26,6 +34,7 @@ class TestVerifyTokenFlexibleView:
         response = api_client.post(self.endpoint, {"token": valid_token}, format="json")
         assert response.status_code == status.HTTP_200_OK
         assert response.data["detail"] == "Token válido."
+        assert response.data["claims"]["user_id"] == 1
 
     def test_token_ausente(self, api_client):
         response = api_client.post(self.endpoint, {}, format="json")
@@ -59,4 +68,45 @@ class TestVerifyTokenFlexibleView:
 
         response = api_client.post(self.endpoint, {}, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "Token ausente" in response.data["detail"]
\ No newline at end of file
+        assert "Token ausente" in response.data["detail"]
+
+
+@pytest.mark.django_db
+class TestVerifyTokenLoteView:
+
+    endpoint = "/api/users/verify-token/lote"
+
+    @pytest.fixture(autouse=True)
+    def _token_interno(self, settings, api_client):
+        settings.INTERNAL_SERVICE_TOKEN = "token-interno"
+        api_client.credentials(HTTP_X_INTERNAL_SERVICE_TOKEN="token-interno")
+
+    def test_verifica_varios_tokens(self, api_client, valid_token):
+        response = api_client.post(self.endpoint, {"tokens": [valid_token, "aaa.bbb.ccc"]}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        valido, invalido = response.data["resultados"]
+        assert valido["valido"] is True
+        assert valido["claims"]["user_id"] == 1
+        assert invalido["valido"] is False
+
+    def test_exige_token_interno(self, api_client, valid_token):
+        api_client.credentials()
+
+        response = api_client.post(self.endpoint, {"tokens": [valid_token]}, format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.parametrize("tokens", [None, [], "token", [""], [123]])
+    def test_lista_invalida(self, api_client, tokens):
+        response = api_client.post(self.endpoint, {"tokens": tokens}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_limite_de_tokens(self, api_client, settings, valid_token):
+        settings.VERIFY_TOKEN_LOTE_MAXIMO = 1
+
+        response = api_client.post(self.endpoint, {"tokens": [valid_token, valid_token]}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"] == "Informe no máximo 1 tokens por requisição."
@@ -0,0 +1,145 @@
+import pytest
+from unittest.mock import patch
+from auditlog.models import LogEntry
+from auditlog.registry import auditlog
+from django.db import connection, transaction
+from django.core.exceptions import ImproperlyConfigured
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.users.models import Cargo
+from apps.users.middleware import AuditlogMiddleware
+from apps.users.auditoria import auditoria_em_lote, verificar_registros_auditoria
+
+
+def limpar_logs_das_fixtures():
+    LogEntry.objects.all().delete()
+
+
+def inserts_de_log(queries):
+    return [q for q in queries if q["sql"].startswith('INSERT INTO "auditlog_logentry"')]
+
+
+@pytest.mark.django_db
+class TestAuditoriaEmLote:
+
+    def test_fora_do_lote_grava_imediatamente(self, user_comum):
+        user_comum.name = "Outro Nome"
+        user_comum.save()
+
+        assert LogEntry.objects.get_for_object(user_comum).filter(action=LogEntry.Action.UPDATE).exists()
+
+    def test_grava_apos_commit_em_um_unico_insert(
+        self, user_comum, usuario_nao_validado, user_gipe_admin, django_capture_on_commit_callbacks
+    ):
+        limpar_logs_das_fixtures()
+
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                with auditoria_em_lote(actor=user_gipe_admin, remote_addr="10.0.0.1"):
+                    for usuario in (user_comum, usuario_nao_validado):
+                        usuario.name = "Alterado"
+                        usuario.save(update_fields=["name"])
+
+                assert not LogEntry.objects.filter(action=LogEntry.Action.UPDATE).exists()
+
+        assert len(inserts_de_log(queries.captured_queries)) == 1
+
+        entradas = LogEntry.objects.filter(action=LogEntry.Action.UPDATE)
+        assert set(entradas.values_list("object_pk", flat=True)) == {
+            str(user_comum.pk), str(usuario_nao_validado.pk)
+        }
+        assert set(entradas.values_list("actor_id", flat=True)) == {user_gipe_admin.pk}
+        assert set(entradas.values_list("remote_addr", flat=True)) == {"10.0.0.1"}
+        assert entradas.first().changes["name"][1] == "Alterado"
+
+    def test_save_sem_alteracao_nao_gera_log(self, user_comum, django_capture_on_commit_callbacks):
+        limpar_logs_das_fixtures()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with auditoria_em_lote():
+                user_comum.save(update_fields=["name", "email"])
+
+        assert not LogEntry.objects.filter(action=LogEntry.Action.UPDATE).exists()
+
+    def test_alteracao_desfeita_nao_gera_log(self, user_comum, django_capture_on_commit_callbacks):
+        limpar_logs_das_fixtures()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with auditoria_em_lote():
+                try:
+                    with transaction.atomic():
+                        user_comum.name = "Desfeito"
+                        user_comum.save()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+        assert not LogEntry.objects.filter(action=LogEntry.Action.UPDATE).exists()
+
+    @patch(
+        "apps.users.services.gestao_usuario_service.IntercorrenciasService"
+        ".deletar_intercorrencias_usuarios_inativos"
+    )
+    @patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+    def test_requisicao_grava_logs_com_ator(
+        self,
+        mock_envia_email,
+        mock_intercorrencias,
+        api_client,
+        user_gipe_admin,
+        usuario_dre_sp,
+        usuario_dre_outra,
+        django_capture_on_commit_callbacks,
+    ):
+        mock_intercorrencias.return_value = {
+            usuario.username: {"success": True, "data": {}, "error": None}
+            for usuario in (usuario_dre_sp, usuario_dre_outra)
+        }
+        api_client.force_authenticate(user=user_gipe_admin)
+        limpar_logs_das_fixtures()
+
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                response = api_client.post(
+                    "/api/users/gestao-usuarios/inativar-em-lote/",
+                    {
+                        "uuids": [str(usuario_dre_sp.uuid), str(usuario_dre_outra.uuid)],
+                        "motivo_inativacao": "Fim do contrato",
+                    },
+                    format="json",
+                )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(inserts_de_log(queries.captured_queries)) == 1
+        entradas = LogEntry.objects.filter(action=LogEntry.Action.UPDATE)
+        assert entradas.count() == 2
+        assert set(entradas.values_list("actor_id", flat=True)) == {user_gipe_admin.pk}
+
+    def test_alteracao_de_unidades_pelo_lado_da_unidade(self, user_comum, usuario_nao_validado, escola_sp):
+        escola_sp.usuarios.add(usuario_nao_validado)
+        limpar_logs_das_fixtures()
+
+        escola_sp.usuarios.clear()
+
+        entradas = LogEntry.objects.filter(action=LogEntry.Action.UPDATE)
+        assert set(entradas.values_list("object_pk", flat=True)) == {
+            str(user_comum.pk), str(usuario_nao_validado.pk)
+        }
+        assert entradas.first().changes["unidades"] == {
+            "type": "m2m", "operation": "delete", "objects": [str(escola_sp)]
+        }
+
+
+class TestRegistrosAuditoria:
+
+    def test_models_registrados_pelo_lote(self):
+        verificar_registros_auditoria()
+
+    def test_model_registrado_direto_no_auditlog_impede_inicializacao(self):
+        auditlog.register(Cargo)
+        try:
+            with pytest.raises(ImproperlyConfigured, match="users.Cargo"):
+                AuditlogMiddleware(lambda request: None)
+        finally:
+            auditlog.unregister(Cargo)
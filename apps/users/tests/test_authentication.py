@@ -0,0 +1,95 @@
+import pytest
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from apps.users.api.views.login_viewset import LoginView
+from apps.users.authentication import ClaimsJWTAuthentication, UsuarioToken, invalidar_estado_usuarios
+
+User = get_user_model()
+
+
+def token_login(user):
+    """Access token com as mesmas claims emitidas no login."""
+    return AccessToken(LoginView()._generate_token(user)["access"])
+
+
+@pytest.fixture(autouse=True)
+def _limpa_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestClaimsJWTAuthentication:
+
+    def test_usuario_montado_pelas_claims_sem_consultas(self, user_pf_admin, django_assert_num_queries):
+        token = token_login(user_pf_admin)
+        autenticacao = ClaimsJWTAuthentication()
+        autenticacao.get_user(token)
+
+        with django_assert_num_queries(0):
+            usuario = autenticacao.get_user(token)
+            assert isinstance(usuario, UsuarioToken)
+            assert usuario.pk == user_pf_admin.pk
+            assert usuario.username == "pf_admin"
+            assert usuario.uuid == str(user_pf_admin.uuid)
+            assert usuario.is_authenticated is True
+            assert usuario.is_app_admin is True
+            assert usuario.is_ponto_focal is True
+            assert usuario.is_gipe is False
+            assert str(usuario) == "pf_admin"
+
+    def test_atributo_fora_das_claims_carrega_usuario(self, user_pf_admin, dre_sp, django_assert_num_queries):
+        usuario = ClaimsJWTAuthentication().get_user(token_login(user_pf_admin))
+
+        with django_assert_num_queries(2):
+            assert list(usuario.unidades.all()) == [dre_sp]
+
+        assert isinstance(usuario, User)
+
+    def test_usuario_inativo_e_recusado(self, user_comum):
+        token = token_login(user_comum)
+        autenticacao = ClaimsJWTAuthentication()
+        autenticacao.get_user(token)
+
+        user_comum.is_active = False
+        user_comum.save(update_fields=["is_active"])
+
+        with pytest.raises(AuthenticationFailed):
+            autenticacao.get_user(token)
+
+    def test_alteracao_via_update_exige_invalidacao(self, user_comum, cargo_gipe):
+        token = token_login(user_comum)
+        autenticacao = ClaimsJWTAuthentication()
+        assert autenticacao.get_user(token).is_gipe is False
+
+        User.objects.filter(pk=user_comum.pk).update(cargo=cargo_gipe, is_app_admin=True)
+        invalidar_estado_usuarios([user_comum.pk])
+
+        usuario = autenticacao.get_user(token)
+        assert usuario.is_gipe is True
+        assert usuario.is_app_admin is True
+
+    def test_usuario_removido(self, user_comum):
+        token = token_login(user_comum)
+        user_comum.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            ClaimsJWTAuthentication().get_user(token)
+
+    def test_token_sem_claims_usa_fluxo_padrao(self, user_comum):
+        usuario = ClaimsJWTAuthentication().get_user(AccessToken.for_user(user_comum))
+
+        assert type(usuario) is User
+        assert usuario.pk == user_comum.pk
+
+    def test_requisicao_autenticada_com_token_do_login(self, api_client, user_gipe_admin, user_comum):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token_login(user_gipe_admin)}")
+
+        response = api_client.get("/api/users/gestao-usuarios/")
+
+        assert response.status_code == 200
+        assert user_comum.username in {item["username"] for item in response.data}
@@ -57,4 +57,58 @@ class TestEnviaEmailService:
         # Patch no método email.send para lançar uma exceção genérica
         with patch('django.core.mail.EmailMessage.send', side_effect=Exception("Erro inesperado")):
             with pytest.raises(RuntimeError, match="Erro inesperado ao enviar e-mail."):
-                EnviaEmailService.enviar(**email_data)
\ No newline at end of file
+                EnviaEmailService.enviar(**email_data)
+
+@pytest.mark.django_db
+class TestEnviaEmailServiceEmLote:
+    @staticmethod
+    def _mensagem(destinatario):
+        return {
+            "destinatario": destinatario,
+            "assunto": "Teste de envio",
+            "template_html": "emails/exemplo.html",
+            "contexto": {"nome": destinatario},
+        }
+
+    def test_envia_todas_as_mensagens(self):
+        mail.outbox = []
+
+        resultados = EnviaEmailService.enviar_em_lote(
+            [self._mensagem("a@example.com"), self._mensagem("b@example.com")]
+        )
+
+        assert resultados == {"a@example.com": None, "b@example.com": None}
+        assert [email.to for email in mail.outbox] == [["a@example.com"], ["b@example.com"]]
+        assert "b@example.com" in mail.outbox[1].body
+
+    def test_abre_uma_conexao_por_bloco(self):
+        mensagens = [self._mensagem(f"u{i}@example.com") for i in range(5)]
+
+        with patch(
+            "apps.users.services.envia_email_service.get_connection",
+            side_effect=lambda: mail.get_connection(),
+        ) as mock_get_connection:
+            resultados = EnviaEmailService.enviar_em_lote(mensagens, tamanho_lote=2)
+
+        assert mock_get_connection.call_count == 3
+        assert all(erro is None for erro in resultados.values())
+
+    def test_falha_de_um_destinatario_nao_interrompe_o_lote(self):
+        mail.outbox = []
+
+        resultados = EnviaEmailService.enviar_em_lote(
+            [self._mensagem(""), self._mensagem("b@example.com")]
+        )
+
+        assert resultados[""] is not None
+        assert resultados["b@example.com"] is None
+        assert len(mail.outbox) == 1
+
+    def test_falha_na_conexao_marca_todo_o_bloco(self):
+        with patch("django.core.mail.backends.locmem.EmailBackend.open", side_effect=OSError("recusada")):
+            resultados = EnviaEmailService.enviar_em_lote(
+                [self._mensagem("a@example.com"), self._mensagem("b@example.com")]
+            )
+
+        assert set(resultados) == {"a@example.com", "b@example.com"}
+        assert all("recusada" in erro for erro in resultados.values())
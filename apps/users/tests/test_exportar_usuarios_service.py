@@ -0,0 +1,58 @@
+import io
+import pytest
+from openpyxl import load_workbook
+from django.contrib.auth import get_user_model
+
+from apps.users.services.exportar_usuarios_service import CABECALHO, ExportarUsuariosService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestExportarUsuariosService:
+
+    def test_linhas_seguem_regras_da_listagem(self, user_comum, usuario_dre_sp, escola_sp, dre_sp):
+        usuario_dre_sp.unidades.add(escola_sp)
+
+        linhas = {
+            linha[1]: linha
+            for linha in ExportarUsuariosService(User.objects.all()).linhas()
+        }
+
+        comum = linhas[user_comum.username]
+        assert comum[3] != ""
+        assert comum[7] == dre_sp.nome
+        assert comum[8] == escola_sp.nome
+        assert comum[10] == "Sim"
+
+        dre = linhas[usuario_dre_sp.username]
+        assert dre[4] == "666.666.666-66"
+        assert dre[6] == "Direta"
+        assert dre[7] == dre_sp.nome
+
+    def test_consultas_por_bloco(
+        self, settings, django_assert_num_queries, user_comum, usuario_dre_sp, usuario_dre_outra
+    ):
+        settings.GESTAO_USUARIOS_EXPORTACAO_LOTE = 2
+
+        # 1 consulta de usuários (cursor) + 1 de unidades por bloco
+        with django_assert_num_queries(3):
+            linhas = list(ExportarUsuariosService(User.objects.all()).linhas())
+
+        assert len(linhas) == 3
+
+    def test_gerar_csv(self, user_comum):
+        conteudo = "".join(ExportarUsuariosService(User.objects.all()).gerar_csv())
+
+        cabecalho, linha, _ = conteudo.split("\r\n")
+        assert cabecalho == "\ufeff" + ";".join(CABECALHO)
+        assert user_comum.username in linha
+
+    def test_gerar_xlsx(self, user_comum):
+        arquivo = ExportarUsuariosService(User.objects.all()).gerar_xlsx()
+
+        planilha = load_workbook(io.BytesIO(arquivo.read())).active
+        linhas = list(planilha.iter_rows(values_only=True))
+
+        assert list(linhas[0]) == CABECALHO
+        assert linhas[1][1] == user_comum.username
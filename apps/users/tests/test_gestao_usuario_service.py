@@ -2,13 +2,18 @@ import pytest
 from unittest.mock import patch
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 
 from apps.users.services.gestao_usuario_service import (
     InativarUsuarioService,
     ReativarUsuarioService,
+    AprovarUsuariosEmLoteService,
+    InativarUsuariosEmLoteService,
+    ReativarUsuariosEmLoteService,
 )
 from apps.helpers.exceptions import IntercorrenciasDeletionError
 from apps.users.models import Cargo
+from auditlog.models import LogEntry
 
 User = get_user_model()
 
@@ -172,3 +177,223 @@ class TestReativarUsuarioService:
         assert usuario.is_active is True
         assert usuario.data_inativacao is None
         assert usuario.responsavel_inativacao is None
+
+
+@pytest.mark.django_db
+class TestAprovarUsuariosEmLoteService:
+    """Testes para o service AprovarUsuariosEmLoteService."""
+
+    @pytest.fixture
+    def usuarios_pendentes(self):
+        cargo = Cargo.objects.create(codigo=1234, nome="Cargo Teste")
+        return [
+            User.objects.create(
+                username=f"pendente_{i}",
+                cpf=f"0000000000{i}",
+                name=f"Pendente {i}",
+                email=f"pendente{i}@example.com",
+                cargo=cargo,
+                is_validado=False,
+            )
+            for i in range(3)
+        ]
+
+    @patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+    @patch("apps.users.services.gestao_usuario_service.CriaUsuarioCoreSSOService.cria_usuarios_core_sso_em_lote")
+    def test_aprova_somente_usuarios_provisionados(
+        self, mock_core_sso, mock_envia_email, usuarios_pendentes, django_capture_on_commit_callbacks
+    ):
+        falha = usuarios_pendentes[1]
+        mock_core_sso.return_value = {
+            usuario.username: ("Falha" if usuario == falha else None)
+            for usuario in usuarios_pendentes
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            resultado = AprovarUsuariosEmLoteService(
+                usuarios=usuarios_pendentes, usuario_responsavel="ADMIN"
+            ).executar()
+
+        assert resultado[falha.uuid] == "Erro ao criar o usuário no Core SSO."
+        assert resultado[usuarios_pendentes[0].uuid] is None
+        assert resultado[usuarios_pendentes[2].uuid] is None
+
+        aprovados = User.objects.filter(is_validado=True, responsavel_aprovacao="ADMIN")
+        assert set(aprovados.values_list("username", flat=True)) == {"pendente_0", "pendente_2"}
+        assert all(aprovados.values_list("is_core_sso", flat=True))
+        mock_envia_email.assert_called_once()
+        assert {mensagem["destinatario"] for mensagem in mock_envia_email.call_args.args[0]} == {
+            "pendente0@example.com", "pendente2@example.com"
+        }
+
+    @patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote")
+    @patch("apps.users.services.gestao_usuario_service.CriaUsuarioCoreSSOService.cria_usuarios_core_sso_em_lote")
+    def test_usuario_ja_aprovado_nao_chama_core_sso(
+        self, mock_core_sso, mock_envia_email, usuarios_pendentes
+    ):
+        usuario = usuarios_pendentes[0]
+        usuario.is_validado = True
+        mock_core_sso.return_value = {}
+
+        resultado = AprovarUsuariosEmLoteService(
+            usuarios=[usuario], usuario_responsavel="ADMIN"
+        ).executar()
+
+        assert resultado == {usuario.uuid: "Usuário já está aprovado."}
+        mock_core_sso.assert_called_once_with([])
+        mock_envia_email.assert_not_called()
+
+    @patch("apps.users.services.gestao_usuario_service.CriaUsuarioCoreSSOService.cria_usuarios_core_sso_em_lote")
+    @patch("apps.users.services.envia_email_service.EnviaEmailService.montar")
+    def test_falha_no_email_nao_desfaz_aprovacao(
+        self, mock_envia_email, mock_core_sso, usuarios_pendentes, django_capture_on_commit_callbacks
+    ):
+        mock_core_sso.return_value = {usuario.username: None for usuario in usuarios_pendentes}
+        mock_envia_email.side_effect = Exception("SMTP fora")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            AprovarUsuariosEmLoteService(
+                usuarios=usuarios_pendentes, usuario_responsavel="ADMIN"
+            ).executar()
+
+        assert User.objects.filter(is_validado=True).count() == 3
+
+
+@pytest.fixture
+def usuarios_ativos():
+    cargo = Cargo.objects.create(codigo=1234, nome="Cargo Teste")
+    return [
+        User.objects.create(
+            username=f"ativo_{i}",
+            cpf=f"1000000000{i}",
+            name=f"Ativo {i}",
+            email=f"ativo{i}@example.com",
+            cargo=cargo,
+            is_active=True,
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.mark.django_db
+class TestInativarUsuariosEmLoteService:
+    """Testes para o service InativarUsuariosEmLoteService."""
+
+    @patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+    @patch(
+        "apps.users.services.gestao_usuario_service.IntercorrenciasService"
+        ".deletar_intercorrencias_usuarios_inativos"
+    )
+    def test_inativa_somente_usuarios_com_intercorrencias_deletadas(
+        self, mock_intercorrencias, mock_envia_email, usuarios_ativos, django_capture_on_commit_callbacks
+    ):
+        mock_intercorrencias.return_value = {
+            "ativo_0": {"success": True, "data": {}, "error": None},
+            "ativo_1": {"success": False, "data": None, "error": "Timeout"},
+            "ativo_2": {"success": True, "data": {}, "error": None},
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            resultado = InativarUsuariosEmLoteService(
+                usuarios=usuarios_ativos,
+                usuario_responsavel="ADMIN",
+                motivo_inativacao="Fim do contrato",
+            ).executar()
+
+        assert resultado[usuarios_ativos[0].uuid] is None
+        assert resultado[usuarios_ativos[1].uuid] == "Não foi possível inativar o usuário. Timeout"
+        assert resultado[usuarios_ativos[2].uuid] is None
+
+        inativos = User.objects.filter(is_active=False)
+        assert set(inativos.values_list("username", flat=True)) == {"ativo_0", "ativo_2"}
+        assert set(inativos.values_list("motivo_inativacao", flat=True)) == {"Fim do contrato"}
+        mock_envia_email.assert_called_once()
+        assert len(mock_envia_email.call_args.args[0]) == 2
+        assert set(
+            LogEntry.objects.filter(action=LogEntry.Action.UPDATE).values_list("object_pk", flat=True)
+        ) == {str(usuarios_ativos[0].pk), str(usuarios_ativos[2].pk)}
+
+    @patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+    @patch(
+        "apps.users.services.gestao_usuario_service.IntercorrenciasService"
+        ".deletar_intercorrencias_usuarios_inativos"
+    )
+    def test_usuario_ja_inativo_nao_chama_intercorrencias(
+        self, mock_intercorrencias, mock_envia_email, usuarios_ativos
+    ):
+        usuario = usuarios_ativos[0]
+        usuario.is_active = False
+        mock_intercorrencias.return_value = {}
+
+        resultado = InativarUsuariosEmLoteService(
+            usuarios=[usuario],
+            usuario_responsavel="ADMIN",
+            motivo_inativacao="Teste",
+        ).executar()
+
+        assert resultado == {usuario.uuid: None}
+        mock_intercorrencias.assert_not_called()
+        mock_envia_email.assert_not_called()
+
+    @patch("apps.users.services.gestao_usuario_service.invalidar_me_usuarios")
+    @patch("apps.users.services.gestao_usuario_service.EnviaEmailService.enviar_em_lote", return_value={})
+    @patch(
+        "apps.users.services.gestao_usuario_service.IntercorrenciasService"
+        ".deletar_intercorrencias_usuarios_inativos"
+    )
+    def test_intercorrencias_deletadas_apos_o_update_e_falhas_restauradas(
+        self, mock_intercorrencias, mock_envia_email, mock_invalidar_me, usuarios_ativos
+    ):
+        User.objects.filter(username="ativo_1").update(motivo_inativacao="Inativação anterior")
+        usuarios = list(User.objects.filter(username__in=["ativo_0", "ativo_1"]).order_by("username"))
+
+        def _deletar(usernames):
+            # Como na inativação individual, o usuário já está inativado quando o microserviço é chamado
+            assert not User.objects.filter(username__in=usernames, is_active=True).exists()
+            return {
+                "ativo_0": {"success": True, "data": {}, "error": None},
+                "ativo_1": {"success": False, "data": None, "error": "Timeout"},
+            }
+
+        mock_intercorrencias.side_effect = _deletar
+
+        InativarUsuariosEmLoteService(
+            usuarios=usuarios, usuario_responsavel="ADMIN", motivo_inativacao="Fim do contrato"
+        ).executar()
+
+        restaurado = User.objects.get(username="ativo_1")
+        assert restaurado.is_active is True
+        assert restaurado.data_inativacao is None
+        assert restaurado.responsavel_inativacao is None
+        assert restaurado.motivo_inativacao == "Inativação anterior"
+        assert User.objects.get(username="ativo_0").is_active is False
+        mock_invalidar_me.assert_called_once_with([usuarios[0].pk])
+
+
+@pytest.mark.django_db
+class TestReativarUsuariosEmLoteService:
+    """Testes para o service ReativarUsuariosEmLoteService."""
+
+    @patch("apps.users.services.gestao_usuario_service.invalidar_me_usuarios")
+    def test_reativa_usuarios_inativos(self, mock_invalidar_me, usuarios_ativos):
+        User.objects.filter(username__in=["ativo_0", "ativo_1"]).update(
+            is_active=False,
+            data_inativacao=timezone.now(),
+            responsavel_inativacao="ADMIN",
+            motivo_inativacao="Teste",
+            inativado_via_unidade=True,
+        )
+        usuarios = list(User.objects.filter(username__startswith="ativo_"))
+
+        resultado = ReativarUsuariosEmLoteService(usuarios=usuarios).executar()
+
+        assert set(resultado.values()) == {None}
+        assert User.objects.filter(is_active=True).count() == 3
+        assert not User.objects.filter(
+            Q(data_inativacao__isnull=False) | Q(inativado_via_unidade=True)
+        ).exists()
+        assert LogEntry.objects.filter(action=LogEntry.Action.UPDATE).count() == 2
+        mock_invalidar_me.assert_called_once()
+        assert sorted(mock_invalidar_me.call_args.args[0]) == sorted(
+            User.objects.filter(username__in=["ativo_0", "ativo_1"]).values_list("pk", flat=True)
+        )
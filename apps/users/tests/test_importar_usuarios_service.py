@@ -0,0 +1,196 @@
+import io
+import pytest
+from unittest.mock import patch
+from openpyxl import Workbook
+from auditlog.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from apps.helpers.exceptions import ImportacaoUsuariosException
+from apps.tarefas.models import Tarefa
+from apps.users.models import StatusCoreSSOChoices
+from apps.users.services.importar_usuarios_service import ImportarUsuariosService
+from apps.users.services.provisionamento_core_sso_service import TAREFA_PROVISIONAR
+
+User = get_user_model()
+
+CABECALHO = "rf;nome;cpf;email;cargo;rede;unidades"
+
+
+def arquivo_csv(*linhas, cabecalho=CABECALHO):
+    conteudo = "\n".join([cabecalho, *linhas]).encode("utf-8")
+    return SimpleUploadedFile("usuarios.csv", conteudo, content_type="text/csv")
+
+
+def linha(rf, cpf, email=None, rede="INDIRETA", unidades="200237", cargo="9999"):
+    email = email or f"{rf}@sme.prefeitura.sp.gov.br"
+    return f"{rf};Usuário {rf};{cpf};{email};{cargo};{rede};{unidades}"
+
+
+@pytest.fixture
+def mock_core_sso():
+    with patch(
+        "apps.users.services.provisionamento_core_sso_service.CriaUsuarioCoreSSOService.cria_usuario_core_sso"
+    ) as mock:
+        yield mock
+
+
+@pytest.mark.django_db
+class TestImportarUsuariosService:
+
+    def test_importa_usuarios_validos(
+        self, user_gipe_admin, cargo_comum, escola_sp, dre_sp, mock_core_sso, django_capture_on_commit_callbacks
+    ):
+        arquivo = arquivo_csv(
+            linha("1234567", "39053344705"),
+            linha("7654321", "52998224725", unidades="200237,108500"),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            resultado = ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
+
+        assert resultado == {"total_linhas": 2, "total_importados": 2, "erros": []}
+
+        usuario = User.objects.get(username="7654321")
+        assert usuario.is_validado is True
+        assert usuario.status_core_sso == StatusCoreSSOChoices.PENDENTE
+        assert usuario.is_core_sso is False
+        assert Tarefa.objects.filter(
+            nome=TAREFA_PROVISIONAR, argumentos={"usuario_id": usuario.pk}
+        ).exists()
+        mock_core_sso.assert_not_called()
+        assert usuario.has_usable_password() is False
+        assert set(usuario.unidades.values_list("codigo_eol", flat=True)) == {"200237", "108500"}
+        assert LogEntry.objects.filter(
+            object_pk=str(usuario.pk), action=LogEntry.Action.CREATE
+        ).exists()
+
+    def test_reporta_erros_por_linha(self, user_gipe_admin, cargo_comum, escola_sp, usuario_nao_validado, mock_core_sso):
+        arquivo = arquivo_csv(
+            linha("1234567", "39053344705"),
+            linha("1234567", "52998224725"),
+            linha("nao_validado", "11144477735"),
+            linha("2345678", "123"),
+            linha("3456789", "11144477735", email="fulano@gmail.com"),
+            linha("4567890", "86288366757", unidades="000000"),
+            linha("5678901", "71428793860", cargo="1234"),
+        )
+
+        resultado = ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
+
+        assert resultado["total_linhas"] == 7
+        assert resultado["total_importados"] == 1
+        assert resultado["erros"] == [
+            {"linha": 3, "detail": "Já existe um usuário cadastrado com este RF."},
+            {"linha": 4, "detail": "Já existe um usuário cadastrado com este RF."},
+            {"linha": 5, "detail": "CPF informado é inválido!"},
+            {"linha": 6, "detail": "Utilize seu e-mail institucional."},
+            {"linha": 7, "detail": "Unidade inválida: 000000."},
+            {"linha": 8, "detail": "Cargo inválido."},
+        ]
+
+    def test_ponto_focal_nao_importa_para_outra_dre(
+        self, user_pf_admin, cargo_comum, escola_sp, escola_outra, mock_core_sso
+    ):
+        arquivo = arquivo_csv(
+            linha("1234567", "39053344705", unidades="200237"),
+            linha("7654321", "52998224725", unidades="300000"),
+        )
+
+        resultado = ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_pf_admin).executar()
+
+        assert resultado["total_importados"] == 1
+        assert resultado["erros"] == [
+            {"linha": 3, "detail": "Ponto Focal só pode cadastrar usuários para unidades de sua DRE."}
+        ]
+
+    @patch("apps.users.services.importar_usuarios_service.SmeIntegracaoService.usuario_core_sso_or_none")
+    def test_rede_direta_exige_usuario_no_core_sso(
+        self, mock_consulta, user_gipe_admin, cargo_comum, escola_sp, mock_core_sso
+    ):
+        mock_consulta.side_effect = lambda login: {"login": login} if login == "1234567" else None
+        arquivo = arquivo_csv(
+            linha("1234567", "39053344705", rede="DIRETA"),
+            linha("7654321", "52998224725", rede="DIRETA"),
+        )
+
+        resultado = ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
+
+        assert resultado["total_importados"] == 1
+        assert resultado["erros"] == [{"linha": 3, "detail": "Usuário não encontrado no CoreSSO."}]
+        assert User.objects.get(username="1234567").is_core_sso is False
+
+    def test_provisionamento_so_e_enfileirado_apos_o_commit(self, user_gipe_admin, cargo_comum, escola_sp):
+        arquivo = arquivo_csv(linha("1234567", "39053344705"))
+
+        ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
+
+        assert User.objects.filter(username="1234567").exists()
+        assert not Tarefa.objects.filter(nome=TAREFA_PROVISIONAR).exists()
+
+    def test_conflito_concorrente_vira_erro_da_linha(self, user_gipe_admin, cargo_comum, escola_sp, mock_core_sso):
+        arquivo = arquivo_csv(
+            linha("1234567", "39053344705"),
+            linha("7654321", "52998224725", email="duplicado@sme.prefeitura.sp.gov.br"),
+        )
+        servico = ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin)
+        validar_unicidade = servico._validar_unicidade
+
+        def _validar_e_concorrer(linhas):
+            # Outro cadastro grava o mesmo e-mail depois da validação e antes do insert
+            validas = validar_unicidade(linhas)
+            User.objects.create(username="9999999", cpf="11144477735", email="Duplicado@sme.prefeitura.sp.gov.br")
+            return validas
+
+        with patch.object(servico, "_validar_unicidade", side_effect=_validar_e_concorrer):
+            resultado = servico.executar()
+
+        assert resultado["total_importados"] == 1
+        assert resultado["erros"] == [{"linha": 3, "detail": "Este e-mail já está cadastrado."}]
+        assert User.objects.filter(username="1234567").exists()
+        assert not User.objects.filter(username="7654321").exists()
+
+    def test_processa_em_lotes_e_respeita_limite(
+        self, settings, user_gipe_admin, cargo_comum, escola_sp, mock_core_sso
+    ):
+        settings.GESTAO_USUARIOS_IMPORTACAO_LOTE = 2
+        settings.GESTAO_USUARIOS_IMPORTACAO_MAX_LINHAS = 3
+        arquivo = arquivo_csv(
+            linha("1234567", "39053344705"),
+            linha("2345678", "52998224725"),
+            linha("3456789", "11144477735"),
+            linha("4567890", "86288366757"),
+        )
+
+        resultado = ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
+
+        assert resultado["total_importados"] == 3
+        assert resultado["erros"][0]["linha"] == 4
+        assert not User.objects.filter(username="4567890").exists()
+
+    def test_importa_xlsx(self, user_gipe_admin, cargo_comum, escola_sp, mock_core_sso):
+        workbook = Workbook()
+        planilha = workbook.active
+        planilha.append(CABECALHO.split(";"))
+        planilha.append(["1234567", "Usuário Xlsx", "39053344705", "xlsx@sme.prefeitura.sp.gov.br", 9999, "INDIRETA", 200237])
+        conteudo = io.BytesIO()
+        workbook.save(conteudo)
+
+        arquivo = SimpleUploadedFile("usuarios.xlsx", conteudo.getvalue())
+
+        resultado = ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
+
+        assert resultado["total_importados"] == 1
+        assert User.objects.get(username="1234567").unidades.get().codigo_eol == "200237"
+
+    def test_colunas_obrigatorias_ausentes(self, user_gipe_admin):
+        arquivo = arquivo_csv(cabecalho="rf;nome")
+
+        with pytest.raises(ImportacaoUsuariosException, match="Colunas obrigatórias ausentes"):
+            ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
+
+    def test_formato_invalido(self, user_gipe_admin):
+        arquivo = SimpleUploadedFile("usuarios.txt", b"conteudo")
+
+        with pytest.raises(ImportacaoUsuariosException, match="Formato de arquivo inválido"):
+            ImportarUsuariosService(arquivo=arquivo, usuario_responsavel=user_gipe_admin).executar()
@@ -133,3 +133,30 @@ class TestIntercorrenciasService:
         assert resultado["data"] is None
         assert resultado["error_type"] == "UNEXPECTED_ERROR"
         assert "Erro inesperado" in resultado["error"]
+
+    def test_deletar_intercorrencias_usuarios_inativos_lista_vazia(self):
+        assert IntercorrenciasService.deletar_intercorrencias_usuarios_inativos([]) == {}
+
+    @patch.object(IntercorrenciasService, "BASE_URL", "https://intercorrencias")
+    @patch.object(IntercorrenciasService, "INTERNAL_TOKEN", "internal-token")
+    @patch("apps.users.services.intercorrencias_service.requests.Session.post")
+    def test_deletar_intercorrencias_usuarios_inativos_resultado_por_usuario(self, mock_post):
+        def _post(url, json, headers, timeout):
+            if json["username"] == "falha":
+                raise requests.exceptions.Timeout
+            response = MagicMock()
+            response.raise_for_status.return_value = None
+            response.json.return_value = {"intercorrencias_deletadas": 1}
+            return response
+
+        mock_post.side_effect = _post
+
+        resultados = IntercorrenciasService.deletar_intercorrencias_usuarios_inativos(
+            ["ok_1", "falha", "ok_2"]
+        )
+
+        assert list(resultados) == ["ok_1", "falha", "ok_2"]
+        assert resultados["ok_1"]["success"] is True
+        assert resultados["ok_2"]["success"] is True
+        assert resultados["falha"]["error_type"] == "TIMEOUT"
+        assert mock_post.call_count == 3
@@ -0,0 +1,50 @@
+import pytest
+from io import StringIO
+from django.urls import reverse
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from apps.users.middleware import is_rota_api_sem_sessao
+
+
+class TestRotaApiSemSessao:
+
+    @pytest.mark.parametrize("path", ["/api/users/verify-token", "/api/users/gestao-usuarios/", "/api/unidades/gestao-unidades/"])
+    def test_views_drf_da_api(self, path):
+        assert is_rota_api_sem_sessao(path) is True
+
+    @pytest.mark.parametrize("path", ["/api/docs/", "/api/schema/", "/api/users/~update/", "/accounts/login/", "/api/nao-existe/"])
+    def test_rotas_que_mantem_sessao(self, path):
+        assert is_rota_api_sem_sessao(path) is False
+
+
+@pytest.mark.django_db
+class TestMiddlewaresForaDaApi:
+
+    def test_api_nao_carrega_sessao_nem_usuario_da_sessao(self, user_comum):
+        client = APIClient()
+        client.force_login(user_comum)
+
+        response = client.get(reverse("users:me"))
+
+        # SessionAuthentication é a primeira classe e não define WWW-Authenticate: 403
+        assert response.status_code == 403
+        assert not hasattr(response.wsgi_request, "session")
+
+    def test_paginas_do_site_mantem_sessao(self, client, user_comum):
+        client.force_login(user_comum)
+
+        response = client.get(reverse("users:update"))
+
+        assert response.status_code == 200
+        assert response.wsgi_request.user == user_comum
+
+
+@pytest.mark.django_db
+def test_benchmark_middleware():
+    saida = StringIO()
+
+    call_command("benchmark_middleware", "--requisicoes", "3", stdout=saida)
+
+    assert "Stack completo" in saida.getvalue()
+    assert "Diferença" in saida.getvalue()
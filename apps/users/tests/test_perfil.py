@@ -0,0 +1,89 @@
+import pytest
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+
+from apps.users.perfil import carregar_perfil_usuario, obter_perfil_usuario
+from apps.users.permissions import CanManageUsers
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _limpa_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class DummyView:
+    def __init__(self, action):
+        self.action = action
+
+
+@pytest.mark.django_db
+class TestPerfilUsuario:
+
+    def test_conjuntos_de_unidades(self, user_pf_admin, escola_sp, dre_sp):
+        user_pf_admin.unidades.add(escola_sp)
+
+        perfil = carregar_perfil_usuario(user_pf_admin)
+
+        assert perfil.is_ponto_focal is True
+        assert perfil.is_gipe is False
+        assert perfil.unidades == {"108500", "200237"}
+        assert perfil.dres == {"108500"}
+        assert perfil.dres_das_unidades == {"108500"}
+        assert perfil.codigo_unidade_principal == "108500"
+
+    def test_carregado_uma_vez_por_requisicao(self, api_rf, user_pf_admin, django_assert_num_queries):
+        request = api_rf.get("/fake-url/")
+        request.user = user_pf_admin
+
+        with django_assert_num_queries(1):
+            perfil = obter_perfil_usuario(request)
+            assert obter_perfil_usuario(request) is perfil
+
+    def test_reaproveita_cache_entre_requisicoes(self, api_rf, user_pf_admin, django_assert_num_queries):
+        primeira = api_rf.get("/fake-url/")
+        primeira.user = user_pf_admin
+        obter_perfil_usuario(primeira)
+
+        segunda = api_rf.get("/fake-url/")
+        segunda.user = user_pf_admin
+
+        with django_assert_num_queries(0):
+            assert obter_perfil_usuario(segunda).dres == {"108500"}
+
+    def test_alteracao_de_unidades_invalida_cache(self, user_pf_admin, dre_outra):
+        assert carregar_perfil_usuario(user_pf_admin).dres == {"108500"}
+
+        user_pf_admin.unidades.set([dre_outra])
+        assert carregar_perfil_usuario(user_pf_admin).dres == {"999999"}
+
+        dre_outra.usuarios.clear()
+        assert carregar_perfil_usuario(user_pf_admin).dres == frozenset()
+
+    def test_alteracao_da_dre_da_unidade_invalida_cache(self, user_pf_admin, escola_sp, dre_outra):
+        user_pf_admin.unidades.set([escola_sp])
+        assert carregar_perfil_usuario(user_pf_admin).dres_das_unidades == {"108500"}
+
+        escola_sp.dre = dre_outra
+        escola_sp.save()
+
+        assert carregar_perfil_usuario(user_pf_admin).dres_das_unidades == {"999999"}
+
+    def test_permissao_de_objeto_nao_reconsulta_unidades_do_ponto_focal(
+        self, api_rf, user_pf_admin, user_comum, usuario_nao_validado, django_assert_num_queries
+    ):
+        request = api_rf.get("/fake-url/")
+        request.user = user_pf_admin
+        perm = CanManageUsers()
+        view = DummyView(action="retrieve")
+        obter_perfil_usuario(request)
+
+        alvos = list(
+            User.objects.prefetch_related("unidades").filter(pk__in=[user_comum.pk, usuario_nao_validado.pk])
+        )
+
+        with django_assert_num_queries(0):
+            assert all(perm.has_object_permission(request, view, alvo) for alvo in alvos)
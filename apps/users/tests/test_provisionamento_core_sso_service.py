@@ -0,0 +1,136 @@
+import pytest
+from io import StringIO
+from datetime import timedelta
+from unittest.mock import patch
+from django.utils import timezone
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+
+from apps.helpers.exceptions import CargaUsuarioException
+from apps.users.models import StatusCoreSSOChoices
+from apps.tarefas.models import Tarefa, StatusTarefaChoices
+from apps.tarefas.services.fila_tarefas_service import FilaTarefasService
+from apps.users.services.provisionamento_core_sso_service import (
+    TAREFA_PROVISIONAR,
+    ProvisionamentoCoreSSOService,
+)
+
+User = get_user_model()
+
+SERVICE = "apps.users.services.provisionamento_core_sso_service"
+
+
+def criar_usuario(username, status, **kwargs):
+    return User.objects.create_user(
+        username=username,
+        name=f"Usuário {username}",
+        email=f"{username}@example.com",
+        cpf=username,
+        status_core_sso=status,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestProvisionamentoCoreSSOService:
+
+    @patch(f"{SERVICE}.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+    def test_provisionar_com_sucesso(self, mock_cria):
+        usuario = criar_usuario("11111111111", StatusCoreSSOChoices.PENDENTE)
+
+        assert ProvisionamentoCoreSSOService.provisionar(usuario.pk) is True
+
+        mock_cria.assert_called_once_with(
+            {"login": usuario.username, "nome": usuario.name, "email": usuario.email},
+            atualiza_flag_local=False,
+        )
+        usuario.refresh_from_db()
+        assert usuario.status_core_sso == StatusCoreSSOChoices.PROVISIONADO
+        assert usuario.is_core_sso is True
+
+    @patch(f"{SERVICE}.CriaUsuarioCoreSSOService.cria_usuario_core_sso", side_effect=CargaUsuarioException("Timeout"))
+    def test_provisionar_registra_erro_e_continua_pendente(self, mock_cria):
+        usuario = criar_usuario("22222222222", StatusCoreSSOChoices.PENDENTE)
+
+        assert ProvisionamentoCoreSSOService.provisionar(usuario.pk) is False
+
+        usuario.refresh_from_db()
+        assert usuario.status_core_sso == StatusCoreSSOChoices.PENDENTE
+        assert usuario.erro_core_sso == "Timeout"
+        assert usuario.is_core_sso is False
+
+    @patch(f"{SERVICE}.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+    def test_provisionar_ignora_ja_provisionado(self, mock_cria):
+        usuario = criar_usuario("33333333333", StatusCoreSSOChoices.PROVISIONADO)
+
+        assert ProvisionamentoCoreSSOService.provisionar(usuario.pk) is True
+        mock_cria.assert_not_called()
+
+    def test_agendar_enfileira_uma_unica_tarefa(self):
+        usuario = criar_usuario("44444444444", StatusCoreSSOChoices.PENDENTE)
+
+        ProvisionamentoCoreSSOService.agendar(usuario)
+        ProvisionamentoCoreSSOService.agendar(usuario)
+
+        tarefa = Tarefa.objects.get()
+        assert tarefa.nome == TAREFA_PROVISIONAR
+        assert tarefa.argumentos == {"usuario_id": usuario.pk}
+
+    @patch(f"{SERVICE}.CriaUsuarioCoreSSOService.cria_usuario_core_sso", side_effect=CargaUsuarioException("Timeout"))
+    def test_tarefa_com_falha_volta_para_a_fila(self, mock_cria):
+        usuario = criar_usuario("88888888888", StatusCoreSSOChoices.PENDENTE)
+        ProvisionamentoCoreSSOService.agendar(usuario)
+
+        tarefa = FilaTarefasService.reservar()[0]
+        assert FilaTarefasService.executar(tarefa) is False
+
+        tarefa.refresh_from_db()
+        assert tarefa.status == StatusTarefaChoices.PENDENTE
+        assert tarefa.executar_em > timezone.now()
+        usuario.refresh_from_db()
+        assert usuario.status_core_sso == StatusCoreSSOChoices.PENDENTE
+
+    @patch(f"{SERVICE}.CriaUsuarioCoreSSOService.cria_usuario_core_sso", side_effect=CargaUsuarioException("Timeout"))
+    def test_falha_so_e_registrada_ao_esgotar_as_tentativas(self, mock_cria):
+        usuario = criar_usuario("99999999999", StatusCoreSSOChoices.PENDENTE)
+        ProvisionamentoCoreSSOService.agendar(usuario)
+        Tarefa.objects.update(max_tentativas=1)
+
+        tarefa = FilaTarefasService.reservar()[0]
+        assert FilaTarefasService.executar(tarefa) is False
+
+        tarefa.refresh_from_db()
+        assert tarefa.status == StatusTarefaChoices.FALHA
+        usuario.refresh_from_db()
+        assert usuario.status_core_sso == StatusCoreSSOChoices.FALHA
+        assert usuario.erro_core_sso == "Timeout"
+
+    @patch(f"{SERVICE}.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+    def test_reprocessar_devolve_a_fila_falhas_e_pendentes_antigos(self, mock_cria):
+        falha = criar_usuario("55555555555", StatusCoreSSOChoices.FALHA)
+        ProvisionamentoCoreSSOService.agendar(falha)
+        Tarefa.objects.update(status=StatusTarefaChoices.FALHA, tentativas=5)
+
+        pendente_antigo = criar_usuario(
+            "66666666666", StatusCoreSSOChoices.PENDENTE, date_joined=timezone.now() - timedelta(hours=1)
+        )
+        pendente_recente = criar_usuario("77777777777", StatusCoreSSOChoices.PENDENTE)
+
+        saida = StringIO()
+        call_command("reprocessar_core_sso", stdout=saida)
+        call_command("reprocessar_core_sso", stdout=StringIO())
+
+        assert "Usuários reenfileirados: 2" in saida.getvalue()
+        mock_cria.assert_not_called()
+
+        # Uma única tarefa por usuário, pendente de novo
+        tarefas = dict(Tarefa.objects.values_list("chave_idempotencia", "status"))
+        assert tarefas == {
+            f"core_sso:{falha.uuid}": StatusTarefaChoices.PENDENTE,
+            f"core_sso:{pendente_antigo.uuid}": StatusTarefaChoices.PENDENTE,
+        }
+        assert Tarefa.objects.get(chave_idempotencia=f"core_sso:{falha.uuid}").tentativas == 0
+
+        status = dict(User.objects.values_list("username", "status_core_sso"))
+        assert status[falha.username] == StatusCoreSSOChoices.PENDENTE
+        assert status[pendente_recente.username] == StatusCoreSSOChoices.PENDENTE
@@ -0,0 +1,79 @@
+import json
+import pytest
+from io import StringIO
+from datetime import timedelta
+from auditlog.models import LogEntry
+from django.db import connection
+from django.utils import timezone
+from django.core.management import call_command
+
+from apps.users.services.retencao_auditoria_service import TABELA_ARQUIVO, RetencaoAuditoriaService
+
+
+def ids_arquivados():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT id FROM {TABELA_ARQUIVO}")
+        return {linha[0] for linha in cursor.fetchall()}
+
+
+@pytest.fixture
+def entradas(user_comum):
+    """ Três entradas antigas (400 dias) e uma recente do mesmo usuário. """
+    LogEntry.objects.all().delete()
+    criadas = [
+        LogEntry.objects.log_create(user_comum, action=LogEntry.Action.UPDATE, changes={"name": ["a", str(i)]})
+        for i in range(4)
+    ]
+    antigas, recente = criadas[:3], criadas[3]
+    LogEntry.objects.filter(pk__in=[e.pk for e in antigas]).update(
+        timestamp=timezone.now() - timedelta(days=400)
+    )
+    return antigas, recente
+
+
+@pytest.mark.django_db
+class TestRetencaoAuditoriaService:
+
+    def test_arquiva_em_lotes(self, entradas):
+        antigas, recente = entradas
+
+        resumo = RetencaoAuditoriaService(dias=365, tamanho_lote=2).executar()
+
+        assert resumo["processadas"] == 3
+        assert resumo["lotes"] == 2
+        assert list(LogEntry.objects.values_list("pk", flat=True)) == [recente.pk]
+        assert ids_arquivados() == {e.pk for e in antigas}
+
+    def test_arquivo_preserva_os_valores_de_cada_coluna(self, entradas):
+        antigas, _ = entradas
+        antiga = LogEntry.objects.get(pk=antigas[0].pk)
+
+        RetencaoAuditoriaService(dias=365).executar()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT object_pk, object_repr, action, changes, "timestamp" FROM {TABELA_ARQUIVO} WHERE id = %s',
+                [antiga.pk],
+            )
+            arquivada = cursor.fetchone()
+
+        assert arquivada[:3] == (antiga.object_pk, antiga.object_repr, antiga.action)
+        assert json.loads(arquivada[3]) == antiga.changes
+        assert arquivada[4] == antiga.timestamp
+
+    def test_apagar_nao_arquiva(self, entradas):
+        _, recente = entradas
+
+        resumo = RetencaoAuditoriaService(dias=365, apagar=True).executar()
+
+        assert resumo["processadas"] == 3
+        assert list(LogEntry.objects.values_list("pk", flat=True)) == [recente.pk]
+        assert ids_arquivados() == set()
+
+    def test_comando_dry_run_nao_altera(self, entradas):
+        saida = StringIO()
+
+        call_command("arquivar_auditoria", "--dias", "365", "--dry-run", stdout=saida)
+
+        assert "Seriam processadas: 3 entrada(s)" in saida.getvalue()
+        assert LogEntry.objects.count() == 4
@@ -0,0 +1,140 @@
+import time
+import pytest
+import redis
+from unittest.mock import MagicMock, patch
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from apps.users.api.views.login_viewset import LoginView
+from apps.users.authentication import ClaimsJWTAuthentication
+from apps.users.revogacao import (
+    FiltroBloom,
+    ListaRevogacao,
+    RevogacaoMemoriaBackend,
+    RevogacaoRedisBackend,
+    obter_lista_revogacao,
+)
+from apps.users.services.gestao_usuario_service import InativarUsuarioService
+
+
+@pytest.fixture(autouse=True)
+def _limpa_lista():
+    obter_lista_revogacao().limpar()
+    yield
+    obter_lista_revogacao().limpar()
+
+
+def token_login(user):
+    return AccessToken(LoginView()._generate_token(user)["access"])
+
+
+class TestFiltroBloom:
+
+    def test_itens_adicionados_sempre_presentes(self):
+        filtro = FiltroBloom(1000)
+        for i in range(1000):
+            filtro.adicionar(i)
+
+        assert all(i in filtro for i in range(1000))
+
+    def test_taxa_de_falsos_positivos(self):
+        filtro = FiltroBloom(1000, taxa_falso_positivo=0.01)
+        for i in range(1000):
+            filtro.adicionar(i)
+
+        falsos_positivos = sum(1 for i in range(1000, 11000) if i in filtro)
+        assert falsos_positivos < 300
+
+
+class TestListaRevogacao:
+
+    def test_token_emitido_antes_da_revogacao(self):
+        lista = ListaRevogacao(RevogacaoMemoriaBackend())
+        emitido_em = time.time() - 10
+
+        lista.revogar([42])
+
+        assert lista.token_revogado(42, emitido_em) is True
+        assert lista.token_revogado(42, time.time() + 1) is False
+        assert lista.token_revogado(43, emitido_em) is False
+
+    @patch("apps.users.revogacao.time.time", return_value=1_700_000_000.9)
+    def test_token_emitido_no_mesmo_segundo_da_revogacao(self, _mock_time):
+        lista = ListaRevogacao(RevogacaoMemoriaBackend())
+
+        lista.revogar([42])
+
+        assert lista.token_revogado(42, 1_700_000_000) is False
+        assert lista.token_revogado(42, 1_699_999_999) is True
+
+    def test_nao_consulta_backend_para_usuario_fora_do_filtro(self):
+        backend = MagicMock(wraps=RevogacaoMemoriaBackend())
+        lista = ListaRevogacao(backend)
+        lista.revogar([1])
+
+        lista.token_revogado(2, time.time())
+
+        backend.revogado_em.assert_not_called()
+
+    def test_filtro_recarregado_com_revogacoes_de_outros_processos(self, settings):
+        settings.TOKEN_REVOGACAO_BLOOM_INTERVALO = 0
+        backend = RevogacaoMemoriaBackend()
+        lista = ListaRevogacao(backend)
+        emitido_em = time.time() - 10
+        assert lista.token_revogado(7, emitido_em) is False
+
+        ListaRevogacao(backend).revogar([7])
+
+        assert lista.token_revogado(7, emitido_em) is True
+
+    def test_falha_no_backend_aceita_token(self):
+        backend = MagicMock()
+        backend.listar.return_value = ["5"]
+        backend.revogado_em.side_effect = redis.ConnectionError("indisponível")
+        lista = ListaRevogacao(backend)
+
+        assert lista.token_revogado(5, time.time()) is False
+
+
+class TestRevogacaoRedisBackend:
+
+    @patch("apps.users.revogacao.redis.Redis.from_url")
+    def test_revogar_grava_sorted_set_com_expiracao(self, mock_from_url):
+        pipeline = mock_from_url.return_value.pipeline.return_value
+
+        RevogacaoRedisBackend().revogar(["1", "2"], 1000.0)
+
+        pipeline.zadd.assert_called_once_with("users:tokens_revogados", {"1": 1000.0, "2": 1000.0})
+        pipeline.zremrangebyscore.assert_called_once()
+        pipeline.expire.assert_called_once_with("users:tokens_revogados", 24 * 60 * 60)
+        pipeline.execute.assert_called_once()
+
+
+@pytest.mark.django_db
+class TestRevogacaoNaInativacao:
+
+    @patch("apps.users.services.gestao_usuario_service.IntercorrenciasService.deletar_intercorrencias_usuario_inativo")
+    def test_token_recusado_apos_inativacao(
+        self, mock_intercorrencias, user_comum, user_gipe_admin, django_capture_on_commit_callbacks
+    ):
+        mock_intercorrencias.return_value = {"success": True, "data": {}}
+        token = token_login(user_comum)
+        token["iat"] -= 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            InativarUsuarioService.inativar(user_comum, str(user_gipe_admin), "Motivo", False)
+
+        with pytest.raises(AuthenticationFailed, match="revoked"):
+            ClaimsJWTAuthentication().get_user(token)
+
+    def test_verify_token_recusa_token_revogado(self, user_comum):
+        token = token_login(user_comum)
+        token["iat"] -= 1
+        obter_lista_revogacao().revogar([user_comum.pk])
+
+        response = APIClient().post("/api/users/verify-token", {"token": str(token)}, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data["detail"] == "Token revogado."
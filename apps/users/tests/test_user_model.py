@@ -2,10 +2,12 @@
 Testes para o modelo User.
 """
 import pytest
+from django.db import connection, IntegrityError
 from django.utils import timezone
+from django.db.models.functions import Lower
 from django.contrib.auth import get_user_model
 
-from apps.users.models import Cargo
+from apps.users.models import Cargo, violou_email_unico
 
 User = get_user_model()
 
@@ -126,4 +128,66 @@ class TestUserModelCamposAprovacaoInativacao:
         assert user.data_aprovacao is None
         assert user.responsavel_aprovacao is None
         assert user.data_inativacao is None
-        assert user.responsavel_inativacao is None
\ No newline at end of file
+        assert user.responsavel_inativacao is None
+
+@pytest.mark.django_db
+class TestUserModelUuid:
+    """Testes para o uuid usado como chave de busca na gestão de usuários."""
+
+    def test_busca_por_uuid_usa_indice(self, user_comum):
+        """
+        Com seq scan desabilitado o planner só escolhe seq scan se não houver índice;
+        o plano deve usar o índice único de uuid.
+        """
+        queryset = User.objects.filter(uuid=user_comum.uuid)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plano = queryset.explain()
+
+        assert "Index" in plano
+        assert "Seq Scan" not in plano
+
+    def test_uuid_unico(self, user_comum, usuario_nao_validado):
+        usuario_nao_validado.uuid = user_comum.uuid
+
+        with pytest.raises(IntegrityError):
+            usuario_nao_validado.save(update_fields=["uuid"])
+
+
+@pytest.mark.django_db
+class TestUserModelEmailUnico:
+    """Testes para a unicidade de e-mail sem diferenciar maiúsculas."""
+
+    def test_email_em_uso_ignora_maiusculas(self, user_comum):
+        assert User.email_em_uso("USER.Comum@example.com") is True
+        assert User.email_em_uso("USER.Comum@example.com", excluir_pk=user_comum.pk) is False
+        assert User.email_em_uso("outro@example.com") is False
+
+    def test_constraint_barra_email_duplicado(self, user_comum, usuario_nao_validado):
+        usuario_nao_validado.email = user_comum.email.upper()
+
+        with pytest.raises(IntegrityError) as erro:
+            usuario_nao_validado.save(update_fields=["email"])
+
+        assert violou_email_unico(erro.value)
+
+    def test_emails_vazios_nao_conflitam(self, cargo_comum):
+        User.objects.create(username="sem_email_1", cpf="90000000001", cargo=cargo_comum, email="")
+        User.objects.create(username="sem_email_2", cpf="90000000002", cargo=cargo_comum, email="")
+
+        assert User.email_em_uso("") is False
+
+    def test_busca_por_email_usa_indice(self, user_comum):
+        """ A consulta de email_em_uso deve usar o índice único de lower(email). """
+        queryset = (
+            User.objects.alias(email_lower=Lower("email"))
+            .filter(email_lower="x@example.com")
+            .exclude(email="")
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plano = queryset.explain()
+
+        assert "users_user_email_lower_unico" in plano
@@ -217,4 +217,30 @@ class TestRemoverFlagsCoreSSO:
     def test_remover_flags_usuario_nao_encontrado(self):
         """Testa usuário não encontrado"""
         with pytest.raises(CargaUsuarioException):
-            CriaUsuarioCoreSSOService._remover_flags_core_sso("00000000000")
\ No newline at end of file
+            CriaUsuarioCoreSSOService._remover_flags_core_sso("00000000000")
+
+
+class TestCriaUsuariosCoreSSOEmLote:
+
+    def test_lista_vazia_nao_chama_core_sso(self):
+        with patch.object(CriaUsuarioCoreSSOService, "cria_usuario_core_sso") as mock_cria:
+            assert CriaUsuarioCoreSSOService.cria_usuarios_core_sso_em_lote([]) == {}
+
+        mock_cria.assert_not_called()
+
+    @patch("apps.users.services.usuario_core_sso_service.CriaUsuarioCoreSSOService.cria_usuario_core_sso")
+    def test_retorna_erro_por_login(self, mock_cria):
+        def _cria(dados_usuario, atualiza_flag_local=True):
+            assert atualiza_flag_local is False
+            if dados_usuario["login"] == "falha":
+                raise CargaUsuarioException("Falha externa")
+
+        mock_cria.side_effect = _cria
+
+        resultado = CriaUsuarioCoreSSOService.cria_usuarios_core_sso_em_lote([
+            {"login": "ok", "nome": "Ok", "email": "ok@example.com"},
+            {"login": "falha", "nome": "Falha", "email": "falha@example.com"},
+        ])
+
+        assert resultado == {"ok": None, "falha": "Falha externa"}
+        assert mock_cria.call_count == 2
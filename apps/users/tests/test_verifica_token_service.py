@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.revogacao import obter_lista_revogacao
+from apps.users.services.verifica_token_service import VerificaTokenService
+
+
+@pytest.fixture(autouse=True)
+def _limpa_cache():
+    cache.clear()
+    obter_lista_revogacao().limpar()
+    yield
+    cache.clear()
+    obter_lista_revogacao().limpar()
+
+
+def gerar_token(user_id=1):
+    token = AccessToken.for_user(type("User", (), {"id": user_id})())
+    token["iat"] -= 1
+    return str(token)
+
+
+class TestVerificaTokenService:
+
+    def test_retorna_claims_do_token_valido(self):
+        resultado = VerificaTokenService.verificar(gerar_token(10))
+
+        assert resultado["valido"] is True
+        assert resultado["claims"]["user_id"] == 10
+
+    def test_token_invalido(self):
+        resultado = VerificaTokenService.verificar("aaa.bbb.ccc")
+
+        assert resultado["valido"] is False
+        assert "invalid" in resultado["detail"].lower()
+
+    def test_resultado_positivo_em_cache(self):
+        token = gerar_token()
+        VerificaTokenService.verificar(token)
+
+        with patch("apps.users.services.verifica_token_service.UntypedToken") as mock_token:
+            assert VerificaTokenService.verificar(token)["valido"] is True
+
+        mock_token.assert_not_called()
+
+    def test_token_em_cache_revogado(self):
+        token = gerar_token(20)
+        VerificaTokenService.verificar(token)
+
+        obter_lista_revogacao().revogar([20])
+
+        assert VerificaTokenService.verificar(token) == {"valido": False, "detail": "Token revogado."}
+
+    def test_lote_mantem_ordem(self):
+        valido = gerar_token()
+
+        resultados = VerificaTokenService.verificar_em_lote([valido, "invalido", valido])
+
+        assert [resultado["valido"] for resultado in resultados] == [True, False, True]
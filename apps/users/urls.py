@@ -8,7 +8,7 @@ from .views import user_update_view
 
 from apps.users.api.views.me_viewset import MeView
 from apps.users.api.views.login_viewset import LoginView
-from apps.users.api.views.verify_token_viewset import VerifyTokenFlexibleView
+from apps.users.api.views.verify_token_viewset import VerifyTokenFlexibleView, VerifyTokenLoteView
 from apps.users.api.views.usuario_viewset import UserCreateView
 from apps.users.api.views.senha_viewset import (
     EsqueciMinhaSenhaViewSet,
@@ -42,4 +42,5 @@ urlpatterns = [
     path("atualizar-senha", view=AtualizarSenhaViewSet.as_view(), name="atualizar-senha"),
     path("me", MeView.as_view(), name="me"),
     path("verify-token", VerifyTokenFlexibleView.as_view(), name="verify-token"),
+    path("verify-token/lote", VerifyTokenLoteView.as_view(), name="verify-token-lote"),
 ]
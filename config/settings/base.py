@@ -6,6 +6,7 @@ from pathlib import Path
 
 import environ
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # apps/
@@ -28,8 +29,48 @@ INTERNAL_SERVICE_TOKEN = env(
     default='sua_chave_interna_aqui'
 )
 
+# Número máximo de chamadas simultâneas ao serviço de intercorrências em operações em lote
+INTERCORRENCIAS_MAX_WORKERS = env.int('INTERCORRENCIAS_MAX_WORKERS', default=8)
+
 FRONTEND_URL = env('FRONTEND_URL', default="")
 
+# Número máximo de chamadas simultâneas ao CoreSSO em operações em lote
+CORESSO_MAX_WORKERS = env.int('CORESSO_MAX_WORKERS', default=8)
+
+# Minutos após o cadastro para um usuário ainda PENDENTE no CoreSSO ser retentado pelo reprocessar_core_sso
+CORESSO_PROVISIONAMENTO_PENDENTE_MINUTOS = env.int('CORESSO_PROVISIONAMENTO_PENDENTE_MINUTOS', default=10)
+
+# Fila de tarefas (processar_tarefas): workers em paralelo, espera com a fila vazia e
+# tempo máximo de execução antes de uma tarefa ser considerada travada
+TAREFAS_CONCORRENCIA = env.int('TAREFAS_CONCORRENCIA', default=4)
+TAREFAS_INTERVALO_SEGUNDOS = env.int('TAREFAS_INTERVALO_SEGUNDOS', default=5)
+TAREFAS_TIMEOUT_SEGUNDOS = env.int('TAREFAS_TIMEOUT_SEGUNDOS', default=900)
+
+# Tentativas por tarefa e backoff exponencial entre elas (dobra a cada falha, até o máximo)
+TAREFAS_MAX_TENTATIVAS = env.int('TAREFAS_MAX_TENTATIVAS', default=5)
+TAREFAS_BACKOFF_SEGUNDOS = env.int('TAREFAS_BACKOFF_SEGUNDOS', default=30)
+TAREFAS_BACKOFF_MAXIMO_SEGUNDOS = env.int('TAREFAS_BACKOFF_MAXIMO_SEGUNDOS', default=3600)
+
+# Idempotency-Key: tempo (s) em que a resposta da primeira requisição é reaproveitada e
+# tempo máximo (s) em que uma requisição em andamento bloqueia as repetições. A trava deve
+# ser maior que o timeout das requisições (GUNICORN_TIMEOUT_SEGUNDOS, usado no --timeout do
+# gunicorn), senão uma repetição pode executar a ação enquanto a primeira ainda está em andamento
+GUNICORN_TIMEOUT_SEGUNDOS = env.int('GUNICORN_TIMEOUT_SEGUNDOS', default=120)
+IDEMPOTENCIA_TTL_SEGUNDOS = env.int('IDEMPOTENCIA_TTL_SEGUNDOS', default=86400)
+IDEMPOTENCIA_TRAVA_SEGUNDOS = max(
+    env.int('IDEMPOTENCIA_TRAVA_SEGUNDOS', default=180), GUNICORN_TIMEOUT_SEGUNDOS + 30
+)
+
+# Quantidade máxima de usuários por requisição nas ações em lote da gestão de usuários
+GESTAO_USUARIOS_LOTE_MAXIMO = env.int('GESTAO_USUARIOS_LOTE_MAXIMO', default=200)
+
+# Importação de usuários por arquivo: linhas processadas por lote e limite de linhas por arquivo
+GESTAO_USUARIOS_IMPORTACAO_LOTE = env.int('GESTAO_USUARIOS_IMPORTACAO_LOTE', default=500)
+GESTAO_USUARIOS_IMPORTACAO_MAX_LINHAS = env.int('GESTAO_USUARIOS_IMPORTACAO_MAX_LINHAS', default=5000)
+
+# Exportação de usuários: quantidade de usuários lidos por vez do cursor no servidor
+GESTAO_USUARIOS_EXPORTACAO_LOTE = env.int('GESTAO_USUARIOS_EXPORTACAO_LOTE', default=2000)
+
 # GENERAL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#debug
@@ -114,6 +155,7 @@ LOCAL_APPS = [
     "apps.users",
     "apps.unidades",
     "apps.alteracao_email",
+    "apps.tarefas",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -164,17 +206,23 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # Sessão, CSRF, autenticação por sessão e mensagens não rodam nas views DRF da API (JWT)
+    "apps.users.middleware.SessionForaDaApiMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "apps.users.middleware.CsrfForaDaApiMiddleware",
+    "apps.users.middleware.AuthenticationForaDaApiMiddleware",
+    "apps.users.middleware.MessageForaDaApiMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "apps.users.middleware.AuditlogMiddleware",
 ]
 
+# Prefixo das rotas da API atendidas sem os middlewares de sessão (ver apps.users.middleware)
+API_SEM_SESSAO_PREFIXO = "/api/"
+# Views DRF sob o prefixo que mantêm o stack completo (documentação com login de sessão)
+API_SEM_SESSAO_VIEWS_EXCLUIDAS = ["api-schema", "api-docs"]
+
 # STATIC
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#static-root
@@ -260,6 +308,8 @@ EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="")
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-timeout
 EMAIL_TIMEOUT = 5
+# Mensagens enviadas pela mesma conexão SMTP nos envios em lote (EnviaEmailService.enviar_em_lote)
+EMAIL_ENVIO_LOTE = env.int('EMAIL_ENVIO_LOTE', default=50)
 
 # ADMIN
 # ------------------------------------------------------------------------------
@@ -325,7 +375,7 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.TokenAuthentication",
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.ClaimsJWTAuthentication',
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -339,10 +389,37 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# /api/unidades/batch: máximo de códigos por requisição e tamanho de cada consulta IN
+UNIDADES_BATCH_MAXIMO = env.int('UNIDADES_BATCH_MAXIMO', default=1000)
+UNIDADES_BATCH_LOTE = env.int('UNIDADES_BATCH_LOTE', default=500)
+
+# Tempo (segundos) que o estado do usuário (ativo, admin, cargo) fica em cache para a autenticação JWT
+JWT_ESTADO_USUARIO_CACHE_TTL = env.int('JWT_ESTADO_USUARIO_CACHE_TTL', default=60)
+# Tempo (segundos) que as unidades/DREs do usuário ficam em cache para permissões e filtros
+PERFIL_USUARIO_CACHE_TTL = env.int('PERFIL_USUARIO_CACHE_TTL', default=300)
+
+# Tempo (segundos) que a resposta de /me fica em cache (invalidada por versão, ver apps.users.cache_me)
+ME_CACHE_TTL = env.int('ME_CACHE_TTL', default=600)
+
+# Lista de revogação dos tokens de usuários inativados (ver apps.users.revogacao)
+TOKEN_REVOGACAO_BACKEND = env('TOKEN_REVOGACAO_BACKEND', default='apps.users.revogacao.RevogacaoRedisBackend')
+TOKEN_REVOGACAO_REDIS_TIMEOUT = env.float('TOKEN_REVOGACAO_REDIS_TIMEOUT', default=0.5)
+TOKEN_REVOGACAO_BLOOM_INTERVALO = env.int('TOKEN_REVOGACAO_BLOOM_INTERVALO', default=30)
+TOKEN_REVOGACAO_BLOOM_CAPACIDADE = env.int('TOKEN_REVOGACAO_BLOOM_CAPACIDADE', default=10000)
+# Quantidade máxima de tokens por chamada em /verify-token/lote
+VERIFY_TOKEN_LOTE_MAXIMO = env.int('VERIFY_TOKEN_LOTE_MAXIMO', default=100)
+
+# Retenção do auditlog (comando arquivar_auditoria): entradas mais antigas que
+# AUDITLOG_RETENCAO_DIAS são movidas para auditlog_logentry_arquivo em lotes
+AUDITLOG_RETENCAO_DIAS = env.int('AUDITLOG_RETENCAO_DIAS', default=365)
+AUDITLOG_RETENCAO_LOTE = env.int('AUDITLOG_RETENCAO_LOTE', default=5000)
+
 PASSWORD_RESET_TIMEOUT = 5 * 60 # 5 minutos
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
+# Idempotency-Key é enviado pelo frontend nas ações que disparam integrações e e-mails
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
  
 # By Default swagger ui is available only to admin user(s). You can change permission classes to change that
 # See more configuration options at https://drf-spectacular.readthedocs.io/en/latest/settings.html#settings
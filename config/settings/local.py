@@ -26,6 +26,13 @@ CACHES = {
     },
 }
 
+# TOKENS
+# ------------------------------------------------------------------------------
+TOKEN_REVOGACAO_BACKEND = env(
+    "TOKEN_REVOGACAO_BACKEND",
+    default="apps.users.revogacao.RevogacaoMemoriaBackend",
+)
+
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
@@ -34,5 +34,9 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "http://media.testserver/"
+# TOKENS
+# ------------------------------------------------------------------------------
+TOKEN_REVOGACAO_BACKEND = "apps.users.revogacao.RevogacaoMemoriaBackend"
+
 # Your stuff...
 # ------------------------------------------------------------------------------
\ No newline at end of file